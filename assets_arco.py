@@ -0,0 +1,169 @@
+import os
+import sys
+import json
+import pygame
+
+# =========================================
+# ATLAS DE IMÁGENES DEL JUEGO DE ARCO
+# =========================================
+# Las imágenes se escalan una sola vez a su tamaño en pantalla y se
+# empaquetan en arco_atlas.bmp; arco_atlas.json dice dónde quedó cada
+# una. Al arrancar, juego2 carga ese único archivo ya escalado. Si falta
+# o alguna imagen fuente cambió, el atlas se vuelve a generar solo.
+# Se guarda en BMP, sin compresión: cargarlo es copiar bytes en lugar de
+# decodificar PNG.
+ATLAS = "arco_atlas.bmp"
+MANIFIESTO = "arco_atlas.json"
+VERSION = 1
+ANCHO_MAX = 1024
+
+# nombre -> (archivos fuente en orden de preferencia, tamaño en pantalla,
+#            necesita canal alfa al usarse)
+SPRITES = {
+    "fondo": (("fondo.png",), (800, 600), False),
+    "bow": (("bow.png",), (150, 50), False),
+    # La rotación agrega esquinas transparentes
+    "arrow": (("arrow.png",), (100, 20), True),
+    # El repo trae la diana como taget.jpeg
+    "target": (("target.png", "taget.jpeg"), (80, 80), True),
+}
+
+
+def _fuente(directorio, archivos):
+    for archivo in archivos:
+        if os.path.exists(os.path.join(directorio, archivo)):
+            return archivo
+    return None
+
+
+def _firma(ruta):
+    st = os.stat(ruta)
+    return [st.st_mtime_ns, st.st_size]
+
+
+def empaquetar(tamanos, ancho_max=ANCHO_MAX):
+    """Ubica rectángulos por estantes, de más alto a más bajo.
+
+    tamanos es {nombre: (ancho, alto)}; devuelve ({nombre: (x, y)},
+    (ancho, alto) del atlas).
+    """
+    posiciones = {}
+    x = y = alto_estante = ancho_total = 0
+    for nombre, (ancho, alto) in sorted(tamanos.items(),
+                                        key=lambda t: -t[1][1]):
+        if x and x + ancho > ancho_max:
+            x, y = 0, y + alto_estante
+            alto_estante = 0
+        posiciones[nombre] = (x, y)
+        x += ancho
+        alto_estante = max(alto_estante, alto)
+        ancho_total = max(ancho_total, x)
+    return posiciones, (ancho_total, y + alto_estante)
+
+
+def construir_atlas(directorio=".", guardar=True):
+    """Escala las imágenes fuente y las empaqueta; devuelve (atlas, manifiesto).
+
+    Las imágenes que faltan o no se pueden leer quedan fuera (el juego
+    usa su dibujo de reemplazo). No necesita ventana abierta.
+    """
+    escaladas, fuentes = {}, {}
+    for nombre, (archivos, tamano, _) in SPRITES.items():
+        archivo = _fuente(directorio, archivos)
+        if archivo is None:
+            continue
+        try:
+            imagen = pygame.image.load(os.path.join(directorio, archivo))
+        except (pygame.error, FileNotFoundError):
+            continue
+        escaladas[nombre] = pygame.transform.scale(imagen, tamano)
+        fuentes[nombre] = archivo
+
+    posiciones, tamano_atlas = empaquetar(
+        {n: s.get_size() for n, s in escaladas.items()})
+    atlas = pygame.Surface((max(1, tamano_atlas[0]), max(1, tamano_atlas[1])))
+    manifiesto = {"version": VERSION, "atlas": ATLAS, "sprites": {}}
+    for nombre, superficie in escaladas.items():
+        atlas.blit(superficie, posiciones[nombre])
+        archivo = fuentes[nombre]
+        manifiesto["sprites"][nombre] = {
+            "rect": list(posiciones[nombre]) + list(superficie.get_size()),
+            "fuente": archivo,
+            "firma": _firma(os.path.join(directorio, archivo)),
+        }
+
+    if guardar:
+        try:
+            pygame.image.save(atlas, os.path.join(directorio, ATLAS))
+            ruta = os.path.join(directorio, MANIFIESTO)
+            with open(ruta + ".tmp", "w") as f:
+                json.dump(manifiesto, f, indent=1)
+            os.replace(ruta + ".tmp", ruta)
+        except (OSError, pygame.error) as e:
+            print(f"⚠️ No se pudo guardar el atlas ({e}); se usa en memoria.")
+    return atlas, manifiesto
+
+
+def leer_manifiesto(directorio="."):
+    """Manifiesto guardado, o None si falta o ya no coincide con las fuentes."""
+    try:
+        with open(os.path.join(directorio, MANIFIESTO)) as f:
+            manifiesto = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifiesto.get("version") != VERSION:
+        return None
+    if not os.path.exists(os.path.join(directorio, manifiesto["atlas"])):
+        return None
+    sprites = manifiesto["sprites"]
+    for nombre, (archivos, tamano, _) in SPRITES.items():
+        archivo = _fuente(directorio, archivos)
+        entrada = sprites.get(nombre)
+        if archivo is None:
+            if entrada is not None:
+                return None
+            continue
+        if (entrada is None or entrada["fuente"] != archivo or
+                entrada["rect"][2:] != list(tamano) or
+                entrada["firma"] != _firma(os.path.join(directorio, archivo))):
+            return None
+    return manifiesto
+
+
+def cargar_atlas(directorio="."):
+    """{nombre: Surface} ya escaladas y convertidas al formato de pantalla.
+
+    Requiere la ventana abierta (convert). Los nombres sin imagen fuente
+    no aparecen.
+    """
+    manifiesto = leer_manifiesto(directorio)
+    atlas = None
+    if manifiesto is not None:
+        try:
+            atlas = pygame.image.load(
+                os.path.join(directorio, manifiesto["atlas"]))
+        except (pygame.error, FileNotFoundError):
+            atlas = None
+    if atlas is None:
+        atlas, manifiesto = construir_atlas(directorio)
+    atlas = atlas.convert()
+
+    sprites = {}
+    for nombre, entrada in manifiesto["sprites"].items():
+        if nombre not in SPRITES:
+            continue
+        superficie = atlas.subsurface(pygame.Rect(entrada["rect"]))
+        if SPRITES[nombre][2]:
+            superficie = superficie.convert_alpha()
+        sprites[nombre] = superficie
+    return sprites
+
+
+if __name__ == "__main__":
+    # python assets_arco.py [directorio]: genera el atlas de antemano
+    directorio = sys.argv[1] if len(sys.argv) > 1 else "."
+    atlas, manifiesto = construir_atlas(directorio)
+    for nombre, entrada in manifiesto["sprites"].items():
+        print(f"{nombre:8s} {entrada['fuente']:12s} rect={entrada['rect']}")
+    print(f"Atlas {atlas.get_width()}x{atlas.get_height()} -> "
+          f"{os.path.join(directorio, ATLAS)}")
@@ -0,0 +1,85 @@
+"""Arranque por ronda: un proceso por juego vs el lanzador único.
+
+Antes cada ronda era `python juegoN.py`: intérprete nuevo + pygame o
+gpiozero + el módulo del juego, y recién ahí el lobby. Con lanzador.py
+el intérprete y el lobby se pagan una vez; cada juego se importa la
+primera vez que el host lo asigna y después la ronda arranca al instante.
+
+  proceso nuevo:  `python -c "import juegoN"` en un subproceso (mediana)
+  1ª carga:       lanzador.cargar_juego(N) en un intérprete ya iniciado
+  siguientes:     lanzador.cargar_juego(N) con el juego ya importado
+
+Los juegos cuya dependencia no está instalada (p. ej. gpiozero fuera de
+la Raspberry Pi) se muestran como no disponibles.
+
+Uso:
+  python benchmarks/bench_arranque.py [repeticiones]
+"""
+import os
+import sys
+import time
+import statistics
+import subprocess
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+ENTORNO = dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT="1",
+               SDL_VIDEODRIVER="dummy")
+
+# Se mide en un subproceso aparte para que cada carga sea la primera
+MEDIR_EN_LANZADOR = """
+import sys, time
+t = time.perf_counter()
+import lanzador
+arranque = time.perf_counter() - t
+t = time.perf_counter()
+lanzador.cargar_juego({game_id})
+primera = time.perf_counter() - t
+t = time.perf_counter()
+for _ in range(1000):
+    lanzador.cargar_juego({game_id})
+siguientes = (time.perf_counter() - t) / 1000
+print(arranque, primera, siguientes)
+"""
+
+
+def tiempo_subproceso(codigo):
+    inicio = time.perf_counter()
+    proceso = subprocess.run([sys.executable, "-c", codigo], cwd=RAIZ,
+                             env=ENTORNO, capture_output=True, text=True)
+    return time.perf_counter() - inicio, proceso
+
+
+def main():
+    repeticiones = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    sys.path.insert(0, RAIZ)
+    from lanzador import JUEGOS
+
+    vacio = statistics.median(tiempo_subproceso("pass")[0]
+                              for _ in range(repeticiones))
+    lanzador = statistics.median(tiempo_subproceso("import lanzador")[0]
+                                 for _ in range(repeticiones))
+    print(f"intérprete vacío: {vacio * 1000:.0f} ms   "
+          f"proceso del lanzador: {lanzador * 1000:.0f} ms (una vez)\n")
+    print(f"{'GameID':>6} {'módulo':20s} | {'proceso nuevo':>13} | "
+          f"{'1ª carga':>9} {'siguientes':>11}")
+    for game_id, (modulo, _) in sorted(JUEGOS.items()):
+        tiempos = []
+        for _ in range(repeticiones):
+            segundos, proceso = tiempo_subproceso(f"import {modulo}")
+            if proceso.returncode != 0:
+                break
+            tiempos.append(segundos)
+        if not tiempos:
+            error = proceso.stderr.strip().splitlines()[-1]
+            print(f"{game_id:>6} {modulo:20s} | no disponible: {error}")
+            continue
+        _, proceso = tiempo_subproceso(
+            MEDIR_EN_LANZADOR.format(game_id=game_id))
+        _, primera, siguientes = map(float, proceso.stdout.split())
+        print(f"{game_id:>6} {modulo:20s} | "
+              f"{statistics.median(tiempos) * 1000:>10.0f} ms | "
+              f"{primera * 1000:>6.0f} ms {siguientes * 1e6:>8.2f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Carga de imágenes de juego2 al arrancar: archivos sueltos vs atlas.
+
+  original: decodificar fondo.png, bow.png, arrow.png y la diana, escalar
+            cada una con transform.scale y convertir
+  atlas:    leer arco_atlas.bmp (ya escalado, sin compresión), convertirlo
+            una vez y recortar subsuperficies
+
+Corre sin ventana (SDL_VIDEODRIVER=dummy) sobre una copia de las
+imágenes del repo en un directorio temporal.
+
+Uso:
+  python benchmarks/bench_assets_arco.py [repeticiones]
+"""
+import os
+import sys
+import time
+import shutil
+import tempfile
+import statistics
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+import pygame  # noqa: E402
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, RAIZ)
+import assets_arco  # noqa: E402
+
+
+def cargar_original(directorio):
+    imagenes = {}
+    for nombre, (archivos, tamano, alfa) in assets_arco.SPRITES.items():
+        for archivo in archivos:
+            try:
+                imagen = pygame.image.load(os.path.join(directorio, archivo))
+            except (pygame.error, FileNotFoundError):
+                continue
+            imagen = pygame.transform.scale(imagen, tamano)
+            imagenes[nombre] = (imagen.convert_alpha() if alfa
+                                else imagen.convert())
+            break
+    return imagenes
+
+
+def medir(funcion, directorio, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion(directorio)
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tiempos)
+
+
+def main():
+    repeticiones = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    pygame.init()
+    pygame.display.set_mode((800, 600))
+    with tempfile.TemporaryDirectory() as tmp:
+        for archivos, _, _ in assets_arco.SPRITES.values():
+            for archivo in archivos:
+                if os.path.exists(os.path.join(RAIZ, archivo)):
+                    shutil.copy(os.path.join(RAIZ, archivo), tmp)
+        inicio = time.perf_counter()
+        assets_arco.construir_atlas(tmp)
+        construccion = (time.perf_counter() - inicio) * 1000
+        original = medir(cargar_original, tmp, repeticiones)
+        atlas = medir(assets_arco.cargar_atlas, tmp, repeticiones)
+    print(f"construir el atlas (una vez): {construccion:7.2f} ms")
+    print(f"original (archivos sueltos):  {original:7.2f} ms")
+    print(f"atlas:                        {atlas:7.2f} ms")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
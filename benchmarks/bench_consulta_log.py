@@ -0,0 +1,73 @@
+"""Líneas por segundo: json.loads de cada línea vs Consulta con prefiltro.
+
+Uso: python benchmarks/bench_consulta_log.py [lineas] [fraccion_relevante]
+"""
+import os
+import sys
+import json
+import time
+import random
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from bitacora import Consulta, parsear_linea  # noqa: E402
+
+
+def generar(n, fraccion):
+    random.seed(0)
+    lineas = []
+    for i in range(n):
+        if random.random() < fraccion:
+            payload = {"stage": random.choice(["R1", "R2", "R3"]),
+                       "Action": "Sabotage", "Effect": "Delay", "Value": 3}
+        else:
+            payload = {"stage": "Lobby", "PlayerID": random.randint(1, 500),
+                       "Action": random.choice(["Join", "Ready", "Heartbeat"])}
+        lineas.append(f"2024-01-01 00:00:00 {json.dumps(payload)}".encode())
+    return lineas
+
+
+def sin_prefiltro(lineas):
+    """Como los lectores originales: json.loads de todo y luego filtrar."""
+    ultimo = None
+    for linea in lineas:
+        payload = parsear_linea(linea)
+        if (payload is not None and payload.get("stage") == "R1" and
+                payload.get("Action") == "Sabotage"):
+            ultimo = payload
+    return ultimo
+
+
+def con_prefiltro(lineas):
+    ultimo = None
+    for payload in Consulta(Action="Sabotage", stage="R1").filtrar(lineas):
+        ultimo = payload
+    return ultimo
+
+
+def medir(funcion, lineas, repeticiones=3):
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion(lineas)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return len(lineas) / mejor, resultado
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    fracciones = ([float(sys.argv[2])] if len(sys.argv) > 2
+                  else [0.001, 0.01, 0.1, 0.5])
+    print(f"{n} líneas")
+    print(f"{'relevantes':>10} | {'json.loads l/s':>15} | "
+          f"{'prefiltro l/s':>15} | {'x':>6}")
+    for fraccion in fracciones:
+        lineas = generar(n, fraccion)
+        lps_a, res_a = medir(sin_prefiltro, lineas)
+        lps_b, res_b = medir(con_prefiltro, lineas)
+        assert res_a == res_b
+        print(f"{fraccion:>10.3f} | {lps_a:>15,.0f} | {lps_b:>15,.0f} | "
+              f"{lps_b / lps_a:>6.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Puntaje de juego1: distancia de edición por DP directa vs vectores de bits.
+
+  dp:          tabla completa, O(m * n) (distancia_edicion_dp)
+  bits:        Myers/Hyyrö con enteros de Python (distancia_edicion)
+  por tecla:   PuntajeIncremental.agregar + errores(), el costo de tener
+               el puntaje en vivo (rehacer la DP en cada tecla costaría
+               del orden de la columna dp)
+
+Con frases de largo creciente (hasta un párrafo) y un texto escrito con
+~5% de letras cambiadas, salteadas o de más.
+
+Uso:
+  python benchmarks/bench_distancia_edicion.py [repeticiones]
+"""
+import os
+import sys
+import time
+import random
+import statistics
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, RAIZ)
+from puntaje_tipeo import (PuntajeIncremental, distancia_edicion,  # noqa: E402
+                           distancia_edicion_dp)
+
+LARGOS = (40, 200, 1000, 3000)
+LETRAS = "abcdefghijklmnopqrstuvwxyzáéíñ     "
+
+
+def con_errores(texto, rng, proporcion=0.05):
+    escrito = []
+    for caracter in texto:
+        r = rng.random()
+        if r < proporcion / 3:
+            continue
+        if r < 2 * proporcion / 3:
+            escrito.append(rng.choice(LETRAS))
+        elif r < proporcion:
+            escrito.extend((caracter, rng.choice(LETRAS)))
+        else:
+            escrito.append(caracter)
+    return "".join(escrito)
+
+
+def medir(funcion, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tiempos)
+
+
+def por_tecla(objetivo, escrito):
+    puntaje = PuntajeIncremental(objetivo)
+    for caracter in escrito:
+        puntaje.agregar(caracter)
+        puntaje.errores()
+
+
+def main():
+    repeticiones = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    rng = random.Random(0)
+    print(f"{'largo':>6s} {'dp':>11s} {'bits':>11s} {'por tecla':>13s}")
+    for largo in LARGOS:
+        objetivo = "".join(rng.choice(LETRAS) for _ in range(largo))
+        escrito = con_errores(objetivo, rng)
+        assert distancia_edicion(objetivo, escrito) == \
+            distancia_edicion_dp(objetivo, escrito)
+        dp = medir(lambda: distancia_edicion_dp(objetivo, escrito),
+                   repeticiones)
+        bits = medir(lambda: distancia_edicion(objetivo, escrito),
+                     repeticiones)
+        tecla = medir(lambda: por_tecla(objetivo, escrito),
+                      repeticiones) / len(escrito)
+        print(f"{largo:6d} {dp:8.2f} ms {bits:8.3f} ms {tecla * 1000:9.2f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+"""Carga del lobby: N jugadores simulados contra un host simulado.
+
+Cada jugador ejecuta el lobby_handshake real de juego1letras (el único
+juego que se importa sin pygame/gpiozero). El host simulado responde
+Accepted a cada Join y va escribiendo Assign/Sabotage como en un torneo.
+
+Uso:
+  python benchmarks/bench_lobby_carga.py [--modo hilos|procesos]
+         [--transporte archivos|socket] [--jugadores 1 10 50 100 500]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import threading
+import contextlib
+import statistics
+import multiprocessing
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, RAIZ)
+from bitacora import SeguidorLog  # noqa: E402
+from escritor_eventos import EscritorEventos  # noqa: E402
+from transporte import VARIABLE_DIRECCION, ServidorHost  # noqa: E402
+
+
+# =========================================
+# HOST SIMULADO
+# =========================================
+class HostArchivos:
+    """Sigue los player_events.log y contesta en game_status.log."""
+
+    def __init__(self, ruta_estado, rutas_jugadores, ruido_ms=50):
+        self.log = EscritorEventos(ruta_estado, politica="inmediata")
+        self.seguidores = [SeguidorLog(r) for r in rutas_jugadores]
+        self.ruido_ms = ruido_ms
+        self.activo = True
+        self.hilo = threading.Thread(target=self._bucle, daemon=True)
+
+    def _bucle(self):
+        proximo_ruido = time.monotonic()
+        while self.activo:
+            for seguidor in self.seguidores:
+                for p in seguidor.leer_nuevos():
+                    if p.get("stage") == "Lobby" and p.get("Action") == "Join":
+                        self.log.escribir({"stage": "Lobby",
+                                           "PlayerID": p.get("PlayerID"),
+                                           "Action": "Accepted"})
+            if time.monotonic() >= proximo_ruido:
+                escribir_ruido(self.log.escribir)
+                proximo_ruido = time.monotonic() + self.ruido_ms / 1000
+            time.sleep(0.002)
+
+    def iniciar(self):
+        self.hilo.start()
+
+    def detener(self):
+        self.activo = False
+        self.hilo.join()
+        self.log.cerrar()
+
+
+class HostSocket:
+    def __init__(self, direccion, ruta_estado, ruta_jugadores, ruido_ms=50):
+        self.servidor = ServidorHost(direccion, ruta_estado, ruta_jugadores)
+        self.ruido_ms = ruido_ms
+        self.activo = True
+        self.hilo = threading.Thread(target=self._ruido, daemon=True)
+
+    def _ruido(self):
+        while self.activo:
+            escribir_ruido(self.servidor.emitir)
+            time.sleep(self.ruido_ms / 1000)
+
+    def iniciar(self):
+        self.servidor.servir_en_hilo()
+        self.hilo.start()
+
+    def detener(self):
+        self.activo = False
+        self.hilo.join()
+        self.servidor.detener()
+
+
+def escribir_ruido(emitir):
+    stage = random.choice(["R1", "R2", "R3"])
+    if random.random() < 0.5:
+        emitir({"stage": stage, "Action": "Assign",
+                "GameID": random.randint(1, 4)})
+    else:
+        emitir({"stage": stage, "Action": "Sabotage",
+                "Effect": random.choice(["Delay", "ScoreSteal"]),
+                "Value": random.randint(1, 5)})
+
+
+# =========================================
+# JUGADORES SIMULADOS
+# =========================================
+def preparar_juego(dir_jugador, ruta_estado, direccion):
+    """Importa juego1letras con su player_events.log en dir_jugador."""
+    os.chdir(dir_jugador)
+    if direccion:
+        os.environ[VARIABLE_DIRECCION] = direccion
+    else:
+        os.environ.pop(VARIABLE_DIRECCION, None)
+    import juego1letras
+    juego1letras.HOST_LOG_FILE = ruta_estado
+    return juego1letras
+
+
+def handshake_medido(juego, player_id, cpu_del_hilo):
+    reloj_cpu = time.thread_time if cpu_del_hilo else time.process_time
+    cpu = reloj_cpu()
+    inicio = time.perf_counter()
+    ok = juego.lobby_handshake(player_id)
+    return ok, time.perf_counter() - inicio, reloj_cpu() - cpu
+
+
+def proceso_jugador(dir_jugador, ruta_estado, direccion, player_id,
+                    barrera, cola):
+    juego = preparar_juego(dir_jugador, ruta_estado, direccion)
+    barrera.wait()
+    cola.put((player_id,) + handshake_medido(juego, player_id, False))
+
+
+def correr(n, modo, transporte, tmp):
+    ruta_estado = os.path.join(tmp, "game_status.log")
+    direccion = ("unix:" + os.path.join(tmp, "host.sock")
+                 if transporte == "socket" else None)
+    if modo == "procesos":
+        dirs = [os.path.join(tmp, f"pi{i}") for i in range(n)]
+    else:
+        dirs = [os.path.join(tmp, "pi")]
+    for d in dirs:
+        os.makedirs(d, exist_ok=True)
+    rutas_jugadores = [os.path.join(d, "player_events.log") for d in dirs]
+
+    # Los prints del lobby se descartan (redirect_stdout no es por hilo,
+    # así que se hace una vez para todos los jugadores)
+    with open(os.devnull, "w") as nulo, contextlib.redirect_stdout(nulo):
+        # Los procesos se crean antes de arrancar cualquier hilo (el del
+        # host incluido): un fork con hilos vivos puede dejar en el hijo un
+        # lock tomado para siempre
+        if modo == "procesos":
+            jugadores = lanzar_procesos(n, dirs, ruta_estado, direccion)
+        if direccion:
+            host = HostSocket(direccion, ruta_estado,
+                              os.path.join(tmp, "player_events_host.log"))
+        else:
+            host = HostArchivos(ruta_estado, rutas_jugadores)
+        host.iniciar()
+        if modo == "procesos":
+            resultados = esperar_procesos(*jugadores)
+        else:
+            resultados = correr_hilos(n, dirs[0], ruta_estado, direccion)
+    host.detener()
+
+    bytes_log = sum(os.path.getsize(r) for r in [ruta_estado] + rutas_jugadores
+                    if os.path.exists(r))
+    return resultados, bytes_log
+
+
+def lanzar_procesos(n, dirs, ruta_estado, direccion):
+    """Un proceso por jugador, esperando en la barrera a que esté el host."""
+    ctx = multiprocessing.get_context("fork")
+    barrera = ctx.Barrier(n + 1)
+    cola = ctx.Queue()
+    procesos = [ctx.Process(target=proceso_jugador,
+                            args=(dirs[i], ruta_estado, direccion,
+                                  i + 1, barrera, cola))
+                for i in range(n)]
+    for p in procesos:
+        p.start()
+    return procesos, barrera, cola
+
+
+def esperar_procesos(procesos, barrera, cola):
+    barrera.wait()
+    resultados = [cola.get() for _ in procesos]
+    for p in procesos:
+        p.join()
+    return resultados
+
+
+def correr_hilos(n, dir_jugador, ruta_estado, direccion):
+    juego = preparar_juego(dir_jugador, ruta_estado, direccion)
+    barrera = threading.Barrier(n)
+    lock = threading.Lock()
+    resultados = []
+
+    def hilo_jugador(player_id):
+        barrera.wait()
+        r = handshake_medido(juego, player_id, True)
+        with lock:
+            resultados.append((player_id,) + r)
+
+    hilos = [threading.Thread(target=hilo_jugador, args=(i + 1,))
+             for i in range(n)]
+    for h in hilos:
+        h.start()
+    for h in hilos:
+        h.join()
+    return resultados
+
+
+def correr_en_proceso(n, modo, transporte, tmp, cola):
+    cola.put(correr(n, modo, transporte, tmp))
+
+
+def percentil(valores, p):
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * p / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modo", choices=["hilos", "procesos"],
+                        default="hilos")
+    parser.add_argument("--transporte", choices=["archivos", "socket"],
+                        default="archivos")
+    parser.add_argument("--jugadores", type=int, nargs="+",
+                        default=[1, 10, 50, 100, 500])
+    args = parser.parse_args()
+    random.seed(0)
+
+    print(f"modo={args.modo} transporte={args.transporte}")
+    print(f"{'N':>5} | {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} | "
+          f"{'cpu/jug ms':>10} | {'log KiB':>8} {'B/jug':>7} | fallos")
+    for n in args.jugadores:
+        # Cada N en un proceso aparte: juego1letras guarda estado global
+        ctx = multiprocessing.get_context("fork")
+        cola = ctx.Queue()
+        with tempfile.TemporaryDirectory() as tmp:
+            proceso = ctx.Process(target=correr_en_proceso,
+                                  args=(n, args.modo, args.transporte, tmp,
+                                        cola))
+            proceso.start()
+            resultados, bytes_log = cola.get()
+            proceso.join()
+        latencias = [r[2] * 1000 for r in resultados if r[1]]
+        cpus = [r[3] * 1000 for r in resultados]
+        fallos = sum(1 for r in resultados if not r[1])
+        print(f"{n:>5} | {percentil(latencias, 50):>8.1f} "
+              f"{percentil(latencias, 95):>8.1f} "
+              f"{percentil(latencias, 99):>8.1f} | "
+              f"{statistics.mean(cpus):>10.2f} | {bytes_log / 1024:>8.1f} "
+              f"{bytes_log / n:>7.0f} | {fallos}")
+
+
+if __name__ == "__main__":
+    main()
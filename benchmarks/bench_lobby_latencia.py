@@ -0,0 +1,141 @@
+"""Latencia del handshake: polling original vs SeguidorLog + inotify vs socket.
+
+Uso: python benchmarks/bench_lobby_latencia.py [intentos] [lineas_historial]
+"""
+import os
+import sys
+import json
+import time
+import random
+import tempfile
+import threading
+import statistics
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from bitacora import EstadoHost, VigilanteArchivo  # noqa: E402
+from transporte import ClienteHost, EsperaCliente, ServidorHost  # noqa: E402
+
+PLAYER_ID = 1
+
+
+def linea(payload):
+    return f"2024-01-01 00:00:00 {json.dumps(payload)}\n"
+
+
+def esperar_polling_original(ruta, player_id):
+    """Bucle original (relee todo el log y duerme 1s), con el parseo por '{'."""
+    while True:
+        try:
+            with open(ruta, "r") as f:
+                lineas = [l.strip() for l in f.readlines()]
+        except FileNotFoundError:
+            lineas = []
+        for l in lineas:
+            if not l or l.startswith("#"):
+                continue
+            try:
+                payload = json.loads(l[l.find("{"):])
+            except Exception:
+                continue
+            if (payload.get("stage") == "Lobby" and
+                payload.get("PlayerID") == player_id and
+                    payload.get("Action") == "Accepted"):
+                return
+        time.sleep(1)
+
+
+def esperar_vigilante(ruta, player_id, forzar_polling=False):
+    estado = EstadoHost(ruta)
+    with VigilanteArchivo(ruta) as vigilante:
+        if forzar_polling:
+            vigilante.cerrar()
+        while estado.actualizar().accepted_de(player_id) is None:
+            vigilante.esperar(1.0)
+
+
+def medir(espera, ruta, intentos, historial):
+    latencias = []
+    cpu_inicio = time.process_time()
+    for _ in range(intentos):
+        with open(ruta, "w") as f:
+            for i in range(historial):
+                f.write(linea({"stage": "Lobby", "PlayerID": 1000 + i,
+                               "Action": "Accepted"}))
+        escrito = {}
+
+        def host():
+            time.sleep(random.uniform(0.05, 0.5))
+            with open(ruta, "a") as f:
+                escrito["t"] = time.perf_counter()
+                f.write(linea({"stage": "Lobby", "PlayerID": PLAYER_ID,
+                               "Action": "Accepted"}))
+
+        hilo = threading.Thread(target=host)
+        hilo.start()
+        espera(ruta, PLAYER_ID)
+        detectado = time.perf_counter()
+        hilo.join()
+        latencias.append((detectado - escrito["t"]) * 1000)
+    cpu = time.process_time() - cpu_inicio
+    return latencias, cpu
+
+
+def medir_socket(tmp, intentos):
+    """El host empuja el Accepted por socket Unix (y lo espeja al log)."""
+    ruta = os.path.join(tmp, "game_status_socket.log")
+    direccion = "unix:" + os.path.join(tmp, "host.sock")
+    servidor = ServidorHost(direccion, ruta_estado=ruta,
+                            ruta_jugadores=os.path.join(tmp, "jug.log"),
+                            aceptar_automatico=False)
+    servidor.servir_en_hilo()
+    cliente = ClienteHost(direccion, ruta)
+    latencias = []
+    cpu_inicio = time.process_time()
+    for intento in range(intentos):
+        player_id = PLAYER_ID + 1 + intento
+        escrito = {}
+
+        def host():
+            time.sleep(random.uniform(0.05, 0.5))
+            escrito["t"] = time.perf_counter()
+            servidor.emitir({"stage": "Lobby", "PlayerID": player_id,
+                             "Action": "Accepted"})
+
+        espera = EsperaCliente(cliente)
+        hilo = threading.Thread(target=host)
+        hilo.start()
+        while cliente.estado.accepted_de(player_id) is None:
+            espera.esperar(1.0)
+        detectado = time.perf_counter()
+        hilo.join()
+        latencias.append((detectado - escrito["t"]) * 1000)
+    cpu = time.process_time() - cpu_inicio
+    cliente.cerrar()
+    servidor.detener()
+    return latencias, cpu
+
+
+def main():
+    intentos = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    historial = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+    random.seed(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta = os.path.join(tmp, "game_status.log")
+        casos = [
+            ("polling original (sleep 1s)", esperar_polling_original),
+            ("seguidor + inotify", esperar_vigilante),
+            ("seguidor + polling 50ms",
+             lambda r, p: esperar_vigilante(r, p, forzar_polling=True)),
+        ]
+        print(f"intentos={intentos} historial={historial} líneas")
+        for nombre, espera in casos:
+            lat, cpu = medir(espera, ruta, intentos, historial)
+            print(f"{nombre:30s} p50={statistics.median(lat):8.2f} ms "
+                  f"max={max(lat):8.2f} ms  cpu={cpu:.3f}s")
+        lat, cpu = medir_socket(tmp, intentos)
+        print(f"{'socket unix (push)':30s} p50={statistics.median(lat):8.2f} ms "
+              f"max={max(lat):8.2f} ms  cpu={cpu:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
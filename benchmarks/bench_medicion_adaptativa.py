@@ -0,0 +1,96 @@
+"""Medición de un turno de juego4: 7 lecturas fijas vs medición adaptativa.
+
+  fija:       7 lecturas y statistics.median (read_once sin muestreador)
+  adaptativa: medir_adaptativo con lecturas hasta que la mediana se
+              conoce con ±1 cm (confianza 0.9) o pasan 0.8 s
+
+Con tres manos simuladas: quieta, normal y temblorosa (con ecos
+perdidos), cada lectura un ping independiente como con queue_len=1, una
+cada periodo_muestreo(2.0) (~72 ms, lo que tarda gpiozero en tener una
+muestra nueva con max_distance=2). Muestra latencia, muestras usadas y error respecto a la distancia real.
+
+Uso:
+  python benchmarks/bench_medicion_adaptativa.py [turnos]
+"""
+import os
+import sys
+import time
+import random
+import statistics
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, RAIZ)
+from muestreo_sensor import medir_adaptativo, periodo_muestreo  # noqa: E402
+
+REAL_CM = 42.0
+SAMPLE_DT = periodo_muestreo(2.0)
+# nombre -> (desvío del ruido en cm, proporción de ecos perdidos)
+MANOS = {
+    "quieta": (0.3, 0.0),
+    "normal": (1.5, 0.05),
+    "temblorosa": (4.0, 0.15),
+}
+
+
+class Mano:
+    """distance en metros alrededor de REAL_CM."""
+
+    def __init__(self, desvio, perdidos, semilla=0):
+        self.desvio = desvio
+        self.perdidos = perdidos
+        self.rng = random.Random(semilla)
+
+    @property
+    def distance(self):
+        if self.rng.random() < self.perdidos:
+            return self.rng.choice([0.0, 2.0])
+        return (REAL_CM + self.rng.gauss(0, self.desvio)) / 100
+
+
+def leer_valida(sensor):
+    time.sleep(SAMPLE_DT)
+    d = sensor.distance * 100
+    return d if 3 <= d <= 350 else None
+
+
+def fija(sensor, avg_samples=7):
+    vals = []
+    for _ in range(avg_samples):
+        d = leer_valida(sensor)
+        if d is not None:
+            vals.append(d)
+    return (statistics.median(vals) if vals else None), avg_samples
+
+
+def adaptativa(sensor):
+    medicion = medir_adaptativo(lambda: leer_valida(sensor), tolerancia_cm=1.0,
+                                max_segundos=0.8)
+    return medicion.distancia, medicion.muestras
+
+
+def medir(funcion, sensor, turnos):
+    tiempos, muestras, errores = [], [], []
+    for _ in range(turnos):
+        inicio = time.perf_counter()
+        d, n = funcion(sensor)
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+        muestras.append(n)
+        errores.append(abs(d - REAL_CM))
+    return (statistics.median(tiempos), statistics.mean(muestras),
+            statistics.mean(errores))
+
+
+def main():
+    turnos = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    print(f"{'mano':12s} {'modo':11s} {'latencia':>10s} {'muestras':>9s} "
+          f"{'error':>8s}")
+    for nombre, (desvio, perdidos) in MANOS.items():
+        for modo, funcion in (("fija", fija), ("adaptativa", adaptativa)):
+            latencia, muestras, error = medir(
+                funcion, Mano(desvio, perdidos, semilla=1), turnos)
+            print(f"{nombre:12s} {modo:11s} {latencia:7.0f} ms {muestras:9.1f} "
+                  f"{error:5.2f} cm")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Lectura de distancia de juego4: read_once bloqueante vs muestreo de fondo.
+
+  bloqueante: 7 lecturas cada 40 ms y statistics.median (como read_once)
+  muestreador: MuestreadorSensor ya corriendo; se pide distancia()
+
+También compara el costo por muestra de MedianaMovil contra rearmar la
+lista y ordenarla con statistics.median, y cuánto se aleja cada uno del
+valor real con un sensor simulado que mete ecos perdidos.
+
+Uso:
+  python benchmarks/bench_muestreo_sensor.py [lecturas]
+"""
+import os
+import sys
+import time
+import random
+import statistics
+from collections import deque
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, RAIZ)
+from muestreo_sensor import MedianaMovil, MuestreadorSensor  # noqa: E402
+
+REAL_CM = 42.0
+
+
+class SensorSimulado:
+    """distance en metros con ruido gaussiano y 10% de lecturas absurdas."""
+
+    def __init__(self, semilla=0):
+        self.rng = random.Random(semilla)
+
+    @property
+    def distance(self):
+        if self.rng.random() < 0.1:
+            return self.rng.choice([0.0, 2.0, self.rng.uniform(0, 2)])
+        return (REAL_CM + self.rng.gauss(0, 1.5)) / 100
+
+
+def read_once_original(sensor, avg_samples=7, sample_dt=0.04):
+    vals = []
+    for _ in range(avg_samples):
+        d = sensor.distance * 100
+        if 3 <= d <= 350:
+            vals.append(d)
+        time.sleep(sample_dt)
+    return statistics.median(vals) if vals else None
+
+
+def main():
+    lecturas = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    sensor = SensorSimulado()
+
+    tiempos, errores = [], []
+    for _ in range(lecturas):
+        inicio = time.perf_counter()
+        d = read_once_original(sensor)
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+        errores.append(abs(d - REAL_CM))
+    print(f"read_once bloqueante: {statistics.median(tiempos):8.3f} ms  "
+          f"error medio {statistics.mean(errores):.2f} cm")
+
+    with MuestreadorSensor(sensor) as muestreador:
+        muestreador.esperar_lecturas(7, timeout=2)
+        tiempos, errores = [], []
+        for _ in range(lecturas):
+            time.sleep(0.05)
+            inicio = time.perf_counter()
+            d = muestreador.distancia()
+            tiempos.append((time.perf_counter() - inicio) * 1000)
+            errores.append(abs(d - REAL_CM))
+        print(f"muestreador:          {statistics.median(tiempos):8.3f} ms  "
+              f"error medio {statistics.mean(errores):.2f} cm  "
+              f"(rechazadas {muestreador.rechazadas}/{muestreador.lecturas})")
+
+    muestras = [SensorSimulado(1).distance * 100 for _ in range(50000)]
+    ventana = deque(maxlen=7)
+    inicio = time.perf_counter()
+    for m in muestras:
+        ventana.append(m)
+        statistics.median(list(ventana))
+    lista = (time.perf_counter() - inicio) / len(muestras) * 1e6
+    filtro = MedianaMovil(7)
+    inicio = time.perf_counter()
+    for m in muestras:
+        filtro.agregar(m)
+        filtro.mediana()
+    movil = (time.perf_counter() - inicio) / len(muestras) * 1e6
+    print(f"\nmediana por muestra: lista+statistics.median {lista:.2f} µs, "
+          f"MedianaMovil {movil:.2f} µs")
+
+
+if __name__ == "__main__":
+    main()
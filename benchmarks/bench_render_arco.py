@@ -0,0 +1,94 @@
+"""Tiempo por frame del render de juego2: flip completo vs dirty rects.
+
+Reproduce las dos formas de dibujar de juego2arcoyflecha.py con las
+imágenes reales del repo, sin abrir ventana (SDL_VIDEODRIVER=dummy), y
+mueve flecha y diana igual que el bucle del juego.
+
+  original: imágenes sin convert(), fondo completo + flip en cada frame
+  dirty:    imágenes convertidas, solo se repintan los rects que cambian
+
+Uso (correrlo en la Raspberry Pi para números representativos):
+  python benchmarks/bench_render_arco.py [frames]
+Con el driver dummy flip/update casi no cuestan, así que la diferencia
+medida es solo la de blits y conversión de formato de píxel.
+"""
+import os
+import sys
+import time
+import statistics
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import pygame  # noqa: E402
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+WIDTH, HEIGHT = 800, 600
+
+
+def cargar(nombre, tam):
+    try:
+        return pygame.transform.scale(
+            pygame.image.load(os.path.join(RAIZ, nombre)), tam)
+    except (pygame.error, FileNotFoundError):
+        return pygame.Surface(tam)
+
+
+def recorrido(frames):
+    """Posiciones de flecha y diana como en el bucle del juego."""
+    arrow_x, target_y, direccion = 100, 300, -1
+    for _ in range(frames):
+        arrow_x = arrow_x + 15 if arrow_x < WIDTH else 100
+        target_y += 4 * direccion
+        if target_y <= 50 or target_y >= HEIGHT - 130:
+            direccion *= -1
+        yield arrow_x, target_y
+
+
+def medir(screen, frames, convertir, dirty):
+    fondo = cargar("fondo.png", (WIDTH, HEIGHT))
+    bow = cargar("bow.png", (150, 50))
+    arrow = cargar("arrow.png", (100, 20))
+    target = cargar("taget.jpeg", (80, 80))
+    if convertir:
+        fondo, bow = fondo.convert(), bow.convert()
+        arrow, target = arrow.convert_alpha(), target.convert_alpha()
+    font = pygame.font.SysFont(None, 36)
+    previos = []
+    tiempos = []
+    for arrow_x, target_y in recorrido(frames):
+        inicio = time.perf_counter()
+        if dirty and previos:
+            for rect in previos:
+                screen.blit(fondo, rect.topleft, rect)
+        else:
+            screen.blit(fondo, (0, 0))
+        rects = [screen.blit(bow, (50, HEIGHT // 2 - 25)),
+                 screen.blit(arrow, (arrow_x, HEIGHT // 2 - 10)),
+                 screen.blit(target, (WIDTH - 100, target_y)),
+                 screen.blit(font.render("Puntaje: 0/7", True, (255, 100, 0)),
+                             (10, 10))]
+        if dirty and previos:
+            pygame.display.update(previos + rects)
+        else:
+            pygame.display.flip()
+        previos = rects
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return tiempos
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 600
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    print(f"{frames} frames, driver {pygame.display.get_driver()}")
+    for nombre, convertir, dirty in [("original", False, False),
+                                     ("convert + flip", True, False),
+                                     ("convert + dirty rects", True, True)]:
+        tiempos = sorted(medir(screen, frames, convertir, dirty))
+        p95 = tiempos[int(len(tiempos) * 0.95)]
+        print(f"{nombre:22s} media={statistics.mean(tiempos):6.3f} ms "
+              f"p95={p95:6.3f} ms")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Rondas de juego3/juego4 reproducidas desde una traza de GPIO, sin la Pi.
+
+La traza se graba una vez en la Raspberry jugando normalmente:
+
+  GPIO_BACKEND=grabar:topos.bin python juego3topos.py
+  GPIO_BACKEND=grabar:distancia.bin python juego4sensordist.py
+
+y acá se repite sobre los pines simulados de gpiozero, por defecto con
+reloj virtual (sin esperar los sleeps del juego). Por cada ronda muestra
+el tiempo real que tardó y lo que el juego registró en el log (puntaje,
+y en juego4 muestras y ms de medición de cada turno), para comparar
+entre versiones del código.
+
+Uso:
+  python benchmarks/bench_reproduccion_gpio.py {3,4} <traza> [--tiempo-real]
+"""
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import importlib
+import contextlib
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, RAIZ)
+import trazas_gpio  # noqa: E402
+
+MODULOS = {3: "juego3topos", 4: "juego4sensordist"}
+
+
+def entradas_log(ruta, desde=0):
+    """Payloads de player_events.log a partir de la línea desde."""
+    try:
+        with open(ruta) as f:
+            lineas = f.readlines()[desde:]
+    except FileNotFoundError:
+        return []
+    return [json.loads(linea[linea.index("{"):]) for linea in lineas
+            if "{" in linea]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Reproduce una traza de GPIO sobre juego3 o juego4.")
+    parser.add_argument("juego", type=int, choices=sorted(MODULOS))
+    parser.add_argument("traza")
+    parser.add_argument("--tiempo-real", action="store_true",
+                        help="repetir a 1x en lugar de a toda velocidad")
+    args = parser.parse_args()
+
+    hw = trazas_gpio.usar(trazas_gpio.HardwareReproduccion(
+        os.path.abspath(args.traza), maxima=not args.tiempo_real))
+    with tempfile.TemporaryDirectory() as tmp:
+        # Logs y telemetría de la reproducción quedan en el temporal
+        os.chdir(tmp)
+        juego = importlib.import_module(MODULOS[args.juego])
+        sys.stdin = io.StringIO("\n" * len(hw.rondas))
+        leidas = 0
+        for i in range(len(hw.rondas)):
+            virtual = hw.reloj.monotonic()
+            inicio = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                juego.jugar_ronda()
+            pared = (time.perf_counter() - inicio) * 1000
+            virtual = hw.reloj.monotonic() - virtual
+            juego.EVENTOS.vaciar()
+            entradas = entradas_log(juego.PLAYER_LOG_PATH, leidas)
+            leidas += len(entradas)
+            print(f"ronda {i}: {pared:8.1f} ms reales, {virtual:5.1f} s de juego")
+            for e in entradas:
+                detalle = "".join(f"  {k}={e[k]}" for k in
+                                  ("Samples", "MeasureMs", "Uncertainty")
+                                  if k in e)
+                print(f"    {e['PlayerID']!s:10s} {e['Result']:8s} "
+                      f"Score={e['Score']}{detalle}")
+        os.chdir(RAIZ)
+    hw.cerrar()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Memoria y latencia de leer_ultimo_score_local: readlines vs lectura inversa.
+
+Uso: python benchmarks/bench_score_inverso.py [tamaños...]
+     (por defecto 100 10000 1000000 líneas)
+"""
+import os
+import sys
+import json
+import time
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from bitacora import buscar_ultimo  # noqa: E402
+
+
+def es_score(p):
+    return p.get("Action") == "Ready" and "Score" in p
+
+
+def score_original(ruta):
+    """Lectura original: todo el archivo a memoria y recorrido hacia atrás."""
+    with open(ruta, "r") as f:
+        lineas = [l.strip() for l in f.readlines()]
+    for linea in reversed(lineas):
+        if not linea or linea.startswith("#"):
+            continue
+        try:
+            payload = json.loads(linea[linea.find("{"):])
+        except Exception:
+            continue
+        if es_score(payload):
+            return int(payload.get("Score", 0))
+    return 0
+
+
+def score_inverso(ruta):
+    payload = buscar_ultimo(ruta, es_score)
+    return int(payload.get("Score", 0)) if payload else 0
+
+
+def generar(ruta, n):
+    join = json.dumps({"stage": "Lobby", "PlayerID": 1, "Action": "Join"})
+    with open(ruta, "w") as f:
+        for i in range(n - 2):
+            f.write(f"2024-01-01 00:00:00 {join}\n")
+        ready = {"stage": "R1", "PlayerID": 1, "Action": "Ready",
+                 "GameID": 2, "Result": "Win", "Score": 7}
+        f.write(f"2024-01-01 00:00:00 {json.dumps(ready)}\n")
+        f.write(f"2024-01-01 00:00:00 {join}\n")
+
+
+def medir(funcion, ruta, repeticiones=5):
+    tracemalloc.start()
+    funcion(ruta)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion(ruta)
+    return (time.perf_counter() - inicio) / repeticiones * 1000, pico / 1024
+
+
+def main():
+    tamanos = [int(a) for a in sys.argv[1:]] or [100, 10000, 1000000]
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta = os.path.join(tmp, "player_events.log")
+        print(f"{'líneas':>10} | {'original ms':>11} {'KiB':>10} | "
+              f"{'inverso ms':>10} {'KiB':>7}")
+        for n in tamanos:
+            generar(ruta, n)
+            assert score_original(ruta) == score_inverso(ruta) == 7
+            t_o, m_o = medir(score_original, ruta)
+            t_i, m_i = medir(score_inverso, ruta)
+            print(f"{n:>10} | {t_o:>11.3f} {m_o:>10.1f} | "
+                  f"{t_i:>10.3f} {m_i:>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""Lectura de teclas en juego1: carácter a carácter vs por bloques.
+
+  original: select + sys.stdin.read(1) por carácter y un print con flush
+            por cada eco (como input_con_tiempo_real antes)
+  bloques:  entrada_teclado.leer_con_limite (os.read no bloqueante de todo
+            lo disponible, eco agrupado por tick)
+
+Un proceso aparte teclea un texto con acentos y borrados en una
+pseudo-terminal, una tecla cada INTERVALO_S, y se mide cuántas llamadas
+read/write al sistema (contadores syscr/syscw de /proc/self/io) y cuánto
+CPU gasta cada lector por tecla hasta consumirlo todo.
+
+Con una ráfaga pegada de una vez el original además se traba: read(1)
+sobre sys.stdin trae un bloque entero al buffer de Python y select ya no
+ve datos en el fd, así que el resto espera a la próxima tecla o al fin del
+tiempo. Por eso aquí las teclas llegan espaciadas.
+
+Uso:
+  python benchmarks/bench_teclado.py [teclas]
+"""
+import os
+import io
+import sys
+import pty
+import time
+import select
+import termios
+import tty
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, RAIZ)
+from entrada_teclado import leer_con_limite  # noqa: E402
+
+LIMITE = 60.0
+INTERVALO_S = 0.005
+FRASE = "Programar en Python es muy divertido, año tras año. "
+
+
+def input_original(prompt, tiempo_limite, entrada, salida):
+    print(prompt, end='', flush=True, file=salida)
+    texto_buffer = []
+    inicio = time.time()
+    fd = entrada.fileno()
+    old_settings = termios.tcgetattr(fd)
+    try:
+        tty.setcbreak(fd)
+        while True:
+            restante = tiempo_limite - (time.time() - inicio)
+            if restante <= 0:
+                break
+            rlist, _, _ = select.select([entrada], [], [], restante)
+            if rlist:
+                caracter = entrada.read(1)
+                if caracter in ['\n', '\r']:
+                    print(file=salida)
+                    break
+                elif caracter == '\x7f' and texto_buffer:
+                    texto_buffer.pop()
+                    print('\b \b', end='', flush=True, file=salida)
+                else:
+                    texto_buffer.append(caracter)
+                    print(caracter, end='', flush=True, file=salida)
+            else:
+                break
+    finally:
+        termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
+    tiempo_usado = time.time() - inicio
+    return "".join(texto_buffer), tiempo_usado >= tiempo_limite
+
+
+def llamadas_sistema():
+    with open("/proc/self/io") as f:
+        campos = dict(linea.split(": ") for linea in f.read().splitlines())
+    return int(campos["syscr"]) + int(campos["syscw"])
+
+
+def teclas(cantidad):
+    texto = (FRASE * (cantidad // len(FRASE) + 1))[:cantidad]
+    # Un error corregido cada tanto
+    return list(texto.replace("muy", "mux\x7fy")) + ["\n"]
+
+
+def teclear(maestro, lista):
+    """En un proceso hijo: una tecla por write, cada INTERVALO_S."""
+    pid = os.fork()
+    if pid:
+        return pid
+    try:
+        for tecla in lista:
+            os.write(maestro, tecla.encode())
+            time.sleep(INTERVALO_S)
+    finally:
+        os._exit(0)
+
+
+def medir(nombre, leer, cantidad):
+    maestro, esclavo = pty.openpty()
+    # En cbreak desde antes de teclear, para que la terminal no procese la
+    # línea
+    tty.setcbreak(esclavo)
+    lista = teclas(cantidad)
+    salida = os.open(os.devnull, os.O_WRONLY)
+    antes = llamadas_sistema()
+    cpu = time.process_time()
+    hijo = teclear(maestro, lista)
+    texto, _ = leer(esclavo, salida)
+    cpu = time.process_time() - cpu
+    llamadas = llamadas_sistema() - antes
+    os.waitpid(hijo, 0)
+    for fd in (maestro, esclavo, salida):
+        os.close(fd)
+    print(f"{nombre:10s} {llamadas / len(lista):5.2f} llamadas al sistema y "
+          f"{cpu / len(lista) * 1e6:6.1f} µs de CPU por tecla  "
+          f"({len(texto)} caracteres leídos de {len(lista)} teclas)")
+
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+
+    def original(esclavo, salida):
+        entrada = io.open(esclavo, "r", encoding="utf-8", closefd=False)
+        with io.open(salida, "w", encoding="utf-8", closefd=False) as s:
+            return input_original("> ", LIMITE, entrada, s)
+
+    def bloques(esclavo, salida):
+        return leer_con_limite("> ", LIMITE, esclavo, salida)
+
+    medir("original", original, cantidad)
+    medir("bloques", bloques, cantidad)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Telemetría de juego1: costo por tecla y lectura de muchas rondas.
+
+  por tecla:  LineaTiempoTipeo.insertar/borrar (anotar + métricas en vivo),
+              en µs y en memoria retenida (tracemalloc) tras una ronda
+  guardar:    una ronda al archivo del jugador
+  leer:       resumen() sobre N rondas guardadas
+
+Uso:
+  python benchmarks/bench_telemetria_tipeo.py [rondas]
+"""
+import os
+import sys
+import time
+import random
+import tempfile
+import tracemalloc
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, RAIZ)
+from telemetria_tipeo import (LineaTiempoTipeo, resumen,  # noqa: E402
+                              ruta_jugador)
+
+FRASE = "Programar en Python es muy divertido"
+
+
+def jugar_ronda(rng):
+    linea = LineaTiempoTipeo(FRASE)
+    t = 0
+    linea.empezar(t)
+    for caracter in FRASE:
+        t += int(rng.gauss(180, 40) * 1e6)
+        if rng.random() < 0.05:
+            linea.insertar("x", t)
+            t += int(rng.gauss(250, 50) * 1e6)
+            linea.borrar(t)
+        linea.insertar(caracter, t)
+    linea.terminar(t + 100_000_000)
+    return linea
+
+
+def main():
+    rondas = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    rng = random.Random(0)
+
+    inicio = time.perf_counter()
+    lineas = [jugar_ronda(rng) for _ in range(200)]
+    teclas = sum(linea.n for linea in lineas)
+    por_tecla = (time.perf_counter() - inicio) / teclas * 1e6
+    print(f"por tecla:  {por_tecla:6.2f} µs")
+
+    # Memoria que queda tomada por las teclas de una ronda ya armada
+    linea = LineaTiempoTipeo(FRASE)
+    linea.empezar(0)
+    linea.insertar("P", 1)
+    tracemalloc.start()
+    antes = tracemalloc.take_snapshot()
+    for i, caracter in enumerate(FRASE[1:], 2):
+        linea.insertar(caracter, i * 150_000_000)
+    despues = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    retenidos = {}
+    for s in despues.compare_to(antes, "filename"):
+        nombre = os.path.basename(s.traceback[0].filename)
+        if nombre in ("telemetria_tipeo.py", "puntaje_tipeo.py"):
+            retenidos[nombre] = s.size_diff
+    print(f"            memoria retenida tras {len(FRASE) - 1} teclas: "
+          f"línea de tiempo y métricas "
+          f"{retenidos.get('telemetria_tipeo.py', 0)} B, columnas del "
+          f"puntaje (para poder borrar) {retenidos.get('puntaje_tipeo.py', 0)} B")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        inicio = time.perf_counter()
+        for i in range(rondas):
+            lineas[i % len(lineas)].guardar("P1", 90, "Win", tmp)
+        guardar = (time.perf_counter() - inicio) / rondas * 1e6
+        tamano = os.path.getsize(ruta_jugador("P1", tmp))
+        inicio = time.perf_counter()
+        r = resumen(ruta_jugador("P1", tmp))
+        leer = (time.perf_counter() - inicio) * 1000
+    # Cada guardar salta por las cabeceras de las rondas previas para
+    # recortar una ronda cortada: crece con el historial del archivo
+    print(f"guardar:    {guardar:6.1f} µs por ronda (promedio con 0 a "
+          f"{rondas - 1} rondas previas), {tamano / rondas:.0f} bytes "
+          f"por ronda")
+    print(f"leer:       {leer:6.1f} ms para {r['rondas']} rondas "
+          f"(WPM medio {r['wpm_medio']:.1f}, p50 entre teclas "
+          f"{r['intervalo_p50']} ms)")
+
+
+if __name__ == "__main__":
+    main()
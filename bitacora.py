@@ -0,0 +1,599 @@
+import os
+import json
+import time
+import select
+import struct
+import ctypes
+import ctypes.util
+import threading
+from datetime import datetime
+
+# =========================================
+# LECTURA DE LOGS COMPARTIDOS
+# (game_status.log / player_events.log)
+# =========================================
+
+
+def parsear_linea(linea):
+    """Convierte una línea 'timestamp {json}' (str o bytes) en dict, o None."""
+    linea = linea.strip()
+    crudo = isinstance(linea, bytes)
+    if not linea or linea.startswith(b"#" if crudo else "#"):
+        return None
+    # Se busca la '{' y no el primer espacio: el timestamp que escriben los
+    # jugadores ("%Y-%m-%d %H:%M:%S") ya contiene un espacio
+    idx_json = linea.find(b"{" if crudo else "{")
+    if idx_json < 0:
+        return None
+    try:
+        payload = json.loads(linea[idx_json:])
+    except Exception:
+        return None
+    return payload if isinstance(payload, dict) else None
+
+
+# =========================================
+# CONSULTAS CON PREFILTRO
+# =========================================
+def _token(valor):
+    """Fragmento que sí o sí aparece en la línea si el campo vale valor.
+
+    Solo se usa para valores cuyo JSON no depende de cómo se serializó
+    (sin escapes ni caracteres no ASCII); para el resto no hay prefiltro.
+    """
+    # None también coincide con un campo ausente: no sirve como token
+    if isinstance(valor, bool):
+        return json.dumps(valor).encode()
+    if isinstance(valor, int):
+        return str(valor).encode()
+    if isinstance(valor, str) and valor.isascii() and valor.isprintable() \
+            and '"' not in valor and "\\" not in valor and "/" not in valor:
+        return f'"{valor}"'.encode()
+    return None
+
+
+class Consulta:
+    """Predicado sobre los campos de un payload con prefiltro por bytes.
+
+    Consulta(Action="Sabotage", stage="R1") se cumple si ambos campos son
+    iguales; una tupla o lista como valor admite cualquiera de sus valores
+    y requiere=("Score",) exige que el campo exista. Antes de hacer
+    json.loads, candidata() busca en la línea cruda los tokens que
+    cualquier coincidencia tiene que contener (p. ej. b'"Sabotage"'), de
+    modo que la mayoría de líneas se descartan sin decodificarlas.
+    """
+
+    def __init__(self, requiere=(), **iguales):
+        self.requiere = tuple(requiere)
+        self.iguales = iguales
+        # Cada grupo es un "alguno de": la línea debe contener al menos un
+        # token de cada grupo
+        self.grupos = []
+        for campo, valor in iguales.items():
+            opciones = valor if isinstance(valor, (tuple, list)) else (valor,)
+            tokens = [_token(v) for v in opciones]
+            if tokens and None not in tokens:
+                self.grupos.append(tuple(tokens))
+        for campo in self.requiere:
+            token = _token(campo)
+            if token is not None:
+                self.grupos.append((token,))
+
+    def candidata(self, linea):
+        for grupo in self.grupos:
+            for token in grupo:
+                if token in linea:
+                    break
+            else:
+                return False
+        return True
+
+    def __call__(self, payload):
+        for campo, valor in self.iguales.items():
+            if isinstance(valor, (tuple, list)):
+                if payload.get(campo) not in valor:
+                    return False
+            elif payload.get(campo) != valor:
+                return False
+        return all(campo in payload for campo in self.requiere)
+
+    def filtrar(self, lineas):
+        """Genera los payloads de lineas (bytes) que cumplen la consulta."""
+        for linea in lineas:
+            if self.candidata(linea):
+                payload = parsear_linea(linea)
+                if payload is not None and self(payload):
+                    yield payload
+
+
+class SeguidorLog:
+    """Sigue un log recordando offset e inodo; solo parsea lo nuevo."""
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self.offset = 0
+        self.inodo = None
+        self.pendiente = b""
+        # Cuántas veces se volvió a leer desde cero (rotación/truncado)
+        self.generacion = 0
+        # Primeros bytes del archivo: detectan un archivo recreado que
+        # reutiliza el mismo inodo (pasa en tmpfs/ext4 tras borrar)
+        self.firma = b""
+
+    def reiniciar(self):
+        if self.offset or self.pendiente or self.inodo is not None:
+            self.generacion += 1
+        self.offset = 0
+        self.inodo = None
+        self.pendiente = b""
+        self.firma = b""
+
+    def leer_lineas_crudas(self):
+        """Devuelve (en bytes) las líneas completas añadidas desde la última lectura."""
+        try:
+            with open(self.ruta, "rb") as f:
+                st = os.fstat(f.fileno())
+                # Rotación (otro inodo) o truncado: se vuelve a empezar
+                if st.st_ino != self.inodo or st.st_size < self.offset:
+                    self.reiniciar()
+                    self.inodo = st.st_ino
+                elif self.firma and f.read(len(self.firma)) != self.firma:
+                    self.reiniciar()
+                    self.inodo = st.st_ino
+                if st.st_size == self.offset:
+                    return []
+                f.seek(self.offset)
+                datos = f.read()
+                if self.offset == 0:
+                    self.firma = datos[:64]
+        except FileNotFoundError:
+            self.reiniciar()
+            return []
+
+        self.offset += len(datos)
+        datos = self.pendiente + datos
+        # La última línea puede estar a medio escribir por el host
+        corte = datos.rfind(b"\n")
+        if corte < 0:
+            self.pendiente = datos
+            return []
+        self.pendiente = datos[corte + 1:]
+        return datos[:corte].split(b"\n")
+
+    def leer_lineas_nuevas(self):
+        return [l.decode("utf-8", errors="replace")
+                for l in self.leer_lineas_crudas()]
+
+    def leer_nuevos(self, consulta=None):
+        """Payloads de las líneas nuevas; con consulta, solo los que la cumplen."""
+        if consulta is not None:
+            return list(consulta.filtrar(self.leer_lineas_crudas()))
+        payloads = []
+        for linea in self.leer_lineas_crudas():
+            payload = parsear_linea(linea)
+            if payload is not None:
+                payloads.append(payload)
+        return payloads
+
+
+def clave_compactacion(payload):
+    """Clave bajo la que un registro reemplaza a los anteriores, o None.
+
+    Para el estado del juego solo importa el último registro de cada clave:
+    el Accepted de cada jugador, la última asignación, el último sabotaje
+    de cada stage y el último resultado (Ready con Score) de cada jugador.
+    """
+    accion = payload.get("Action")
+    try:
+        if accion == "Accepted" and payload.get("stage") == "Lobby":
+            clave = ("Accepted", payload.get("PlayerID"))
+        elif accion == "Assign" and "GameID" in payload:
+            clave = ("Assign",)
+        elif accion == "Sabotage":
+            clave = ("Sabotage", payload.get("stage"))
+        elif accion == "Ready" and "Score" in payload:
+            clave = ("Ready", payload.get("PlayerID"))
+        else:
+            return None
+        hash(clave)
+    except TypeError:
+        return None
+    return clave
+
+
+# Solo estas acciones cambian el estado; el resto ni se decodifica
+CONSULTA_ESTADO = Consulta(Action=("Accepted", "Assign", "Sabotage", "Ready"))
+
+
+class EstadoHost:
+    """Vista materializada de game_status.log construida en una sola pasada.
+
+    Guarda los jugadores aceptados, la última asignación, el último
+    sabotaje por stage y el último score por jugador. Parte del checkpoint
+    de rotar_log (si existe) y solo relee el segmento activo si cambió su
+    tamaño o mtime, y en ese caso únicamente lo añadido desde la última vez.
+    """
+
+    def __init__(self, ruta):
+        self.seguidor = SeguidorLog(ruta)
+        self.firma_stat = None
+        # transporte.ClienteHost aplica aquí desde su hilo lo que le llega
+        self.lock = threading.RLock()
+        # Mientras hay un ClienteHost conectado, el socket es la única
+        # fuente: el archivo es un espejo que va detrás, y releerlo podría
+        # pisar un Assign o Sabotage más nuevo con uno viejo. Al
+        # desconectarse se retoma el archivo desde donde se dejó.
+        self.cliente = None
+        self.limpiar()
+
+    def limpiar(self):
+        """Vuelve al estado del checkpoint más los segmentos posteriores."""
+        self.registros = {}
+        self.aceptados = {}
+        self.asignacion = None
+        self.sabotajes = {}
+        self.scores = {}
+        checkpoint = leer_checkpoint(self.seguidor.ruta)
+        for payload in checkpoint.get("registros", []):
+            self.aplicar(payload)
+        self.hasta_segmento = checkpoint.get("hasta", 0)
+        # Segmentos rotados después del último checkpoint (p. ej. si el
+        # proceso que rotó murió antes de escribirlo)
+        for n, ruta_seg in segmentos(self.seguidor.ruta):
+            if n > self.hasta_segmento:
+                for payload in leer_payloads(ruta_seg, CONSULTA_ESTADO):
+                    self.aplicar(payload)
+                self.hasta_segmento = n
+
+    def aplicar(self, payload):
+        clave = clave_compactacion(payload)
+        if clave is None:
+            return
+        self.registros.pop(clave, None)
+        self.registros[clave] = payload
+        accion = clave[0]
+        if accion == "Accepted":
+            self.aceptados[clave[1]] = payload
+        elif accion == "Assign":
+            self.asignacion = (payload.get("stage"), payload.get("GameID"))
+        elif accion == "Sabotage":
+            self.sabotajes[clave[1]] = {
+                "Effect": payload.get("Effect"),
+                "Value": payload.get("Value")}
+        elif accion == "Ready":
+            self.scores[clave[1]] = payload.get("Score")
+
+    def actualizar(self):
+        if self.cliente is not None:
+            return self
+        try:
+            st = os.stat(self.seguidor.ruta)
+            firma = (st.st_ino, st.st_size, st.st_mtime_ns)
+        except OSError:
+            firma = None
+        if firma is not None and firma == self.firma_stat:
+            return self
+        with self.lock:
+            self.firma_stat = firma
+            generacion = self.seguidor.generacion
+            payloads = self.seguidor.leer_nuevos(CONSULTA_ESTADO)
+            if self.seguidor.generacion != generacion:
+                self.limpiar()
+            for payload in payloads:
+                self.aplicar(payload)
+        return self
+
+    def accepted_de(self, player_id):
+        try:
+            return self.aceptados.get(player_id)
+        except TypeError:
+            return None
+
+    def ultimo_sabotaje(self, stage):
+        try:
+            sabotaje = self.sabotajes.get(stage)
+        except TypeError:
+            return None
+        return dict(sabotaje) if sabotaje else None
+
+    def registros_compactados(self):
+        """Registros mínimos que, reaplicados en orden, dan este estado."""
+        return list(self.registros.values())
+
+
+_estados_host = {}
+
+
+def estado_host(ruta):
+    """Devuelve el EstadoHost compartido para ruta, ya actualizado."""
+    clave = os.path.normpath(ruta)
+    estado = _estados_host.get(clave)
+    if estado is None:
+        estado = _estados_host[clave] = EstadoHost(ruta)
+    return estado.actualizar()
+
+
+def leer_lineas_al_reves(ruta, tam_bloque=8192, crudas=False):
+    """Genera las líneas de ruta desde el final, leyendo bloques fijos.
+
+    Solo se decodifica lo que el consumidor pide, así que encontrar algo
+    cerca del final cuesta lo mismo con 100 líneas que con millones.
+    Con crudas=True las líneas se entregan en bytes, sin decodificar.
+    """
+    with open(ruta, "rb") as f:
+        pos = f.seek(0, os.SEEK_END)
+        resto = b""
+        while pos > 0:
+            leer = min(tam_bloque, pos)
+            pos -= leer
+            f.seek(pos)
+            bloque = f.read(leer) + resto
+            lineas = bloque.split(b"\n")
+            # La primera puede estar cortada: se completa con el bloque anterior
+            resto = lineas[0]
+            for linea in reversed(lineas[1:]):
+                if linea:
+                    yield linea if crudas else linea.decode(
+                        "utf-8", errors="replace")
+        if resto:
+            yield resto if crudas else resto.decode("utf-8", errors="replace")
+
+
+def buscar_ultimo(ruta, condicion):
+    """Devuelve el último payload de ruta que cumpla condicion, o None.
+
+    Busca en el segmento activo y, si no aparece, en los segmentos que el
+    checkpoint aún no cubre y en los registros compactados del checkpoint.
+    Si condicion es una Consulta, las líneas se prefiltran sin decodificar.
+    """
+    candidata = getattr(condicion, "candidata", None)
+    checkpoint = leer_checkpoint(ruta)
+    pendientes = [r for n, r in segmentos(ruta)
+                  if n > checkpoint.get("hasta", 0)]
+    for ruta_seg in [ruta] + pendientes[::-1]:
+        try:
+            for linea in leer_lineas_al_reves(ruta_seg, crudas=True):
+                if candidata is not None and not candidata(linea):
+                    continue
+                payload = parsear_linea(linea)
+                if payload is not None and condicion(payload):
+                    return payload
+        except FileNotFoundError:
+            pass
+    for payload in reversed(checkpoint.get("registros", [])):
+        if condicion(payload):
+            return payload
+    return None
+
+
+def leer_payloads(ruta, consulta=None):
+    """Payloads de ruta en orden (para segmentos cerrados)."""
+    try:
+        with open(ruta, "rb") as f:
+            if consulta is not None:
+                return list(consulta.filtrar(f))
+            return [p for p in map(parsear_linea, f) if p is not None]
+    except FileNotFoundError:
+        return []
+
+
+# =========================================
+# SEGMENTOS, ROTACIÓN Y CHECKPOINT
+# =========================================
+# El segmento activo siempre conserva el nombre original (game_status.log,
+# player_events.log) para que el host y las herramientas existentes lo
+# sigan leyendo igual. Al rotar pasa a llamarse <ruta>.000001, .000002...
+# y <ruta>.checkpoint guarda los registros compactados hasta ese segmento.
+FORMATO_FECHA = "%Y-%m-%d %H:%M:%S"
+
+
+def ruta_checkpoint(ruta):
+    return ruta + ".checkpoint"
+
+
+def segmentos(ruta):
+    """Lista ordenada de (número, ruta) de los segmentos ya rotados."""
+    directorio = os.path.dirname(ruta) or "."
+    prefijo = os.path.basename(ruta) + "."
+    encontrados = []
+    try:
+        nombres = os.listdir(directorio)
+    except FileNotFoundError:
+        return []
+    for nombre in nombres:
+        sufijo = nombre[len(prefijo):]
+        if nombre.startswith(prefijo) and sufijo.isdigit():
+            encontrados.append((int(sufijo), os.path.join(directorio, nombre)))
+    return sorted(encontrados)
+
+
+def leer_checkpoint(ruta):
+    try:
+        with open(ruta_checkpoint(ruta), "r") as f:
+            checkpoint = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+    return checkpoint if isinstance(checkpoint, dict) else {}
+
+
+def necesita_rotar(ruta, max_bytes=None, max_segundos=None):
+    """True si el segmento activo superó el tamaño o la antigüedad dados."""
+    try:
+        tam = os.path.getsize(ruta)
+    except OSError:
+        return False
+    if tam == 0:
+        return False
+    if max_bytes is not None and tam >= max_bytes:
+        return True
+    if max_segundos is not None:
+        # La antigüedad se mide desde el timestamp de la primera línea
+        with open(ruta, "r", errors="replace") as f:
+            primera = f.readline()
+        try:
+            inicio = datetime.strptime(primera[:19], FORMATO_FECHA)
+        except ValueError:
+            return False
+        return (datetime.now() - inicio).total_seconds() >= max_segundos
+    return False
+
+
+def rotar_log(ruta, max_bytes=None, max_segundos=None, conservar=5,
+              forzar=False):
+    """Cierra el segmento activo si corresponde y actualiza el checkpoint.
+
+    Primero se renombra el activo (quien escriba después crea uno nuevo)
+    y luego se compacta checkpoint + segmento en un checkpoint nuevo que
+    se reemplaza de forma atómica. Se conservan los últimos 'conservar'
+    segmentos; los anteriores ya están resumidos en el checkpoint.
+    Devuelve True si rotó.
+    """
+    if not forzar and not necesita_rotar(ruta, max_bytes, max_segundos):
+        return False
+    if not os.path.exists(ruta):
+        return False
+    existentes = segmentos(ruta)
+    numero = existentes[-1][0] + 1 if existentes else 1
+    os.rename(ruta, f"{ruta}.{numero:06d}")
+
+    # EstadoHost ya sabe cargar checkpoint + segmentos pendientes
+    estado = EstadoHost(ruta)
+    checkpoint = {"hasta": estado.hasta_segmento,
+                  "creado": datetime.now().strftime(FORMATO_FECHA),
+                  "registros": estado.registros_compactados()}
+    tmp = ruta_checkpoint(ruta) + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(checkpoint, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, ruta_checkpoint(ruta))
+
+    for n, ruta_seg in segmentos(ruta):
+        if n <= estado.hasta_segmento - conservar:
+            os.remove(ruta_seg)
+    return True
+
+
+# =========================================
+# ESPERA POR NOTIFICACIONES (inotify)
+# =========================================
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+_EVENTO_INOTIFY = struct.Struct("iIII")
+
+
+def _cargar_libc():
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        libc.inotify_init1
+        libc.inotify_add_watch
+    except (OSError, AttributeError, TypeError):
+        return None
+    return libc
+
+
+class VigilanteArchivo:
+    """Despierta cuando cambia un archivo (inotify en Linux, polling si no).
+
+    Se vigila el directorio y no el archivo, así también se detecta cuando
+    el host crea o rota el log después de que el jugador empezó a esperar.
+    """
+
+    def __init__(self, ruta, intervalo_polling=0.05):
+        self.ruta = ruta
+        self.nombre = os.fsencode(os.path.basename(ruta))
+        self.intervalo_polling = intervalo_polling
+        self.fd = None
+        self.ultimo_stat = self._stat()
+        libc = _cargar_libc()
+        if libc is None:
+            return
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            return
+        directorio = os.path.dirname(ruta) or "."
+        mascara = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+        if libc.inotify_add_watch(fd, os.fsencode(directorio), mascara) < 0:
+            os.close(fd)
+            return
+        self.fd = fd
+
+    @property
+    def usa_inotify(self):
+        return self.fd is not None
+
+    def _stat(self):
+        try:
+            st = os.stat(self.ruta)
+        except OSError:
+            return None
+        return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+    def _hay_evento_del_archivo(self):
+        try:
+            datos = os.read(self.fd, 4096)
+        except BlockingIOError:
+            return False
+        pos = 0
+        while pos + _EVENTO_INOTIFY.size <= len(datos):
+            _, _, _, largo = _EVENTO_INOTIFY.unpack_from(datos, pos)
+            pos += _EVENTO_INOTIFY.size
+            nombre = datos[pos:pos + largo].rstrip(b"\0")
+            pos += largo
+            if nombre == self.nombre:
+                return True
+        return False
+
+    def esperar(self, timeout):
+        """Bloquea hasta que el archivo cambie o pase timeout. True si cambió."""
+        limite = time.monotonic() + timeout
+        while True:
+            restante = limite - time.monotonic()
+            if restante <= 0:
+                return False
+            if self.fd is not None:
+                rlist, _, _ = select.select([self.fd], [], [], restante)
+                if rlist and self._hay_evento_del_archivo():
+                    return True
+            else:
+                time.sleep(min(self.intervalo_polling, restante))
+                actual = self._stat()
+                if actual != self.ultimo_stat:
+                    self.ultimo_stat = actual
+                    return True
+
+    def cerrar(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+
+# =========================================
+# MANTENIMIENTO (lo usa el host, p. ej. desde cron)
+# =========================================
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Rota un log del juego y compacta su checkpoint.")
+    parser.add_argument("ruta", help="game_status.log o player_events.log")
+    parser.add_argument("--max-bytes", type=int, default=None)
+    parser.add_argument("--max-segundos", type=int, default=None)
+    parser.add_argument("--conservar", type=int, default=5)
+    parser.add_argument("--forzar", action="store_true")
+    args = parser.parse_args()
+    if rotar_log(args.ruta, args.max_bytes, args.max_segundos,
+                 args.conservar, args.forzar):
+        print(f"🔁 {args.ruta} rotado; checkpoint en {ruta_checkpoint(args.ruta)}")
+    else:
+        print(f"{args.ruta}: no hace falta rotar.")
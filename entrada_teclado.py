@@ -0,0 +1,177 @@
+import os
+import sys
+import time
+import fcntl
+import codecs
+import select
+import termios
+import tty
+
+# =========================================
+# LECTURA DE TECLADO CON TIEMPO LÍMITE (juego1)
+# =========================================
+# Cada vez que stdin tiene datos se lee todo lo disponible con os.read no
+# bloqueante (una ráfaga pegada o tecleada rápido por SSH entra de una
+# vez), se decodifica UTF-8 de forma incremental (una tecla multibyte
+# puede llegar partida) y el eco se junta en un solo write por tick de
+# refresco. El límite se mide con time.monotonic: lo que llega después
+# del plazo no se acepta.
+TICK_ECO = 1 / 60
+BLOQUE = 4096
+BORRAR = ("\x7f", "\b")
+FIN_DE_LINEA = ("\n", "\r")
+ESC = "\x1b"
+
+
+def _escribir_todo(fd, datos):
+    """Escribe datos completos aunque fd esté en modo no bloqueante.
+
+    En una tty o pty de SSH, stdin y stdout suelen compartir la descripción
+    de archivo, así que O_NONBLOCK sobre stdin también alcanza a stdout:
+    una escritura puede quedar a medias o fallar con EAGAIN.
+    """
+    vista = memoryview(datos)
+    while vista:
+        try:
+            escritos = os.write(fd, vista)
+        except BlockingIOError:
+            select.select([], [fd], [])
+            continue
+        vista = vista[escritos:]
+
+
+class EditorLinea:
+    """Texto tecleado a partir de lo que llega por la terminal.
+
+    alimentar recibe texto ya decodificado y devuelve el eco a escribir.
+    Entiende Enter, borrar (DEL o Ctrl-H) y descarta secuencias de escape
+    (flechas, teclas de función) y otros caracteres de control.
+    al_insertar(c, t_ns), al_borrar(t_ns) y al_terminar(t_ns) se llaman con
+    cada cambio, con el instante (time.monotonic_ns) en que se leyó la
+    tecla; p. ej. telemetria_tipeo.LineaTiempoTipeo.
+    """
+
+    def __init__(self, al_insertar=None, al_borrar=None, al_terminar=None):
+        self.al_insertar = al_insertar
+        self.al_borrar = al_borrar
+        self.al_terminar = al_terminar
+        self.caracteres = []
+        self.terminado = False
+        # None, "esc" (vino ESC) o "csi" (dentro de ESC [ ... / ESC O ...)
+        self._escape = None
+
+    @property
+    def texto(self):
+        return "".join(self.caracteres)
+
+    def alimentar(self, texto, t_ns=None):
+        eco = []
+        for caracter in texto:
+            if self.terminado:
+                break
+            if self._escape == "esc":
+                self._escape = None
+                # Solo ESC [ y ESC O abren una secuencia; tras un ESC suelto
+                # el carácter siguiente es una tecla normal
+                if caracter in "[O":
+                    self._escape = "csi"
+                    continue
+            if self._escape == "csi":
+                # Termina en un byte final de CSI (@ hasta ~)
+                if "@" <= caracter <= "~":
+                    self._escape = None
+                continue
+            if caracter == ESC:
+                self._escape = "esc"
+            elif caracter in FIN_DE_LINEA:
+                self.terminado = True
+                if self.al_terminar:
+                    self.al_terminar(t_ns)
+                eco.append("\n")
+            elif caracter in BORRAR:
+                if self.caracteres:
+                    borrado = self.caracteres.pop()
+                    if self.al_borrar:
+                        self.al_borrar(t_ns)
+                    # Si aún no se mostró, basta con no mostrarlo
+                    if eco and eco[-1] == borrado:
+                        eco.pop()
+                    else:
+                        eco.append("\b \b")
+            elif caracter >= " ":
+                self.caracteres.append(caracter)
+                if self.al_insertar:
+                    self.al_insertar(caracter, t_ns)
+                eco.append(caracter)
+        return "".join(eco)
+
+
+def leer_con_limite(prompt, tiempo_limite, fd_entrada=None, fd_salida=None,
+                    tick=TICK_ECO, editor=None):
+    """(texto, tiempo_agotado): lee una línea sin bloquear más del límite.
+
+    Pone la terminal en modo cbreak y stdin en no bloqueante mientras
+    dura la lectura, y los restaura al salir. El eco pasa por
+    _escribir_todo porque stdout puede haber quedado no bloqueante también.
+    """
+    fd_entrada = sys.stdin.fileno() if fd_entrada is None else fd_entrada
+    fd_salida = sys.stdout.fileno() if fd_salida is None else fd_salida
+    sys.stdout.flush()
+    _escribir_todo(fd_salida, prompt.encode())
+    editor = EditorLinea() if editor is None else editor
+    decodificador = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    inicio = time.monotonic()
+    limite = inicio + tiempo_limite
+    pendiente = []
+    proximo_eco = inicio
+
+    es_tty = os.isatty(fd_entrada)
+    if es_tty:
+        termios_previo = termios.tcgetattr(fd_entrada)
+    flags_previos = fcntl.fcntl(fd_entrada, fcntl.F_GETFL)
+    try:
+        if es_tty:
+            tty.setcbreak(fd_entrada)
+        fcntl.fcntl(fd_entrada, fcntl.F_SETFL, flags_previos | os.O_NONBLOCK)
+        fin_de_entrada = False
+        while not editor.terminado and not fin_de_entrada:
+            ahora = time.monotonic()
+            if ahora >= limite:
+                break
+            espera = limite - ahora
+            if pendiente:
+                espera = min(espera, max(0.0, proximo_eco - ahora))
+            listos, _, _ = select.select([fd_entrada], [], [], espera)
+            ahora_ns = time.monotonic_ns()
+            ahora = ahora_ns / 1e9
+            if listos and ahora < limite:
+                bloques = []
+                while True:
+                    try:
+                        bloque = os.read(fd_entrada, BLOQUE)
+                    except BlockingIOError:
+                        break
+                    if not bloque:
+                        fin_de_entrada = True
+                        break
+                    bloques.append(bloque)
+                    # Una lectura corta ya vació lo disponible: no hace
+                    # falta otra que termine en EAGAIN
+                    if len(bloque) < BLOQUE:
+                        break
+                eco = editor.alimentar(
+                    decodificador.decode(b"".join(bloques), fin_de_entrada),
+                    ahora_ns)
+                if eco:
+                    pendiente.append(eco)
+            if pendiente and (ahora >= proximo_eco or editor.terminado):
+                _escribir_todo(fd_salida, "".join(pendiente).encode())
+                pendiente = []
+                proximo_eco = ahora + tick
+    finally:
+        fcntl.fcntl(fd_entrada, fcntl.F_SETFL, flags_previos)
+        if es_tty:
+            termios.tcsetattr(fd_entrada, termios.TCSADRAIN, termios_previo)
+    if pendiente:
+        _escribir_todo(fd_salida, "".join(pendiente).encode())
+    return editor.texto, not editor.terminado and time.monotonic() >= limite
@@ -0,0 +1,184 @@
+import os
+import json
+import time
+import atexit
+import threading
+from datetime import datetime
+from bitacora import FORMATO_FECHA, rotar_log
+
+# =========================================
+# ESCRITOR DE EVENTOS DEL JUGADOR
+# (player_events.log)
+# =========================================
+POLITICAS = ("inmediata", "cada_n", "cada_ms")
+
+
+class EscritorEventos:
+    """Mantiene abierto el log del jugador y agrupa escrituras.
+
+    politica:
+      - "inmediata": cada evento se escribe en el momento.
+      - "cada_n": se escribe un lote cuando hay cada_n eventos pendientes.
+      - "cada_ms": se escribe lo pendiente cada_ms después del primero.
+    En los dos últimos casos la escritura la hace un hilo aparte, así el
+    bucle del juego nunca espera al disco. Con fsync=True cada lote se
+    fuerza a disco. Lo pendiente se escribe siempre al salir.
+
+    Si se asigna transporte (ver transporte.conectar_host), cada evento
+    además se envía al host por socket en el momento.
+
+    Si se da max_bytes o max_segundos, el segmento activo se rota con
+    bitacora.rotar_log al superarlos (ver bitacora para el checkpoint).
+    """
+
+    def __init__(self, ruta, politica="cada_ms", cada_n=20, cada_ms=100,
+                 fsync=False, max_bytes=None, max_segundos=None,
+                 conservar=5):
+        if politica not in POLITICAS:
+            raise ValueError(f"Política de escritura desconocida: {politica}")
+        self.ruta = ruta
+        self.politica = politica
+        self.cada_n = max(1, int(cada_n))
+        self.cada_ms = max(0, cada_ms)
+        self.fsync = fsync
+        self.max_bytes = max_bytes
+        self.max_segundos = max_segundos
+        self.conservar = conservar
+        self._inicio_segmento = None
+        self._pendientes = []
+        self._cond = threading.Condition()
+        self._lock_io = threading.Lock()
+        self._archivo = None
+        self._hilo = None
+        self._cerrado = False
+        self.transporte = None
+        atexit.register(self.cerrar)
+
+    def escribir(self, payload, confirmar=False):
+        """Encola payload como 'timestamp {json}' y devuelve esa línea.
+
+        Con confirmar=True la línea (y todo lo anterior) queda escrita al
+        volver, útil para los mensajes que el host está esperando.
+        """
+        timestamp = datetime.now().strftime(FORMATO_FECHA)
+        linea = f"{timestamp} {json.dumps(payload)}"
+        if self.transporte is not None:
+            self.transporte.enviar(payload)
+        with self._cond:
+            self._pendientes.append(linea + "\n")
+            self._cond.notify()
+        if confirmar or self.politica == "inmediata" or self._cerrado:
+            self.vaciar()
+        else:
+            self._asegurar_hilo()
+        return linea
+
+    def vaciar(self):
+        """Escribe ya todo lo pendiente (group commit)."""
+        with self._lock_io:
+            with self._cond:
+                lote, self._pendientes = self._pendientes, []
+            if not lote:
+                return
+            if self._archivo is None:
+                self._abrir()
+            self._archivo.write("".join(lote))
+            self._archivo.flush()
+            if self.fsync:
+                os.fsync(self._archivo.fileno())
+            if self._toca_rotar():
+                self._archivo.close()
+                self._archivo = None
+                rotar_log(self.ruta, conservar=self.conservar, forzar=True)
+
+    def _abrir(self):
+        os.makedirs(os.path.dirname(self.ruta) or ".", exist_ok=True)
+        self._archivo = open(self.ruta, "a+")
+        # La antigüedad del segmento sale de su primera línea, si ya existía
+        self._archivo.seek(0)
+        primera = self._archivo.readline()
+        self._archivo.seek(0, os.SEEK_END)
+        try:
+            inicio = datetime.strptime(primera[:19], FORMATO_FECHA)
+            self._inicio_segmento = inicio.timestamp()
+        except ValueError:
+            self._inicio_segmento = time.time()
+
+    def _toca_rotar(self):
+        if self.max_bytes is not None and self._archivo.tell() >= self.max_bytes:
+            return True
+        return (self.max_segundos is not None and
+                time.time() - self._inicio_segmento >= self.max_segundos)
+
+    def cerrar(self):
+        with self._cond:
+            self._cerrado = True
+            self._cond.notify()
+        hilo = self._hilo
+        if hilo is not None and hilo is not threading.current_thread():
+            hilo.join()
+        self.vaciar()
+        with self._lock_io:
+            if self._archivo is not None:
+                self._archivo.close()
+                self._archivo = None
+
+    def _asegurar_hilo(self):
+        if self._hilo is None:
+            with self._cond:
+                if self._hilo is None and not self._cerrado:
+                    self._hilo = threading.Thread(
+                        target=self._bucle, name="escritor-eventos",
+                        daemon=True)
+                    self._hilo.start()
+
+    def _bucle(self):
+        while True:
+            with self._cond:
+                if self.politica == "cada_n":
+                    self._cond.wait_for(
+                        lambda: len(self._pendientes) >= self.cada_n
+                        or self._cerrado)
+                else:
+                    self._cond.wait_for(
+                        lambda: self._pendientes or self._cerrado)
+                    if not self._cerrado:
+                        # Se da tiempo a que lleguen más eventos al lote
+                        self._cond.wait_for(lambda: self._cerrado,
+                                            self.cada_ms / 1000.0)
+                if self._cerrado:
+                    return
+            try:
+                self.vaciar()
+            except OSError as e:
+                print(f"❌ Error al escribir el registro: {e}")
+
+
+_escritores = {}
+
+
+def escritor_para(ruta, **politica):
+    """Devuelve el EscritorEventos compartido para ruta."""
+    # "./player_events.log" y "player_events.log" son el mismo archivo
+    clave = os.path.normpath(ruta)
+    escritor = _escritores.get(clave)
+    if escritor is None:
+        escritor = _escritores[clave] = EscritorEventos(ruta, **politica)
+    return escritor
+
+
+# =========================================
+# LOG DEL JUGADOR COMPARTIDO
+# =========================================
+# Un solo lugar para la política de player_events.log: los juegos y el
+# lanzador comparten el escritor, y el primero en crearlo la fija.
+# Los resultados se agrupan cada 100 ms (Join/Ready se confirman al
+# momento) y el segmento rota al pasar 1 MiB o 24 h.
+RUTA_EVENTOS_JUGADOR = "player_events.log"
+
+
+def eventos_jugador():
+    """El EscritorEventos de player_events.log."""
+    return escritor_para(RUTA_EVENTOS_JUGADOR, politica="cada_ms",
+                         cada_ms=100, max_bytes=1 << 20,
+                         max_segundos=24 * 3600)
@@ -0,0 +1,169 @@
+import math
+import random
+
+# =========================================
+# FÍSICA DEL JUEGO DE ARCO Y FLECHA
+# =========================================
+# Sin pygame: la usan juego2arcoyflecha.py (con los tamaños reales de los
+# sprites) y simulador_arco.py (sin pantalla, miles de partidas).
+ANCHO, ALTO = 800, 600
+# Paso fijo de simulación: las velocidades están pensadas por tick de 60 Hz
+FISICA_DT = 1 / 60
+DURACION_BASE = 15
+PUNTAJE_GANADOR = 7
+TAM_FLECHA = (100, 20)
+TAM_DIANA = (80, 80)
+
+
+def duracion_con_delay(value):
+    """Duración de la partida con un sabotaje Delay de value segundos."""
+    return max(5, DURACION_BASE - value)
+
+
+def _redondear(valor):
+    # pygame redondea las coordenadas float alejándose de cero en .5
+    return int(valor + 0.5) if valor >= 0 else -int(-valor + 0.5)
+
+
+def _rect_centrado(centro, tam):
+    # Igual que Surface.get_rect(center=...)
+    ancho, alto = tam
+    return (_redondear(centro[0]) - ancho // 2,
+            _redondear(centro[1]) - alto // 2, ancho, alto)
+
+
+def _se_tocan(a, b):
+    # Igual que Rect.colliderect
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    return ax < bx + bw and bx < ax + aw and ay < by + bh and by < ay + ah
+
+
+class PartidaArco:
+    """Estado y paso de física de una partida.
+
+    rng se usa para la altura de la diana (por defecto el módulo random;
+    el simulador pasa un random.Random con semilla). tam_flecha recibe el
+    ángulo y devuelve el tamaño del sprite rotado; sin él se usa el de la
+    flecha sin rotar.
+    """
+
+    def __init__(self, rng=None, duracion=DURACION_BASE,
+                 puntaje_ganador=PUNTAJE_GANADOR, target_speed=4,
+                 arrow_speed_base=15, tam_flecha=None, tam_diana=TAM_DIANA):
+        self.rng = rng if rng is not None else random
+        self.duracion = duracion
+        self.puntaje_ganador = puntaje_ganador
+        self.target_speed = target_speed
+        self.arrow_speed_base = arrow_speed_base
+        self.tam_flecha = tam_flecha or (lambda angulo: TAM_FLECHA)
+        self.tam_diana = tam_diana
+        self.bow_x, self.bow_y = 50, ALTO // 2 - 25
+        self.arrow_speed_x = 0
+        self.arrow_speed_y = 0
+        self.arrow_angle_launch = 0
+        self.arrow_flying = False
+        self.reset_arrow()
+        self.target_x = ANCHO - 100
+        self.target_y = self.target_prev_y = self.rng.randint(100, ALTO - 180)
+        self.target_direction = -1
+        self.score = 0
+        self.disparos = 0
+        self.pasos = 0
+
+    @property
+    def tiempo(self):
+        """Segundos de juego simulados."""
+        return self.pasos * FISICA_DT
+
+    def resultado(self):
+        """'VICTORIA', 'TIEMPO_AGOTADO' o None si la partida sigue."""
+        if self.score >= self.puntaje_ganador:
+            return "VICTORIA"
+        if self.tiempo >= self.duracion:
+            return "TIEMPO_AGOTADO"
+        return None
+
+    def reset_arrow(self):
+        self.arrow_flying = False
+        self.arrow_x, self.arrow_y = self.bow_x + 50, self.bow_y + 15
+        # Sin esto la interpolación dibujaría la flecha "volando" hacia el arco
+        self.arrow_prev_x, self.arrow_prev_y = self.arrow_x, self.arrow_y
+
+    def disparar(self, angulo=None):
+        if angulo is not None:
+            self.arrow_angle_launch = angulo
+        self.reset_arrow()
+        self.arrow_flying = True
+        radianes = math.radians(self.arrow_angle_launch)
+        self.arrow_speed_x = self.arrow_speed_base * math.cos(radianes)
+        self.arrow_speed_y = self.arrow_speed_base * math.sin(radianes)
+        self.disparos += 1
+
+    def colisiona(self, arrow_x, arrow_y, target_y):
+        """¿La flecha en (arrow_x, arrow_y) toca la diana a la altura target_y?"""
+        flecha = _rect_centrado((arrow_x, arrow_y),
+                                self.tam_flecha(self.arrow_angle_launch))
+        diana = (self.target_x, target_y) + tuple(self.tam_diana)
+        return _se_tocan(flecha, diana)
+
+    def alturas_de_impacto(self, arrow_x, arrow_y):
+        """(desde, hasta): target_y con desde <= target_y < hasta que
+        colisionan con la flecha en (arrow_x, arrow_y), o None si la
+        flecha no está a la altura horizontal de la diana."""
+        fx, fy, fw, fh = _rect_centrado(
+            (arrow_x, arrow_y), self.tam_flecha(self.arrow_angle_launch))
+        ancho, alto = self.tam_diana
+        if not (fx < self.target_x + ancho and self.target_x < fx + fw):
+            return None
+        # Misma condición vertical que _se_tocan, despejando target_y
+        return fy - alto + 1, fy + fh
+
+    def check_collision(self):
+        return self.colisiona(self.arrow_x, self.arrow_y, self.target_y)
+
+    def fuera_de_pantalla(self, x, y):
+        return x > ANCHO or x < 0 or y < 0 or y > ALTO
+
+    def trayectoria_disparo(self):
+        """Posiciones de la flecha en cada paso si se dispara ahora.
+
+        No depende de la diana; termina cuando la flecha sale de pantalla.
+        """
+        radianes = math.radians(self.arrow_angle_launch)
+        vx = self.arrow_speed_base * math.cos(radianes)
+        vy = self.arrow_speed_base * math.sin(radianes)
+        x, y = self.bow_x + 50, self.bow_y + 15
+        posiciones = []
+        while True:
+            x += vx
+            y += vy
+            if self.fuera_de_pantalla(x, y):
+                return posiciones
+            posiciones.append((x, y))
+
+    def paso(self):
+        """Avanza FISICA_DT: mueve flecha y diana y resuelve impactos.
+
+        Devuelve True si la flecha dio en la diana en este paso.
+        """
+        self.arrow_prev_x, self.arrow_prev_y = self.arrow_x, self.arrow_y
+        self.target_prev_y = self.target_y
+        self.pasos += 1
+        acierto = False
+        if self.arrow_flying:
+            self.arrow_x += self.arrow_speed_x
+            self.arrow_y += self.arrow_speed_y
+            if self.check_collision():
+                acierto = True
+                self.score += 1
+                self.reset_arrow()
+                self.target_y = self.target_prev_y = \
+                    self.rng.randint(100, ALTO - 180)
+            elif self.fuera_de_pantalla(self.arrow_x, self.arrow_y):
+                self.reset_arrow()
+
+        self.target_y += self.target_speed * self.target_direction
+        if self.target_y <= 50 or self.target_y >= ALTO - 130:
+            self.target_direction *= -1
+        return acierto
@@ -1,14 +1,16 @@
 import time
 import random
 import json
-import sys
-import select
-import termios
-import tty
-from datetime import datetime
+from bitacora import Consulta, buscar_ultimo, estado_host
+from entrada_teclado import EditorLinea, leer_con_limite
+from escritor_eventos import eventos_jugador
+from puntaje_tipeo import PUNTAJE_MINIMO_VICTORIA, puntaje_desde_errores
+from telemetria_tipeo import LineaTiempoTipeo
+from transporte import abrir_espera, conectar_host
 
 PLAYER_LOG_FILE = "player_events.log"
 HOST_LOG_FILE = "game_status.log"
+EVENTOS = eventos_jugador()
 
 TEXTOS_PARA_JUEGO = [
     "La Raspberry Pi es una computadora pequeña",
@@ -25,125 +27,65 @@ TEXTOS_PARA_JUEGO = [
 
 def leer_ultimo_sabotaje(stage):
     """Lee el último sabotaje del host para la stage indicada."""
-    try:
-        with open(HOST_LOG_FILE, "r") as f:
-            lineas = [l.strip() for l in f.readlines()]
-    except FileNotFoundError:
-        return None
-
-    ultimo = None
-    for linea in lineas:
-        if not linea or linea.startswith("#"):
-            continue
-        try:
-            idx_space = linea.find(" ")
-            payload = json.loads(linea[idx_space + 1:].strip())
-        except Exception:
-            continue
-        if payload.get("stage") == stage and payload.get("Action") == "Sabotage":
-            ultimo = {"Effect": payload.get(
-                "Effect"), "Value": payload.get("Value")}
-    return ultimo
+    return estado_host(HOST_LOG_FILE).ultimo_sabotaje(stage)
 
 
 def leer_ultima_asignacion():
     """Busca la última entrada con Action 'Assign' en game_status.log."""
-    try:
-        with open(HOST_LOG_FILE, "r") as f:
-            lineas = [l.strip() for l in f.readlines()]
-    except FileNotFoundError:
-        return None, None
-
-    asign = None
-    for linea in lineas:
-        if not linea or linea.startswith("#"):
-            continue
-        try:
-            idx_space = linea.find(" ")
-            payload = json.loads(linea[idx_space + 1:].strip())
-        except Exception:
-            continue
-        if payload.get("Action") == "Assign" and "GameID" in payload:
-            asign = (payload.get("stage"), payload.get("GameID"))
+    asign = estado_host(HOST_LOG_FILE).asignacion
     return asign if asign else (None, None)
 
 
 def leer_ultimo_score_local():
     """Busca el último registro de minijuego en player_events.log y retorna su Score."""
+    EVENTOS.vaciar()
+    payload = buscar_ultimo(
+        PLAYER_LOG_FILE,
+        Consulta(Action="Ready", requiere=("GameID", "Score")))
+    if payload is None:
+        return 0
     try:
-        with open(PLAYER_LOG_FILE, "r") as f:
-            lineas = [l.strip() for l in f.readlines()]
-    except FileNotFoundError:
+        return int(payload.get("Score", 0))
+    except Exception:
         return 0
 
-    for linea in reversed(lineas):
-        if not linea or linea.startswith("#"):
-            continue
-        try:
-            idx_space = linea.find(" ")
-            payload = json.loads(linea[idx_space + 1:].strip())
-        except Exception:
-            continue
-        if payload.get("Action") == "Ready" and "GameID" in payload and "Score" in payload:
-            try:
-                return int(payload.get("Score", 0))
-            except Exception:
-                return 0
-    return 0
-
 # =========================
 #  Lobby / Handshake
 # =========================
 
 
 def log_lobby_join(player_id):
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     payload = {"stage": "Lobby", "PlayerID": player_id, "Action": "Join"}
-    with open(PLAYER_LOG_FILE, "a") as f:
-        f.write(f"{timestamp} {json.dumps(payload)}\n")
+    EVENTOS.escribir(payload, confirmar=True)
     print(f"📨 Lobby: JOIN enviado -> {json.dumps(payload)}")
-    print("   (en la tarea esto se 'envía por SSH' al host)")
+    print("   (por socket si HOST_SOCKET está definido; si no, vía player_events.log)")
 
 
 def esperar_accepted_desde_host(player_id, timeout=None):
     print("\n⌛ Esperando 'Accepted' del host en game_status.log...")
     inicio = time.time()
-    while True:
-        try:
-            with open(HOST_LOG_FILE, "r") as f:
-                lineas = [l.strip() for l in f.readlines()]
-        except FileNotFoundError:
-            lineas = []
-        for linea in lineas:
-            if not linea or linea.startswith("#"):
-                continue
-            try:
-                idx_space = linea.find(" ")
-                json_str = linea[idx_space + 1:].strip()
-                payload = json.loads(json_str)
-            except Exception:
-                continue
-            if (payload.get("stage") == "Lobby" and
-                payload.get("PlayerID") == player_id and
-                    payload.get("Action") == "Accepted"):
+    with abrir_espera(HOST_LOG_FILE) as vigilante:
+        while True:
+            payload = estado_host(HOST_LOG_FILE).accepted_de(player_id)
+            if payload is not None:
                 print(f"✅ Recibido del host: {json.dumps(payload)}")
                 return True
-        if timeout is not None and (time.time() - inicio) > timeout:
-            print("⛔ Tiempo de espera agotado esperando 'Accepted'.")
-            return False
-        time.sleep(1)
+            if timeout is not None and (time.time() - inicio) > timeout:
+                print("⛔ Tiempo de espera agotado esperando 'Accepted'.")
+                return False
+            # Despierta apenas llega algo del host, como máximo cada 1s
+            vigilante.esperar(1.0)
 
 
 def log_lobby_ready(player_id):
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     payload = {"stage": "Lobby", "PlayerID": player_id, "Action": "Ready"}
-    with open(PLAYER_LOG_FILE, "a") as f:
-        f.write(f"{timestamp} {json.dumps(payload)}\n")
+    EVENTOS.escribir(payload, confirmar=True)
     print(f"✅ Lobby: READY registrado -> {json.dumps(payload)}")
 
 
 def lobby_handshake(player_id=1):
     print("===== LOBBY / REGISTRO DE JUGADOR =====")
+    conectar_host(HOST_LOG_FILE, EVENTOS)
     log_lobby_join(player_id)
     ok = esperar_accepted_desde_host(player_id)
     if not ok:
@@ -158,37 +100,9 @@ def lobby_handshake(player_id=1):
 # =========================
 
 
-def input_con_tiempo_real(prompt, tiempo_limite):
-    print(prompt, end='', flush=True)
-    texto_buffer = []
-    inicio = time.time()
-    fd = sys.stdin.fileno()
-    old_settings = termios.tcgetattr(fd)
-    try:
-        tty.setcbreak(sys.stdin.fileno())
-        while True:
-            restante = tiempo_limite - (time.time() - inicio)
-            if restante <= 0:
-                break
-            rlist, _, _ = select.select([sys.stdin], [], [], restante)
-            if rlist:
-                caracter = sys.stdin.read(1)
-                if caracter in ['\n', '\r']:
-                    print()
-                    break
-                elif caracter == '\x7f' and texto_buffer:
-                    texto_buffer.pop()
-                    print('\b \b', end='', flush=True)
-                else:
-                    texto_buffer.append(caracter)
-                    print(caracter, end='', flush=True)
-            else:
-                break
-    finally:
-        termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
-
-    tiempo_usado = time.time() - inicio
-    return "".join(texto_buffer), tiempo_usado >= tiempo_limite
+def input_con_tiempo_real(prompt, tiempo_limite, editor=None):
+    # Lee ráfagas enteras sin bloquear y junta el eco (ver entrada_teclado.py)
+    return leer_con_limite(prompt, tiempo_limite, editor=editor)
 
 # =========================
 #  Logging del minijuego
@@ -196,7 +110,6 @@ def input_con_tiempo_real(prompt, tiempo_limite):
 
 
 def registrar_evento_minijuego(player_id, stage, game_id, result, score):
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     payload = {
         "stage": stage,
         "PlayerID": player_id,
@@ -205,8 +118,7 @@ def registrar_evento_minijuego(player_id, stage, game_id, result, score):
         "Result": result,
         "Score": score
     }
-    with open(PLAYER_LOG_FILE, "a") as f:
-        f.write(f"{timestamp} {json.dumps(payload)}\n")
+    EVENTOS.escribir(payload)
     print(f"✅ LOG GUARDADO: {json.dumps(payload)}")
 
 # =========================
@@ -245,18 +157,22 @@ def minijuego_tipeo_simple(player_id=1, stage="R1", game_id=3):
     input()
     print("\n⚡ ¡YA! ¡ESCRIBE! ⚡")
 
-    texto_usuario, tiempo_agotado = input_con_tiempo_real(
-        "Tu respuesta: ", tiempo_limite)
+    # Cada tecla queda anotada con su instante, y los errores (distancia
+    # de edición) y las métricas se calculan mientras se escribe; al dar
+    # Enter el puntaje ya está (ver puntaje_tipeo.py y telemetria_tipeo.py)
+    linea = LineaTiempoTipeo(texto_objetivo)
+    editor = EditorLinea(al_insertar=linea.insertar, al_borrar=linea.borrar,
+                         al_terminar=linea.terminar)
+    linea.empezar()
+    _, tiempo_agotado = input_con_tiempo_real(
+        "Tu respuesta: ", tiempo_limite, editor)
 
-    buenas = sum(1 for i in range(min(len(texto_usuario), len(
-        texto_objetivo))) if texto_usuario[i] == texto_objetivo[i])
-    malas = max(len(texto_objetivo), len(texto_usuario)) - buenas
-    precision = (buenas / len(texto_objetivo)) * \
-        100 if len(texto_objetivo) else 0
-    penalidad_error = malas * 5
-    score = int(max(0, min(100, precision - penalidad_error)))
+    errores = linea.puntaje.distancia()
+    score = puntaje_desde_errores(errores, len(texto_objetivo))
+    print(f"Errores: {errores} | {linea.wpm_final():.0f} WPM | "
+          f"{linea.borrados} correcciones")
 
-    result = "Win" if score >= 60 else "TimeOut" if tiempo_agotado else "Lose"
+    result = "Win" if score >= PUNTAJE_MINIMO_VICTORIA else "TimeOut" if tiempo_agotado else "Lose"
 
     # --- Sabotaje ScoreSteal ---
     if sabotaje and sabotaje.get("Effect") == "ScoreSteal":
@@ -274,6 +190,8 @@ def minijuego_tipeo_simple(player_id=1, stage="R1", game_id=3):
     print(f"Resultado:     {result}")
     print("-" * 30)
     registrar_evento_minijuego(player_id, stage, game_id, result, score)
+    # Teclas de la ronda en telemetria/tipeo_<PlayerID>.bin
+    linea.guardar(player_id, score, result)
     return score
 
 
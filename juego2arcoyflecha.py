@@ -1,10 +1,14 @@
 import pygame
-import random
-import math
 import time
 import os
 import json
-from datetime import datetime
+from collections import OrderedDict
+from bitacora import Consulta, buscar_ultimo, estado_host
+from escritor_eventos import eventos_jugador
+from transporte import abrir_espera, conectar_host
+from assets_arco import cargar_atlas
+from fisica_arco import (FISICA_DT, PartidaArco, duracion_con_delay,
+                         DURACION_BASE, PUNTAJE_GANADOR)
 
 # =========================================
 # CONFIGURACIÓN BÁSICA
@@ -13,6 +17,7 @@ REMOTE_LOG_DIR = "."
 LOG_FILE = "player_events.log"
 PLAYER_LOG_PATH = os.path.join(REMOTE_LOG_DIR, LOG_FILE)
 HOST_LOG_FILE = "game_status.log"
+EVENTOS = eventos_jugador()
 LOG_WRITTEN = False
 PLAYER_ID = 10
 GAME_ID = 2
@@ -25,127 +30,65 @@ GAME_STAGE = "R1"
 
 def leer_ultimo_sabotaje(stage):
     """Lee el último sabotaje del host para la stage indicada."""
-    try:
-        with open(HOST_LOG_FILE, "r") as f:
-            lineas = [l.strip() for l in f.readlines()]
-    except FileNotFoundError:
-        return None
-
-    ultimo = None
-    for linea in lineas:
-        if not linea or linea.startswith("#"):
-            continue
-        try:
-            idx_space = linea.find(" ")
-            payload = json.loads(linea[idx_space + 1:].strip())
-        except Exception:
-            continue
-        if payload.get("stage") == stage and payload.get("Action") == "Sabotage":
-            ultimo = {"Effect": payload.get(
-                "Effect"), "Value": payload.get("Value")}
-    return ultimo
+    return estado_host(HOST_LOG_FILE).ultimo_sabotaje(stage)
 
 
 def leer_ultima_asignacion():
     """Busca la última entrada con Action 'Assign' en game_status.log."""
-    try:
-        with open(HOST_LOG_FILE, "r") as f:
-            lineas = [l.strip() for l in f.readlines()]
-    except FileNotFoundError:
-        return None, None
-
-    asign = None
-    for linea in lineas:
-        if not linea or linea.startswith("#"):
-            continue
-        try:
-            idx_space = linea.find(" ")
-            payload = json.loads(linea[idx_space + 1:].strip())
-        except Exception:
-            continue
-        if payload.get("Action") == "Assign" and "GameID" in payload:
-            asign = (payload.get("stage"), payload.get("GameID"))
+    asign = estado_host(HOST_LOG_FILE).asignacion
     return asign if asign else (None, None)
 
 
 def leer_ultimo_score_local():
     """Devuelve el último Score del jugador para aplicar ScoreSteal."""
+    EVENTOS.vaciar()
+    payload = buscar_ultimo(
+        PLAYER_LOG_PATH,
+        Consulta(Action="Ready", requiere=("Score",)))
+    if payload is None:
+        return 0
     try:
-        with open(PLAYER_LOG_PATH, "r") as f:
-            lineas = [l.strip() for l in f.readlines()]
-    except FileNotFoundError:
+        return int(payload.get("Score", 0))
+    except Exception:
         return 0
 
-    for linea in reversed(lineas):
-        if not linea or linea.startswith("#"):
-            continue
-        try:
-            idx_space = linea.find(" ")
-            payload = json.loads(linea[idx_space + 1:].strip())
-        except Exception:
-            continue
-        if payload.get("Action") == "Ready" and "Score" in payload:
-            try:
-                return int(payload.get("Score", 0))
-            except Exception:
-                return 0
-    return 0
-
 
 # =========================================
 # LOBBY / HANDSHAKE
 # =========================================
 def log_lobby_join(player_id):
     os.makedirs(REMOTE_LOG_DIR, exist_ok=True)
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     payload = {"stage": "Lobby", "PlayerID": player_id, "Action": "Join"}
-    with open(PLAYER_LOG_PATH, "a") as f:
-        f.write(f"{timestamp} {json.dumps(payload)}\n")
+    EVENTOS.escribir(payload, confirmar=True)
     print(f"📨 Lobby: JOIN enviado -> {json.dumps(payload)}")
-    print("   (en la tarea esto se 'envía por SSH' al host)")
+    print("   (por socket si HOST_SOCKET está definido; si no, vía player_events.log)")
 
 
 def esperar_accepted_desde_host(player_id, timeout=None):
     print("\n⌛ Esperando 'Accepted' del host en game_status.log...")
     inicio = time.time()
-    while True:
-        try:
-            with open(HOST_LOG_FILE, "r") as f:
-                lineas = [l.strip() for l in f.readlines()]
-        except FileNotFoundError:
-            lineas = []
-
-        for linea in lineas:
-            if not linea or linea.startswith("#"):
-                continue
-            try:
-                idx_space = linea.find(" ")
-                json_str = linea[idx_space + 1:].strip()
-                payload = json.loads(json_str)
-            except Exception:
-                continue
-            if (payload.get("stage") == "Lobby"
-                and payload.get("PlayerID") == player_id
-                    and payload.get("Action") == "Accepted"):
+    with abrir_espera(HOST_LOG_FILE) as vigilante:
+        while True:
+            payload = estado_host(HOST_LOG_FILE).accepted_de(player_id)
+            if payload is not None:
                 print(f"✅ Recibido del host: {json.dumps(payload)}")
                 return True
-
-        if timeout and (time.time() - inicio) > timeout:
-            print("⛔ Tiempo de espera agotado esperando 'Accepted'.")
-            return False
-        time.sleep(1)
+            if timeout and (time.time() - inicio) > timeout:
+                print("⛔ Tiempo de espera agotado esperando 'Accepted'.")
+                return False
+            # Despierta apenas llega algo del host, como máximo cada 1s
+            vigilante.esperar(1.0)
 
 
 def log_lobby_ready(player_id):
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     payload = {"stage": "Lobby", "PlayerID": player_id, "Action": "Ready"}
-    with open(PLAYER_LOG_PATH, "a") as f:
-        f.write(f"{timestamp} {json.dumps(payload)}\n")
+    EVENTOS.escribir(payload, confirmar=True)
     print(f"✅ Lobby: READY registrado -> {json.dumps(payload)}")
 
 
 def lobby_handshake(player_id=PLAYER_ID):
     print("===== LOBBY / REGISTRO DE JUGADOR =====")
+    conectar_host(HOST_LOG_FILE, EVENTOS)
     log_lobby_join(player_id)
     ok = esperar_accepted_desde_host(player_id)
     if not ok:
@@ -162,7 +105,6 @@ def lobby_handshake(player_id=PLAYER_ID):
 def guardar_registro_json(score_final, resultado):
     global LOG_WRITTEN
     os.makedirs(REMOTE_LOG_DIR, exist_ok=True)
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     if resultado == "VICTORIA":
         log_resultado = "Win"
     elif resultado == "TIEMPO_AGOTADO":
@@ -177,198 +119,317 @@ def guardar_registro_json(score_final, resultado):
         "Result": log_resultado,
         "Score": score_final
     }
-    log_entry = f"{timestamp} {json.dumps(data_dict)}\n"
     try:
-        with open(PLAYER_LOG_PATH, 'a') as f:
-            f.write(log_entry)
-        print(f"✅ REGISTRO GUARDADO: {log_entry.strip()}")
+        log_entry = EVENTOS.escribir(data_dict)
+        print(f"✅ REGISTRO GUARDADO: {log_entry}")
         LOG_WRITTEN = True
     except Exception as e:
         print(f"❌ Error al escribir el registro: {e}")
 
 
 # =========================================
-# FLUJO PRINCIPAL DEL JUEGO
+# CACHÉS DE SUPERFICIES (rotaciones y textos)
 # =========================================
-if not lobby_handshake(PLAYER_ID):
-    raise SystemExit("Saliendo: no se estableció conexión con el host.")
-
-# Leer asignación (stage y GameID)
-stage_asign, game_id_asign = leer_ultima_asignacion()
-if stage_asign:
-    GAME_STAGE = stage_asign
-if game_id_asign:
-    GAME_ID = game_id_asign
-
-# Leer sabotaje (Delay, Disable, ScoreSteal)
-sabotaje = leer_ultimo_sabotaje(GAME_STAGE)
-GAME_DURATION_SECONDS = 15
-if sabotaje:
-    effect = sabotaje.get("Effect")
-    value = sabotaje.get("Value")
-    try:
-        value = int(value)
-    except Exception:
-        value = 0
-    if effect == "Disable":
-        print("⚠️ Sabotaje Disable: no se puede jugar. Registrando TimeOut.")
-        guardar_registro_json(0, "TIEMPO_AGOTADO")
-        raise SystemExit("Partida anulada por sabotaje Disable.")
-    elif effect == "Delay":
-        GAME_DURATION_SECONDS = max(5, 15 - value)
-        print(
-            f"⚠️ Sabotaje Delay: duración reducida a {GAME_DURATION_SECONDS}s.")
-
-# Configuración de Pygame
-pygame.init()
-WIDTH, HEIGHT = 800, 600
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Juego de Arco y Flecha")
+class CacheRotacion:
+    """Guarda imagen rotada por ángulo cuantizado, con límite LRU.
+
+    draw() y check_collision() piden la misma rotación en cada frame; así
+    pygame.transform.rotate solo se ejecuta cuando el ángulo cambia de
+    paso (o si la entrada fue desalojada).
+    """
+
+    def __init__(self, imagen, paso_grados=1, max_entradas=128):
+        self.imagen = imagen
+        self.paso = paso_grados
+        self.max_entradas = max_entradas
+        self.rotadas = OrderedDict()
+
+    def obtener(self, angulo):
+        clave = round(angulo / self.paso)
+        rotada = self.rotadas.get(clave)
+        if rotada is not None:
+            self.rotadas.move_to_end(clave)
+            return rotada
+        rotada = pygame.transform.rotate(self.imagen, -clave * self.paso)
+        self.rotadas[clave] = rotada
+        if len(self.rotadas) > self.max_entradas:
+            self.rotadas.popitem(last=False)
+        return rotada
+
+    def precalentar(self, angulos):
+        for angulo in angulos:
+            self.obtener(angulo)
+
+
+class CacheTextos:
+    """Superficies de texto ya renderizadas por (font, texto, color), LRU.
+
+    El puntaje y el tiempo cambian como mucho una vez por segundo, así que
+    casi todos los frames reutilizan la superficie sin pasar por
+    font.render.
+    """
+
+    def __init__(self, max_entradas=64):
+        self.max_entradas = max_entradas
+        self.superficies = OrderedDict()
+
+    def obtener(self, font, text, color):
+        clave = (font, text, color)
+        superficie = self.superficies.get(clave)
+        if superficie is not None:
+            self.superficies.move_to_end(clave)
+            return superficie
+        superficie = font.render(text, True, color)
+        self.superficies[clave] = superficie
+        if len(self.superficies) > self.max_entradas:
+            self.superficies.popitem(last=False)
+        return superficie
 
+
+# =========================================
+# PANTALLA E IMÁGENES
+# =========================================
+WIDTH, HEIGHT = 800, 600
 WHITE = (255, 200, 200)
 RED = (255, 100, 0)
 BLACK = (0, 0, 0)
 GREEN = (0, 255, 0)
-WINNING_SCORE = 7
-
-# Carga de imágenes con fallback
-try:
-    fondo_img = pygame.image.load("fondo.png")
-    fondo_img = pygame.transform.scale(fondo_img, (WIDTH, HEIGHT))
-except pygame.error:
-    fondo_img = None
-
-try:
-    bow_img = pygame.image.load("bow.png")
-    bow_img = pygame.transform.scale(bow_img, (150, 50))
-except pygame.error:
-    bow_img = pygame.Surface((150, 50))
-    bow_img.fill((150, 75, 0))
-
-try:
-    arrow_img_orig = pygame.image.load("arrow.png")
-    arrow_img_orig = pygame.transform.scale(arrow_img_orig, (100, 20))
-except pygame.error:
-    arrow_img_orig = pygame.Surface((100, 20))
-    arrow_img_orig.fill((0, 0, 0))
-
-try:
-    target_img = pygame.image.load("target.png")
-    target_img = pygame.transform.scale(target_img, (80, 80))
-except pygame.error:
-    target_img = pygame.Surface((80, 80), pygame.SRCALPHA)
-    pygame.draw.circle(target_img, RED, (40, 40), 40)
-
-# Variables del juego
-bow_x, bow_y = 50, HEIGHT//2-25
-arrow_x, arrow_y = bow_x+50, bow_y+15
-arrow_speed_base = 15
-arrow_speed_x = 0
-arrow_speed_y = 0
-arrow_angle_launch = 0
-target_x, target_y = WIDTH-100, random.randint(100, HEIGHT-180)
-target_speed = 4
-target_direction = -1
-arrow_flying = False
-score = 0
-font = pygame.font.SysFont(None, 36)
-big_font = pygame.font.SysFont(None, 72)
+WINNING_SCORE = PUNTAJE_GANADOR
+GAME_DURATION_SECONDS = DURACION_BASE
+# Redibuja solo lo que cambió (arco, flecha, diana y HUD) con
+# display.update(rects); en False vuelve al flip de pantalla completa
+RENDER_DIRTY_RECTS = True
+
+# Estado de la ronda en curso (lo inicializa jugar_ronda)
+screen = None
+partida = None
+font = big_font = None
 game_over = False
-start_time = time.time()
 game_result = ""
+rects_previos = []
+pantalla_final_dibujada = False
+textos = CacheTextos()
+
+
+def cargar_imagenes():
+    """Toma las imágenes del atlas (ver assets_arco.py), con fallback
+    dibujado para las que falten; requiere la ventana ya abierta."""
+    global fondo_img, bow_img, arrow_rotaciones, target_img, overlay_img
+    sprites = cargar_atlas()
+    fondo_img = sprites.get("fondo")
+
+    bow_img = sprites.get("bow")
+    if bow_img is None:
+        bow_img = pygame.Surface((150, 50))
+        bow_img.fill((150, 75, 0))
+        bow_img = bow_img.convert()
+
+    arrow_img_orig = sprites.get("arrow")
+    if arrow_img_orig is None:
+        arrow_img_orig = pygame.Surface((100, 20))
+        arrow_img_orig.fill((0, 0, 0))
+        # convert_alpha: la rotación agrega esquinas transparentes
+        arrow_img_orig = arrow_img_orig.convert_alpha()
+
+    # Rotaciones de la flecha en pasos de 1°, precalculadas para ±45°
+    arrow_rotaciones = CacheRotacion(arrow_img_orig, paso_grados=1,
+                                     max_entradas=128)
+    arrow_rotaciones.precalentar(range(-45, 46))
+
+    target_img = sprites.get("target")
+    if target_img is None:
+        target_img = pygame.Surface((80, 80), pygame.SRCALPHA)
+        pygame.draw.circle(target_img, RED, (40, 40), 40)
+        target_img = target_img.convert_alpha()
+
+    # Capa oscura del fin de partida, creada una sola vez
+    overlay_img = pygame.Surface(
+        (WIDTH, HEIGHT), pygame.SRCALPHA).convert_alpha()
+    overlay_img.fill((0, 0, 0, 150))
 
 
 def draw_text(text, font, color, x, y):
-    text_surface = font.render(text, True, color)
-    screen.blit(text_surface, (x, y))
+    text_surface = textos.obtener(font, text, color)
+    return screen.blit(text_surface, (x, y))
 
 
-def draw():
+def draw_background(rect=None):
     if fondo_img:
-        screen.blit(fondo_img, (0, 0))
+        if rect is None:
+            screen.blit(fondo_img, (0, 0))
+        else:
+            screen.blit(fondo_img, rect.topleft, rect)
     else:
-        screen.fill(WHITE)
-    screen.blit(bow_img, (bow_x, bow_y))
-    rotated_arrow = pygame.transform.rotate(
-        arrow_img_orig, -arrow_angle_launch)
-    arrow_rect = rotated_arrow.get_rect(center=(arrow_x, arrow_y))
-    screen.blit(rotated_arrow, arrow_rect.topleft)
-    screen.blit(target_img, (target_x, target_y))
-    draw_text(f"Puntaje: {score}/{WINNING_SCORE}", font, RED, 10, 10)
-    elapsed = time.time()-start_time
-    remaining = max(0, GAME_DURATION_SECONDS-int(elapsed))
-    draw_text(f"Tiempo: {remaining}s", font, RED, WIDTH-150, 10)
+        screen.fill(WHITE, rect)
+
+
+def draw_sprites(alpha=1.0):
+    """Dibuja arco, flecha, diana y HUD; devuelve los rects que ocupan.
+
+    alpha interpola entre el paso de física anterior y el actual.
+    """
+    p = partida
+    rects = [screen.blit(bow_img, (p.bow_x, p.bow_y))]
+    ax = p.arrow_prev_x + (p.arrow_x - p.arrow_prev_x) * alpha
+    ay = p.arrow_prev_y + (p.arrow_y - p.arrow_prev_y) * alpha
+    ty = p.target_prev_y + (p.target_y - p.target_prev_y) * alpha
+    rotated_arrow = arrow_rotaciones.obtener(p.arrow_angle_launch)
+    arrow_rect = rotated_arrow.get_rect(center=(ax, ay))
+    rects.append(screen.blit(rotated_arrow, arrow_rect.topleft))
+    rects.append(screen.blit(target_img, (p.target_x, round(ty))))
+    rects.append(draw_text(f"Puntaje: {p.score}/{WINNING_SCORE}",
+                           font, RED, 10, 10))
+    remaining = max(0, GAME_DURATION_SECONDS-int(p.tiempo))
+    rects.append(draw_text(f"Tiempo: {remaining}s", font, RED, WIDTH-150, 10))
+    return rects
+
+
+def draw(alpha=1.0):
+    global rects_previos, pantalla_final_dibujada
     if game_over:
-        overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 150))
-        screen.blit(overlay, (0, 0))
+        # La pantalla final no cambia: se dibuja una vez
+        if pantalla_final_dibujada:
+            return
+        draw_background()
+        draw_sprites()
+        screen.blit(overlay_img, (0, 0))
         color = GREEN if game_result == "VICTORIA" else RED
         draw_text(game_result, big_font, color, WIDTH//2-200, HEIGHT//2-50)
-        draw_text(f"Puntaje Final: {score}", font,
+        draw_text(f"Puntaje Final: {partida.score}", font,
                   WHITE, WIDTH//2-120, HEIGHT//2+30)
-    pygame.display.flip()
-
+        pygame.display.flip()
+        pantalla_final_dibujada = True
+        return
+    if not RENDER_DIRTY_RECTS or not rects_previos:
+        draw_background()
+        rects_previos = draw_sprites(alpha)
+        pygame.display.flip()
+        return
+    # Se borra donde estaban los sprites y se vuelve a dibujar todo encima;
+    # solo se envían a la pantalla las zonas viejas y nuevas
+    for rect in rects_previos:
+        draw_background(rect)
+    rects = draw_sprites(alpha)
+    pygame.display.update(rects_previos + rects)
+    rects_previos = rects
+
+
+# La física avanza en pasos fijos de FISICA_DT aunque el render baje de
+# 60 FPS. Si un frame tarda demasiado, no se simulan más de estos pasos
+# de golpe
+MAX_PASOS_POR_FRAME = 10
 
-def check_collision():
-    rotated_arrow = pygame.transform.rotate(
-        arrow_img_orig, -arrow_angle_launch)
-    arrow_rect = rotated_arrow.get_rect(center=(arrow_x, arrow_y))
-    target_rect = target_img.get_rect(topleft=(target_x, target_y))
-    return arrow_rect.colliderect(target_rect)
 
-
-clock = pygame.time.Clock()
-running = True
-while running:
-    clock.tick(60)
-    if not game_over and (time.time()-start_time >= GAME_DURATION_SECONDS or score >= WINNING_SCORE):
-        game_over = True
-        if score >= WINNING_SCORE:
-            game_result = "VICTORIA"
-        else:
-            game_result = "TIEMPO_AGOTADO"
-
-        # Aplicar ScoreSteal si existe
-        if sabotaje and sabotaje.get("Effect") == "ScoreSteal":
-            anterior = leer_ultimo_score_local()
-            try:
-                porcentaje = int(sabotaje.get("Value", 0))
-            except Exception:
-                porcentaje = 0
-            robo = max(0, round(anterior * (porcentaje / 100.0)))
-            score = max(0, score - robo)
+# =========================================
+# FLUJO PRINCIPAL DEL JUEGO
+# =========================================
+def jugar_ronda(player_id=PLAYER_ID, stage=GAME_STAGE, game_id=GAME_ID):
+    """Juega una ronda completa (sin lobby) y devuelve el puntaje final.
+
+    Se puede llamar varias veces desde el mismo proceso (ver lanzador.py):
+    cada ronda abre y cierra su propia ventana.
+    """
+    global PLAYER_ID, GAME_STAGE, GAME_ID, LOG_WRITTEN, GAME_DURATION_SECONDS
+    global screen, partida, font, big_font, game_over, game_result
+    global rects_previos, pantalla_final_dibujada
+    PLAYER_ID, GAME_STAGE, GAME_ID = player_id, stage, game_id
+    LOG_WRITTEN = False
+
+    # Leer sabotaje (Delay, Disable, ScoreSteal)
+    sabotaje = leer_ultimo_sabotaje(GAME_STAGE)
+    GAME_DURATION_SECONDS = DURACION_BASE
+    if sabotaje:
+        effect = sabotaje.get("Effect")
+        value = sabotaje.get("Value")
+        try:
+            value = int(value)
+        except Exception:
+            value = 0
+        if effect == "Disable":
+            print("⚠️ Sabotaje Disable: no se puede jugar. Registrando TimeOut.")
+            guardar_registro_json(0, "TIEMPO_AGOTADO")
+            print("Partida anulada por sabotaje Disable.")
+            return 0
+        elif effect == "Delay":
+            GAME_DURATION_SECONDS = duracion_con_delay(value)
             print(
-                f"⚠️ Sabotaje ScoreSteal: -{robo} puntos (previo {anterior}).")
-
-        if not LOG_WRITTEN:
-            guardar_registro_json(score, game_result)
-
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-        if event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE and not game_over:
-            arrow_flying = True
-            radians = math.radians(arrow_angle_launch)
-            arrow_speed_x = arrow_speed_base*math.cos(radians)
-            arrow_speed_y = arrow_speed_base*math.sin(radians)
-            arrow_x, arrow_y = bow_x+50, bow_y+15
-
-    if not game_over:
-        if arrow_flying:
-            arrow_x += arrow_speed_x
-            arrow_y += arrow_speed_y
-            if check_collision():
-                score += 1
-                arrow_flying = False
-                arrow_x, arrow_y = bow_x+50, bow_y+15
-                target_y = random.randint(100, HEIGHT-180)
-            elif arrow_x > WIDTH or arrow_x < 0 or arrow_y < 0 or arrow_y > HEIGHT:
-                arrow_flying = False
-                arrow_x, arrow_y = bow_x+50, bow_y+15
-
-        target_y += target_speed*target_direction
-        if target_y <= 50 or target_y >= HEIGHT-130:
-            target_direction *= -1
-    draw()
-
-pygame.quit()
+                f"⚠️ Sabotaje Delay: duración reducida a {GAME_DURATION_SECONDS}s.")
+
+    # Configuración de Pygame
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("Juego de Arco y Flecha")
+    cargar_imagenes()
+
+    # Variables del juego: posiciones, puntaje y tiempo simulado viven en
+    # PartidaArco (fisica_arco.py), la misma que usa simulador_arco.py
+    partida = PartidaArco(
+        duracion=GAME_DURATION_SECONDS, puntaje_ganador=WINNING_SCORE,
+        tam_flecha=lambda angulo: arrow_rotaciones.obtener(angulo).get_size(),
+        tam_diana=target_img.get_size())
+    font = pygame.font.SysFont(None, 36)
+    big_font = pygame.font.SysFont(None, 72)
+    game_over = False
+    game_result = ""
+    rects_previos = []
+    pantalla_final_dibujada = False
+    score = 0
+
+    clock = pygame.time.Clock()
+    running = True
+    ultimo_tick = time.monotonic()
+    acumulado = 0.0
+    while running:
+        clock.tick(60)
+        ahora = time.monotonic()
+        acumulado = min(acumulado + ahora - ultimo_tick,
+                        MAX_PASOS_POR_FRAME * FISICA_DT)
+        ultimo_tick = ahora
+
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE and not game_over:
+                partida.disparar()
+
+        while acumulado >= FISICA_DT and not game_over:
+            partida.paso()
+            acumulado -= FISICA_DT
+            if partida.resultado():
+                game_over = True
+                game_result = partida.resultado()
+                score = partida.score
+
+                # Aplicar ScoreSteal si existe
+                if sabotaje and sabotaje.get("Effect") == "ScoreSteal":
+                    anterior = leer_ultimo_score_local()
+                    try:
+                        porcentaje = int(sabotaje.get("Value", 0))
+                    except Exception:
+                        porcentaje = 0
+                    robo = max(0, round(anterior * (porcentaje / 100.0)))
+                    score = partida.score = max(0, score - robo)
+                    print(
+                        f"⚠️ Sabotaje ScoreSteal: -{robo} puntos (previo {anterior}).")
+
+                if not LOG_WRITTEN:
+                    guardar_registro_json(score, game_result)
+
+        # Fracción del próximo paso ya transcurrida, para interpolar el dibujo
+        draw(acumulado / FISICA_DT)
+
+    pygame.quit()
+    return score
+
+
+def main():
+    if not lobby_handshake(PLAYER_ID):
+        raise SystemExit("Saliendo: no se estableció conexión con el host.")
+
+    # Leer asignación (stage y GameID)
+    stage_asign, game_id_asign = leer_ultima_asignacion()
+    jugar_ronda(PLAYER_ID, stage_asign or GAME_STAGE, game_id_asign or GAME_ID)
+
+
+if __name__ == "__main__":
+    main()
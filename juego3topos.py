@@ -2,8 +2,12 @@ import time
 import random
 import os
 import json
-from datetime import datetime
-from gpiozero import RGBLED, Button
+import queue
+from bitacora import Consulta, buscar_ultimo, estado_host
+from escritor_eventos import eventos_jugador
+from transporte import abrir_espera, conectar_host
+from telemetria import RegistroReacciones
+from trazas_gpio import hardware
 
 # =======================================================
 # CONFIGURACIÓN
@@ -12,6 +16,7 @@ REMOTE_LOG_DIR = "."
 LOG_FILE = "player_events.log"
 PLAYER_LOG_PATH = os.path.join(REMOTE_LOG_DIR, LOG_FILE)
 HOST_LOG_FILE = "game_status.log"
+EVENTOS = eventos_jugador()
 
 LOG_WRITTEN = False
 PLAYER_ID = 10
@@ -25,72 +30,28 @@ GAME_STAGE = "R1"
 
 def leer_ultimo_sabotaje(stage):
     """Lee el último sabotaje del host para la stage indicada."""
-    try:
-        with open(HOST_LOG_FILE, "r") as f:
-            lineas = [l.strip() for l in f.readlines()]
-    except FileNotFoundError:
-        return None
-
-    ultimo = None
-    for linea in lineas:
-        if not linea or linea.startswith("#"):
-            continue
-        try:
-            idx_space = linea.find(" ")
-            payload = json.loads(linea[idx_space + 1:].strip())
-        except Exception:
-            continue
-        if payload.get("stage") == stage and payload.get("Action") == "Sabotage":
-            ultimo = {"Effect": payload.get(
-                "Effect"), "Value": payload.get("Value")}
-    return ultimo
+    return estado_host(HOST_LOG_FILE).ultimo_sabotaje(stage)
 
 
 def leer_ultima_asignacion():
     """Busca la última entrada con Action 'Assign' en game_status.log."""
-    try:
-        with open(HOST_LOG_FILE, "r") as f:
-            lineas = [l.strip() for l in f.readlines()]
-    except FileNotFoundError:
-        return None, None
-
-    asign = None
-    for linea in lineas:
-        if not linea or linea.startswith("#"):
-            continue
-        try:
-            idx_space = linea.find(" ")
-            payload = json.loads(linea[idx_space + 1:].strip())
-        except Exception:
-            continue
-        if payload.get("Action") == "Assign" and "GameID" in payload:
-            asign = (payload.get("stage"), payload.get("GameID"))
+    asign = estado_host(HOST_LOG_FILE).asignacion
     return asign if asign else (None, None)
 
 
 def leer_ultimo_score_local():
     """Devuelve el último Score registrado por el jugador."""
+    EVENTOS.vaciar()
+    payload = buscar_ultimo(
+        PLAYER_LOG_PATH,
+        Consulta(Action="Ready", requiere=("Score",)))
+    if payload is None:
+        return 0
     try:
-        with open(PLAYER_LOG_PATH, "r") as f:
-            lineas = [l.strip() for l in f.readlines()]
-    except FileNotFoundError:
+        return int(payload.get("Score", 0))
+    except Exception:
         return 0
 
-    for linea in reversed(lineas):
-        if not linea or linea.startswith("#"):
-            continue
-        try:
-            idx_space = linea.find(" ")
-            payload = json.loads(linea[idx_space + 1:].strip())
-        except Exception:
-            continue
-        if payload.get("Action") == "Ready" and "Score" in payload:
-            try:
-                return int(payload.get("Score", 0))
-            except Exception:
-                return 0
-    return 0
-
 # =======================================================
 # LOBBY
 # =======================================================
@@ -98,55 +59,37 @@ def leer_ultimo_score_local():
 
 def log_lobby_join(player_id):
     os.makedirs(REMOTE_LOG_DIR, exist_ok=True)
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     payload = {"stage": "Lobby", "PlayerID": player_id, "Action": "Join"}
-    linea = f"{timestamp} {json.dumps(payload)}\n"
-    with open(PLAYER_LOG_PATH, "a") as f:
-        f.write(linea)
+    EVENTOS.escribir(payload, confirmar=True)
     print(f"📨 Lobby: JOIN enviado -> {json.dumps(payload)}")
-    print("   (en la tarea esto se 'envía por SSH' al host)")
+    print("   (por socket si HOST_SOCKET está definido; si no, vía player_events.log)")
 
 
 def esperar_accepted_desde_host(player_id, timeout=None):
     print("\n⌛ Esperando 'Accepted' del host en game_status.log...")
     inicio = time.time()
-    while True:
-        try:
-            with open(HOST_LOG_FILE, "r") as f:
-                lineas = [l.strip() for l in f.readlines()]
-        except FileNotFoundError:
-            lineas = []
-        for linea in lineas:
-            if not linea or linea.startswith("#"):
-                continue
-            try:
-                idx_space = linea.find(" ")
-                json_str = linea[idx_space + 1:].strip()
-                payload = json.loads(json_str)
-            except Exception:
-                continue
-            if (payload.get("stage") == "Lobby" and
-                payload.get("PlayerID") == player_id and
-                    payload.get("Action") == "Accepted"):
+    with abrir_espera(HOST_LOG_FILE) as vigilante:
+        while True:
+            payload = estado_host(HOST_LOG_FILE).accepted_de(player_id)
+            if payload is not None:
                 print(f"✅ Recibido del host: {json.dumps(payload)}")
                 return True
-        if timeout and (time.time() - inicio) > timeout:
-            print("⛔ Tiempo de espera agotado esperando 'Accepted'.")
-            return False
-        time.sleep(1)
+            if timeout and (time.time() - inicio) > timeout:
+                print("⛔ Tiempo de espera agotado esperando 'Accepted'.")
+                return False
+            # Despierta apenas llega algo del host, como máximo cada 1s
+            vigilante.esperar(1.0)
 
 
 def log_lobby_ready(player_id):
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     payload = {"stage": "Lobby", "PlayerID": player_id, "Action": "Ready"}
-    linea = f"{timestamp} {json.dumps(payload)}\n"
-    with open(PLAYER_LOG_PATH, "a") as f:
-        f.write(linea)
+    EVENTOS.escribir(payload, confirmar=True)
     print(f"✅ Lobby: READY registrado -> {json.dumps(payload)}")
 
 
 def lobby_handshake(player_id=PLAYER_ID):
     print("===== LOBBY / REGISTRO DE JUGADOR =====")
+    conectar_host(HOST_LOG_FILE, EVENTOS)
     log_lobby_join(player_id)
     ok = esperar_accepted_desde_host(player_id)
     if not ok:
@@ -163,7 +106,6 @@ def lobby_handshake(player_id=PLAYER_ID):
 def guardar_registro_json(score_final, resultado_str):
     global LOG_WRITTEN
     os.makedirs(REMOTE_LOG_DIR, exist_ok=True)
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     if resultado_str == "VICTORIA":
         log_resultado = "Win"
     elif resultado_str == "TIMEOUT":
@@ -178,10 +120,8 @@ def guardar_registro_json(score_final, resultado_str):
         "Result": log_resultado,
         "Score": score_final
     }
-    log_entry = f"{timestamp} {json.dumps(data_dict)}\n"
-    with open(PLAYER_LOG_PATH, "a") as f:
-        f.write(log_entry)
-    print(f"✅ REGISTRO GUARDADO: {log_entry.strip()}")
+    log_entry = EVENTOS.escribir(data_dict)
+    print(f"✅ REGISTRO GUARDADO: {log_entry}")
     LOG_WRITTEN = True
 
 
@@ -191,20 +131,50 @@ def guardar_registro_json(score_final, resultado_str):
 PIN_R = 13
 PIN_G = 6
 PIN_B = 12
-led_rgb = RGBLED(PIN_R, PIN_G, PIN_B)
+# Los pines se toman al empezar cada ronda y se liberan al terminarla.
+# HARDWARE decide si son los de gpiozero, grabados o reproducidos de una
+# traza (GPIO_BACKEND, ver trazas_gpio.py); `reloj` es su fuente de tiempo.
+HARDWARE = hardware()
+reloj = HARDWARE.reloj
+led_rgb = None
+COLORES = {}
+TODOS_LOS_BOTONES = []
+# Cada flanco de pulsación llega aquí como (botón, reloj.monotonic_ns())
+# desde el hilo de gpiozero; jugar() los consume sin hacer polling
+EVENTOS_BOTONES = HARDWARE.cola()
+
+
+def registrar_pulsacion(boton):
+    EVENTOS_BOTONES.put((boton, reloj.monotonic_ns()))
+
+
+def abrir_gpio():
+    global led_rgb, COLORES, TODOS_LOS_BOTONES
+    led_rgb = HARDWARE.led_rgb(PIN_R, PIN_G, PIN_B)
+
+    boton_rojo = HARDWARE.boton(27, registrar_pulsacion, pull_up=True)
+    boton_amarillo = HARDWARE.boton(21, registrar_pulsacion, pull_up=True)
+    boton_blanco = HARDWARE.boton(17, registrar_pulsacion, pull_up=True)
+    boton_azul = HARDWARE.boton(18, registrar_pulsacion, pull_up=True)
+
+    COLORES = {
+        "ROJO": ((1, 0, 0), boton_rojo),
+        "AMARILLO": ((1, 1, 0), boton_amarillo),
+        "BLANCO": ((1, 1, 1), boton_blanco),
+        "AZUL": ((0, 0, 1), boton_azul)
+    }
+    TODOS_LOS_BOTONES = [boton_rojo, boton_amarillo, boton_blanco, boton_azul]
 
-boton_rojo = Button(27, pull_up=True)
-boton_amarillo = Button(21, pull_up=True)
-boton_blanco = Button(17, pull_up=True)
-boton_azul = Button(18, pull_up=True)
 
-COLORES = {
-    "ROJO": ((1, 0, 0), boton_rojo),
-    "AMARILLO": ((1, 1, 0), boton_amarillo),
-    "BLANCO": ((1, 1, 1), boton_blanco),
-    "AZUL": ((0, 0, 1), boton_azul)
-}
-TODOS_LOS_BOTONES = [boton_rojo, boton_amarillo, boton_blanco, boton_azul]
+def cerrar_gpio():
+    global led_rgb, TODOS_LOS_BOTONES
+    if led_rgb is not None:
+        led_rgb.close()
+        led_rgb = None
+    for boton in TODOS_LOS_BOTONES:
+        boton.close()
+    TODOS_LOS_BOTONES = []
+    print("Pines liberados correctamente.")
 
 
 def secuencia_inicio():
@@ -212,11 +182,11 @@ def secuencia_inicio():
     for nombre in ["ROJO", "AMARILLO", "BLANCO", "AZUL"]:
         color_rgb, _ = COLORES[nombre]
         led_rgb.color = color_rgb
-        time.sleep(0.5)
+        reloj.sleep(0.5)
     led_rgb.off()
-    time.sleep(0.3)
+    reloj.sleep(0.3)
     print("Secuencia terminada. ¡Prepárate!")
-    time.sleep(0.5)
+    reloj.sleep(0.5)
 
 
 def jugar():
@@ -245,39 +215,66 @@ def jugar():
     aciertos = 0
     puntos = 0
     DURACION_COLOR = 0.5
-    tiempo_inicio_juego = time.time()
-
-    while time.time() - tiempo_inicio_juego < TIEMPO_TOTAL:
-        pausa = random.uniform(1.0, 2.0)
-        time.sleep(pausa)
-        nombre_color, (color_rgb, boton_correcto) = random.choice(
-            list(COLORES.items()))
-        led_rgb.color = color_rgb
-        print(
-            f"\n🎯 ¡Apareció el color {nombre_color}! (tienes {DURACION_COLOR:.1f}s)")
-        tiempo_inicio_color = time.time()
-        pulsado_correcto = False
-        while time.time() - tiempo_inicio_color < DURACION_COLOR:
-            if boton_correcto.is_pressed:
-                aciertos += 1
-                puntos += 12.5
-                pulsado_correcto = True
-                print(
-                    f"✅ ¡Correcto! (+12.5 puntos) | Aciertos: {aciertos} | Total: {puntos}")
-                time.sleep(0.2)
-                break
-            for boton in TODOS_LOS_BOTONES:
-                if boton.is_pressed and boton != boton_correcto:
-                    print("❌ ¡Botón INCORRECTO!")
-                    time.sleep(0.2)
-            time.sleep(0.01)
-        led_rgb.off()
-        if not pulsado_correcto:
-            print("⏳ No golpeaste a tiempo.")
+    tiempo_inicio_juego = reloj.time()
+    # Un registro por color en telemetria/reaccion_<PlayerID>.bin; se
+    # cierra aunque la ronda termine con Ctrl-C o una excepción
+    with RegistroReacciones(PLAYER_ID) as reacciones:
+        while reloj.time() - tiempo_inicio_juego < TIEMPO_TOTAL:
+            pausa = random.uniform(1.0, 2.0)
+            reloj.sleep(pausa)
+            nombre_color, (color_rgb, boton_correcto) = random.choice(
+                list(COLORES.items()))
+            led_rgb.color = color_rgb
+            # Desde aquí se mide la reacción; lo pulsado antes no cuenta
+            estimulo_ns = reloj.monotonic_ns()
+            estimulo_reloj_ns = reloj.time_ns()
+            limite_ns = estimulo_ns + int(DURACION_COLOR * 1e9)
+            print(
+                f"\n🎯 ¡Apareció el color {nombre_color}! (tienes {DURACION_COLOR:.1f}s)")
+            pulsado_correcto = False
+            primera_ns = None
+            primera_correcta = False
+            while True:
+                restante = (limite_ns - reloj.monotonic_ns()) / 1e9
+                if restante <= 0:
+                    break
+                try:
+                    # El hilo duerme hasta el próximo flanco o el fin del color
+                    boton, pulsado_ns = EVENTOS_BOTONES.get(timeout=restante)
+                except queue.Empty:
+                    break
+                if pulsado_ns < estimulo_ns or pulsado_ns > limite_ns:
+                    continue
+                if primera_ns is None:
+                    primera_ns = pulsado_ns
+                    primera_correcta = boton is boton_correcto
+                if boton is boton_correcto:
+                    aciertos += 1
+                    puntos += 12.5
+                    pulsado_correcto = True
+                    reaccion_ms = (pulsado_ns - estimulo_ns) / 1e6
+                    print(
+                        f"✅ ¡Correcto! (+12.5 puntos) en {reaccion_ms:.0f} ms | Aciertos: {aciertos} | Total: {puntos}")
+                    break
+                print("❌ ¡Botón INCORRECTO!")
+            led_rgb.off()
+            reacciones.agregar(
+                estimulo_reloj_ns,
+                None if primera_ns is None else primera_ns - estimulo_ns,
+                list(COLORES).index(nombre_color), primera_correcta,
+                pulsado_correcto)
+            if not pulsado_correcto:
+                print("⏳ No golpeaste a tiempo.")
 
     print("\n--- 🕹️ ¡FIN DEL JUEGO! ---")
     print(f"Aciertos totales: {aciertos}")
     print(f"Puntuación final: {puntos}")
+    historial = reacciones.histograma
+    if historial.total:
+        print(f"Reacción (historial de {historial.total}): "
+              f"p50 {historial.percentil(50)} ms, "
+              f"p90 {historial.percentil(90)} ms, "
+              f"p99 {historial.percentil(99)} ms")
 
     if aciertos >= 5:
         resultado_final = "VICTORIA"
@@ -299,27 +296,37 @@ def jugar():
 
     if not LOG_WRITTEN:
         guardar_registro_json(puntos, resultado_final)
-    time.sleep(1.5)
+    reloj.sleep(1.5)
     led_rgb.off()
 
 
+def jugar_ronda(player_id=PLAYER_ID, stage=GAME_STAGE, game_id=GAME_ID):
+    """Juega una ronda completa (sin lobby); ver lanzador.py."""
+    global PLAYER_ID, GAME_STAGE, GAME_ID, LOG_WRITTEN
+    PLAYER_ID, GAME_STAGE, GAME_ID = player_id, stage, game_id
+    LOG_WRITTEN = False
+    abrir_gpio()
+    HARDWARE.iniciar()
+    try:
+        jugar()
+    finally:
+        cerrar_gpio()
+
+
 # =======================================================
 # EJECUCIÓN PRINCIPAL
 # =======================================================
-try:
-    if lobby_handshake(PLAYER_ID):
-        stage_asign, game_id_asign = leer_ultima_asignacion()
-        if stage_asign:
-            GAME_STAGE = stage_asign
-        if game_id_asign:
-            GAME_ID = game_id_asign
-        jugar()
-    else:
-        print("Saliendo: no se estableció conexión con el host.")
-except KeyboardInterrupt:
-    print("\nJuego cancelado por el usuario.")
-finally:
-    led_rgb.close()
-    for boton in TODOS_LOS_BOTONES:
-        boton.close()
-    print("Pines liberados correctamente.")
+def main():
+    try:
+        if lobby_handshake(PLAYER_ID):
+            stage_asign, game_id_asign = leer_ultima_asignacion()
+            jugar_ronda(PLAYER_ID, stage_asign or GAME_STAGE,
+                        game_id_asign or GAME_ID)
+        else:
+            print("Saliendo: no se estableció conexión con el host.")
+    except KeyboardInterrupt:
+        print("\nJuego cancelado por el usuario.")
+
+
+if __name__ == "__main__":
+    main()
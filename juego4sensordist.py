@@ -2,13 +2,19 @@ import time
 import random
 import statistics
 import os
-import json
-from gpiozero import DistanceSensor
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from bitacora import estado_host
+from escritor_eventos import eventos_jugador
+from transporte import abrir_espera, conectar_host
+from muestreo_sensor import (ESPERA_GPIOZERO_S, VELOCIDAD_SONIDO,
+                             MuestreadorSensor, medir_adaptativo,
+                             periodo_muestreo)
+from trazas_gpio import hardware
 REMOTE_LOG_DIR = "."
 LOG_FILENAME = "player_events.log"
 PLAYER_LOG_PATH = os.path.join(REMOTE_LOG_DIR, LOG_FILENAME)
 HOST_LOG_FILE = "game_status.log"
+EVENTOS = eventos_jugador()
 LOG_WRITTEN = False
 PLAYER_ID = "P10"
 GAME_ID = 4
@@ -17,54 +23,70 @@ ROUND_SECS = 5
 MIN_TARGET_CM = 15
 MAX_TARGET_CM = 100
 PLAYERS = ["Jugador 1", "Jugador 2", "Jugador 3"]
-sensor = DistanceSensor(echo=20, trigger=16, max_distance=2.0)
+# Sensores de gpiozero, grabados o reproducidos de una traza según
+# GPIO_BACKEND (ver trazas_gpio.py); `reloj` es su fuente de tiempo
+HARDWARE = hardware()
+reloj = HARDWARE.reloj
+# (echo, trigger). queue_len=1: cada distance es un solo ping y no la
+# mediana de los últimos 9 de gpiozero, así las lecturas son independientes
+PINES_SENSOR = (20, 16)
+sensor = HARDWARE.sensor_distancia(PINES_SENSOR[0], PINES_SENSOR[1],
+                                   max_distance=2.0, queue_len=1)
+# Durante una ronda un hilo muestrea el sensor cada ~72 ms (60 ms de
+# gpiozero más un ping a 2 m: una muestra nueva por lectura) y mantiene la
+# mediana de las últimas 7 lecturas (ver muestreo_sensor.py)
+MUESTREADOR = None
+# Medición adaptativa: lecturas nuevas hasta que la mediana se conoce con
+# ±TOLERANCIA_CM (o hasta MAX_MEDICION_S). Con False se usa read_once,
+# la mediana de las últimas 7 lecturas.
+MEDICION_ADAPTATIVA = True
+TOLERANCIA_CM = 1.0
+MAX_MEDICION_S = 0.8
+# Ronda simultánea: cada jugador tiene su propio sensor (echo, trigger) y
+# todos miden en la misma cuenta regresiva, así la ronda dura lo mismo con
+# 1 o con 5 jugadores. Los pings no se pisan: gpiozero dispara un sensor
+# por vez (DistanceSensor.ECHO_LOCK) y lo suelta recién al caer su eco.
+RONDA_SIMULTANEA = os.environ.get("RONDA_SIMULTANEA") == "1"
+PINES_JUGADORES = {
+    "Jugador 1": PINES_SENSOR,
+    "Jugador 2": (21, 12),
+    "Jugador 3": (26, 19),
+}
 
 
 def log_lobby_join(player_id):
     if not os.path.exists(REMOTE_LOG_DIR):
         os.makedirs(REMOTE_LOG_DIR)
-    ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     payload = {"stage": "Lobby", "PlayerID": player_id, "Action": "Join"}
-    with open(PLAYER_LOG_PATH, "a") as f:
-        f.write(f"{ts} {json.dumps(payload)}\n")
+    EVENTOS.escribir(payload, confirmar=True)
     print(f"📨 Join enviado -> {payload}")
 
 
 def esperar_accepted_desde_host(player_id, timeout=None):
     print("\n⌛ Esperando 'Accepted' del host...")
     start = time.time()
-    while True:
-        try:
-            lines = [l.strip() for l in open(HOST_LOG_FILE).readlines()]
-        except:
-            lines = []
-        for line in lines:
-            if not line or line.startswith("#"):
-                continue
-            try:
-                idx = line.find(" ")
-                payload = json.loads(line[idx+1:])
-            except:
-                continue
-            if payload.get("stage") == "Lobby" and payload.get("PlayerID") == player_id and payload.get("Action") == "Accepted":
+    with abrir_espera(HOST_LOG_FILE) as vigilante:
+        while True:
+            payload = estado_host(HOST_LOG_FILE).accepted_de(player_id)
+            if payload is not None:
                 print(f"✅ Host respondió: {payload}")
                 return True
-        if timeout and time.time()-start > timeout:
-            print("⛔ Timeout esperando Accepted.")
-            return False
-        time.sleep(1)
+            if timeout and time.time()-start > timeout:
+                print("⛔ Timeout esperando Accepted.")
+                return False
+            # Despierta apenas llega algo del host, como máximo cada 1s
+            vigilante.esperar(1.0)
 
 
 def log_lobby_ready(player_id):
-    ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     payload = {"stage": "Lobby", "PlayerID": player_id, "Action": "Ready"}
-    with open(PLAYER_LOG_PATH, "a") as f:
-        f.write(f"{ts} {json.dumps(payload)}\n")
+    EVENTOS.escribir(payload, confirmar=True)
     print(f"⚡ Ready enviado -> {payload}")
 
 
 def lobby_handshake(player_id):
     print("===== LOBBY / HANDSHAKE =====")
+    conectar_host(HOST_LOG_FILE, EVENTOS)
     log_lobby_join(player_id)
     if not esperar_accepted_desde_host(player_id):
         print("No se pudo establecer conexión con host.")
@@ -74,36 +96,68 @@ def lobby_handshake(player_id):
     return True
 
 
-def registrar_log_minijuego(score, result, player_id=PLAYER_ID, game_id=GAME_ID):
+def registrar_log_minijuego(score, result, player_id=None, game_id=None,
+                            extra=None):
     global LOG_WRITTEN
+    # Por defecto los de la ronda en curso (jugar_ronda puede cambiarlos)
+    player_id = PLAYER_ID if player_id is None else player_id
+    game_id = GAME_ID if game_id is None else game_id
     if not os.path.exists(REMOTE_LOG_DIR):
         os.makedirs(REMOTE_LOG_DIR)
-    ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     payload = {"stage": GAME_STAGE, "PlayerID": player_id,
                "Action": "Ready", "GameID": game_id, "Result": result, "Score": score}
-    with open(PLAYER_LOG_PATH, "a") as f:
-        f.write(f"{ts} {json.dumps(payload)}\n")
+    if extra:
+        payload.update(extra)
+    EVENTOS.escribir(payload)
     print(f"📄 Log guardado: {payload}")
 
 
-def read_once(avg_samples=7, sample_dt=0.04):
+def read_once(avg_samples=7, sample_dt=None):
+    if MUESTREADOR is not None and MUESTREADOR.activo:
+        # Al instante: la ventana ya tiene las últimas lecturas
+        dist = MUESTREADOR.distancia()
+        if dist is not None:
+            return dist
+    if sample_dt is None:
+        sample_dt = periodo_muestreo(sensor.max_distance)
     vals = []
     for _ in range(avg_samples):
         d = sensor.distance*100
         if 3 <= d <= 350:
             vals.append(d)
-        time.sleep(sample_dt)
+        reloj.sleep(sample_dt)
     return statistics.median(vals) if vals else None
 
 
+def read_adaptive(tolerancia_cm=TOLERANCIA_CM, max_segundos=MAX_MEDICION_S,
+                  sample_dt=None, muestreador=None):
+    """Medicion (distancia, incertidumbre, muestras, segundos) en cm."""
+    muestreador = muestreador or MUESTREADOR
+    if muestreador is not None and muestreador.activo:
+        # El hilo ya filtra ecos perdidos y marca el ritmo
+        def leer():
+            return muestreador.siguiente_lectura(
+                timeout=4 * muestreador.periodo)
+    else:
+        if sample_dt is None:
+            sample_dt = periodo_muestreo(sensor.max_distance)
+
+        def leer():
+            reloj.sleep(sample_dt)
+            d = sensor.distance*100
+            return d if 3 <= d <= 350 else None
+    return medir_adaptativo(leer, tolerancia_cm, max_segundos=max_segundos,
+                            reloj=reloj)
+
+
 def countdown(s):
-    t_end = time.time()+s
+    t_end = reloj.time()+s
     while True:
-        r = int(t_end-time.time())
+        r = int(t_end-reloj.time())
         if r < 0:
             break
         print(f"\r⏳ Quedan {r}s...", end="", flush=True)
-        time.sleep(0.2)
+        reloj.sleep(0.2)
     print()
 
 
@@ -111,41 +165,131 @@ def play_turn(player, target):
     print(f"\n▶️ Intento {player}")
     print(f"   Objetivo: {target:.1f} cm")
     countdown(ROUND_SECS)
-    dist = read_once()
+    start = reloj.monotonic()
+    if MEDICION_ADAPTATIVA:
+        dist, unc, samples, _ = read_adaptive()
+    else:
+        dist, unc, samples = read_once(), None, 7
+    measure_ms = (reloj.monotonic()-start)*1000
+    return log_turn(player, target, dist, unc, samples, measure_ms)
+
+
+def log_turn(player, target, dist, unc, samples, measure_ms):
     if dist is None:
         dist, err = 999.0, 999.0
     else:
         err = abs(dist-target)
-    print(f"📏 Medición: {dist:.1f}cm → Error: {err:.1f}")
+    unc_txt = f" ±{unc:.1f}" if unc is not None else ""
+    print(f"📏 {player}: {dist:.1f}cm{unc_txt} → Error: {err:.1f} "
+          f"({samples} muestras, {measure_ms:.0f} ms)")
+    # Muestras y tiempo de medición, para comparar los dos modos
+    extra = {"Samples": samples, "MeasureMs": round(measure_ms)}
+    if unc is not None:
+        extra["Uncertainty"] = round(unc, 1)
     registrar_log_minijuego(round(err, 1), "Turn",
-                            player_id=player.replace(" ", ""))
+                            player_id=player.replace(" ", ""), extra=extra)
     return dist, err
 
 
+def abrir_sensores(players):
+    """{jugador: DistanceSensor} según PINES_JUGADORES (reusa `sensor`)."""
+    ping_s = 2 * sensor.max_distance / VELOCIDAD_SONIDO
+    if len(players) * ping_s > ESPERA_GPIOZERO_S:
+        print(f"⚠️ {len(players)} sensores a {sensor.max_distance:.1f} m no "
+              "entran en 60 ms: cada uno se leerá más lento.")
+    sensores = {}
+    for p in players:
+        echo, trigger = PINES_JUGADORES[p]
+        if (echo, trigger) == PINES_SENSOR:
+            sensores[p] = sensor
+        else:
+            sensores[p] = HARDWARE.sensor_distancia(
+                echo, trigger, max_distance=sensor.max_distance, queue_len=1)
+    return sensores
+
+
+def play_round_concurrent(target, muestreadores):
+    """Una sola cuenta regresiva y todos los jugadores medidos a la vez."""
+    print(f"\n▶️ Todos a la vez: {', '.join(muestreadores)}")
+    print(f"   Objetivo: {target:.1f} cm")
+    countdown(ROUND_SECS)
+    start = reloj.monotonic()
+
+    def medir(m):
+        if MEDICION_ADAPTATIVA:
+            return read_adaptive(muestreador=m)
+        m.esperar_lecturas(1, timeout=0.5)
+        return m.distancia(), None, len(m.filtro), 0.0
+
+    with ThreadPoolExecutor(max_workers=len(muestreadores)) as pool:
+        mediciones = list(pool.map(medir, muestreadores.values()))
+    measure_ms = (reloj.monotonic()-start)*1000
+    results = []
+    for p, (dist, unc, samples, _) in zip(muestreadores, mediciones):
+        d, e = log_turn(p, target, dist, unc, samples, measure_ms)
+        results.append((p, d, e))
+    return results
+
+
+def jugar_ronda(player_id=PLAYER_ID, stage=GAME_STAGE, game_id=GAME_ID):
+    """Juega una ronda completa (sin lobby); ver lanzador.py."""
+    global PLAYER_ID, GAME_STAGE, GAME_ID, LOG_WRITTEN, MUESTREADOR
+    PLAYER_ID, GAME_STAGE, GAME_ID = player_id, stage, game_id
+    LOG_WRITTEN = False
+    HARDWARE.iniciar()
+    # Con reloj virtual no hay hilos de muestreo: read_once mide bloqueando
+    # y la ronda simultánea no aplica
+    MUESTREADOR = None
+    simultanea = RONDA_SIMULTANEA and HARDWARE.tiempo_real
+    # En la ronda simultánea los pings de todos comparten el ECHO_LOCK
+    periodo = periodo_muestreo(sensor.max_distance,
+                               len(PLAYERS) if simultanea else 1)
+    if HARDWARE.tiempo_real:
+        MUESTREADOR = MuestreadorSensor(sensor, periodo, ventana=7).iniciar()
+    muestreadores = {}
+    if simultanea:
+        for p, s in abrir_sensores(PLAYERS).items():
+            muestreadores[p] = (MUESTREADOR if s is sensor else
+                                MuestreadorSensor(s, periodo,
+                                                  ventana=7).iniciar())
+    try:
+        print("Reglas: coloca la mano a la distancia indicada en 15s.\n")
+        target = random.uniform(MIN_TARGET_CM, MAX_TARGET_CM)
+        print(f"🎯 Objetivo global: {target:.1f}cm")
+        input("Presiona ENTER para comenzar...")
+        HARDWARE.sincronizar()
+        if simultanea:
+            results = play_round_concurrent(target, muestreadores)
+        else:
+            results = []
+            for p in PLAYERS:
+                d, e = play_turn(p, target)
+                results.append((p, d, e))
+        winner = min(results, key=lambda x: x[2])
+        winner_err = winner[2]
+        print("\n=== RESULTADOS ===")
+        for p, d, e in results:
+            outcome = "Win" if e == winner_err else "Lose"
+            registrar_log_minijuego(round(e, 1), outcome, p.replace(" ", ""))
+            print(
+                f" - {p:10s}: {d:5.1f} cm (error {e:4.1f}) {'🏆' if outcome=='Win' else ''}")
+        if not LOG_WRITTEN:
+            registrar_log_minijuego(round(winner_err, 1), "GameWin")
+            LOG_WRITTEN = True
+        print(f"\n🏆 GANADOR: {winner[0]} (error {winner_err:.1f} cm)\n")
+    finally:
+        if MUESTREADOR is not None:
+            MUESTREADOR.detener()
+        for m in muestreadores.values():
+            if m is not MUESTREADOR:
+                m.detener()
+                m.sensor.close()
+
+
 def main():
-    global LOG_WRITTEN
     if not lobby_handshake(PLAYER_ID):
         return
-    print("Reglas: coloca la mano a la distancia indicada en 15s.\n")
-    target = random.uniform(MIN_TARGET_CM, MAX_TARGET_CM)
-    print(f"🎯 Objetivo global: {target:.1f}cm")
-    input("Presiona ENTER para comenzar...")
-    results = []
-    for p in PLAYERS:
-        d, e = play_turn(p, target)
-        results.append((p, d, e))
-    winner = min(results, key=lambda x: x[2])
-    winner_err = winner[2]
-    print("\n=== RESULTADOS ===")
-    for p, d, e in results:
-        outcome = "Win" if e == winner_err else "Lose"
-        registrar_log_minijuego(round(e, 1), outcome, p.replace(" ", ""))
-        print(
-            f" - {p:10s}: {d:5.1f} cm (error {e:4.1f}) {'🏆' if outcome=='Win' else ''}")
-    if not LOG_WRITTEN:
-        registrar_log_minijuego(round(winner_err, 1), "GameWin")
-        LOG_WRITTEN = True
-    print(f"\n🏆 GANADOR: {winner[0]} (error {winner_err:.1f} cm)\n")
+    jugar_ronda()
 
 
 if __name__ == "__main__":
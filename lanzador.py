@@ -0,0 +1,110 @@
+import json
+import time
+import argparse
+import importlib
+from bitacora import estado_host
+from escritor_eventos import eventos_jugador
+from transporte import abrir_espera, conectar_host
+
+# =========================================
+# LANZADOR ÚNICO DE LOS MINIJUEGOS
+# =========================================
+# Un solo proceso por jugador: hace el lobby una vez y después, por cada
+# Assign del host, juega el minijuego de ese GameID. Cada juego (y con él
+# pygame o gpiozero) se importa recién la primera vez que toca, y queda
+# cargado para las rondas siguientes.
+HOST_LOG_FILE = "game_status.log"
+EVENTOS = eventos_jugador()
+PLAYER_ID = 10
+
+# GameID -> (módulo, función que juega una ronda sin lobby)
+JUEGOS = {
+    1: ("juego1letras", "minijuego_tipeo_simple"),
+    2: ("juego2arcoyflecha", "jugar_ronda"),
+    3: ("juego3topos", "jugar_ronda"),
+    4: ("juego4sensordist", "jugar_ronda"),
+}
+
+
+def cargar_juego(game_id):
+    """Devuelve la función de ronda del juego, importándolo si hace falta."""
+    modulo, funcion = JUEGOS[game_id]
+    return getattr(importlib.import_module(modulo), funcion)
+
+
+# =========================================
+# LOBBY / HANDSHAKE
+# =========================================
+def lobby_handshake(player_id=PLAYER_ID, timeout=None):
+    print("===== LOBBY / REGISTRO DE JUGADOR =====")
+    conectar_host(HOST_LOG_FILE, EVENTOS)
+    payload = {"stage": "Lobby", "PlayerID": player_id, "Action": "Join"}
+    EVENTOS.escribir(payload, confirmar=True)
+    print(f"📨 Lobby: JOIN enviado -> {json.dumps(payload)}")
+
+    print("\n⌛ Esperando 'Accepted' del host en game_status.log...")
+    inicio = time.time()
+    with abrir_espera(HOST_LOG_FILE) as vigilante:
+        while estado_host(HOST_LOG_FILE).accepted_de(player_id) is None:
+            if timeout and (time.time() - inicio) > timeout:
+                print("⛔ Tiempo de espera agotado esperando 'Accepted'.")
+                return False
+            vigilante.esperar(1.0)
+
+    payload = {"stage": "Lobby", "PlayerID": player_id, "Action": "Ready"}
+    EVENTOS.escribir(payload, confirmar=True)
+    print(f"✅ Lobby: READY registrado -> {json.dumps(payload)}")
+    return True
+
+
+def esperar_asignacion(anterior=None):
+    """Espera un Assign distinto de anterior y devuelve (stage, GameID)."""
+    with abrir_espera(HOST_LOG_FILE) as vigilante:
+        while True:
+            asignacion = estado_host(HOST_LOG_FILE).asignacion
+            if asignacion and asignacion != anterior:
+                return asignacion
+            vigilante.esperar(1.0)
+
+
+# =========================================
+# MAIN
+# =========================================
+def main():
+    parser = argparse.ArgumentParser(
+        description="Lobby una vez y un minijuego por cada Assign del host.")
+    parser.add_argument("--player-id", type=int, default=PLAYER_ID)
+    parser.add_argument("--rondas", type=int, default=0,
+                        help="rondas a jugar antes de salir (0: sin límite)")
+    parser.add_argument("--precargar", type=int, nargs="*", default=[],
+                        choices=sorted(JUEGOS), metavar="GameID",
+                        help="juegos a importar ya, mientras se espera al host")
+    args = parser.parse_args()
+
+    if not lobby_handshake(args.player_id):
+        raise SystemExit("Saliendo: no se estableció conexión con el host.")
+    for game_id in args.precargar:
+        cargar_juego(game_id)
+
+    jugadas = 0
+    asignacion = None
+    try:
+        while not args.rondas or jugadas < args.rondas:
+            print("⌛ Esperando asignación del host...")
+            asignacion = esperar_asignacion(asignacion)
+            stage, game_id = asignacion
+            if game_id not in JUEGOS:
+                print(f"⚠️ GameID desconocido: {game_id}")
+                continue
+            inicio = time.perf_counter()
+            jugar_ronda = cargar_juego(game_id)
+            print(f"🎮 {stage}: juego {game_id} listo en "
+                  f"{(time.perf_counter() - inicio) * 1000:.0f} ms")
+            jugar_ronda(args.player_id, stage, game_id)
+            jugadas += 1
+    except KeyboardInterrupt:
+        print("\nCancelado.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+import math
+import time
+import bisect
+import threading
+from collections import namedtuple
+
+# =========================================
+# MUESTREO DEL SENSOR DE DISTANCIA EN SEGUNDO PLANO
+# =========================================
+# Un hilo lee el sensor a ritmo fijo y mantiene la mediana de las últimas
+# lecturas válidas; el juego la consulta al instante en lugar de bloquearse
+# ~300 ms tomando muestras cada vez.
+MIN_CM = 3
+MAX_CM = 350
+# gpiozero toma una muestra de cada DistanceSensor 60 ms (sample_wait)
+# después de terminar la anterior, y el ping de la anterior dura hasta que
+# vuelve el eco (ECHO_LOCK: un sensor por vez). Leer más seguido que eso
+# devuelve la misma muestra otra vez.
+ESPERA_GPIOZERO_S = 0.06
+VELOCIDAD_SONIDO = 343.26
+# MAD * 1.4826 estima la desviación estándar si el ruido es normal
+ESCALA_MAD = 1.4826
+
+# distancia e incertidumbre en cm (None si no hubo lecturas válidas)
+Medicion = namedtuple("Medicion", "distancia incertidumbre muestras segundos")
+
+
+def periodo_muestreo(max_distance=MAX_CM / 100, sensores=1):
+    """Segundos entre lecturas para que cada una sea una muestra nueva.
+
+    Es sample_wait más los pings de todos los sensores que comparten el
+    ECHO_LOCK, a max_distance (m). Más allá de max_distance gpiozero
+    devuelve max_distance, así que repetir esa lectura no cambia nada.
+    """
+    return ESPERA_GPIOZERO_S + sensores * 2 * max_distance / VELOCIDAD_SONIDO
+
+
+class MedianaMovil:
+    """Mediana de las últimas `ventana` muestras.
+
+    Las muestras se guardan dos veces: en un buffer circular de tamaño
+    fijo (orden de llegada, para saber cuál sale) y en una lista ordenada
+    (para la mediana). Cada agregar es una búsqueda binaria y un
+    desplazamiento de como mucho `ventana` elementos; mediana() es O(1).
+    """
+
+    def __init__(self, ventana=7):
+        self.ventana = ventana
+        self.anillo = [None] * ventana
+        self.siguiente = 0
+        self.ordenadas = []
+
+    def __len__(self):
+        return len(self.ordenadas)
+
+    def agregar(self, valor):
+        saliente = self.anillo[self.siguiente]
+        if saliente is not None:
+            del self.ordenadas[bisect.bisect_left(self.ordenadas, saliente)]
+        self.anillo[self.siguiente] = valor
+        self.siguiente = (self.siguiente + 1) % self.ventana
+        bisect.insort(self.ordenadas, valor)
+
+    def mediana(self):
+        n = len(self.ordenadas)
+        if not n:
+            return None
+        medio = n // 2
+        if n % 2:
+            return self.ordenadas[medio]
+        return (self.ordenadas[medio - 1] + self.ordenadas[medio]) / 2
+
+    def desviacion_mediana(self, centro=None):
+        """Mediana de |x - centro| (MAD), en la misma unidad que los datos."""
+        if not self.ordenadas:
+            return None
+        if centro is None:
+            centro = self.mediana()
+        desvios = sorted(abs(v - centro) for v in self.ordenadas)
+        n = len(desvios)
+        medio = n // 2
+        if n % 2:
+            return desvios[medio]
+        return (desvios[medio - 1] + desvios[medio]) / 2
+
+    def vaciar(self):
+        self.anillo = [None] * self.ventana
+        self.siguiente = 0
+        self.ordenadas = []
+
+
+class MuestreadorSensor:
+    """Lee sensor.distance en un hilo y expone la distancia filtrada (cm).
+
+    Rechazo de valores atípicos:
+      - fuera de [min_cm, max_cm] siempre se descarta (eco perdido, etc.);
+      - con k_mad, una lectura a más de k_mad desviaciones (estimadas
+        por MAD, y a más de tolerancia_cm) de la mediana actual también;
+        pero si max_rechazos seguidas coinciden entre sí se asume que la
+        mano se movió de verdad y la ventana vuelve a empezar desde ellas.
+
+    El sensor debe crearse con queue_len=1: con la cola por defecto de
+    gpiozero, distance ya es la mediana de 9 lecturas y las sucesivas se
+    solapan. Sin periodo se usa periodo_muestreo(sensor.max_distance), y
+    nunca baja de ESPERA_GPIOZERO_S, para que cada lectura sea una muestra
+    nueva.
+    """
+
+    def __init__(self, sensor, periodo=None, ventana=7, min_cm=MIN_CM,
+                 max_cm=MAX_CM, k_mad=3.0, tolerancia_cm=2.0,
+                 max_rechazos=3):
+        self.sensor = sensor
+        if periodo is None:
+            periodo = periodo_muestreo(getattr(sensor, "max_distance",
+                                               MAX_CM / 100))
+        self.periodo = max(periodo, ESPERA_GPIOZERO_S)
+        self.filtro = MedianaMovil(ventana)
+        self.min_cm = min_cm
+        self.max_cm = max_cm
+        self.k_mad = k_mad
+        self.tolerancia_cm = tolerancia_cm
+        self.max_rechazos = max_rechazos
+        self.lecturas = 0
+        self.aceptadas = 0
+        self.rechazadas = 0
+        self.ultima = None
+        self.ultima_ns = None
+        self._rechazos_seguidos = []
+        self._cond = threading.Condition()
+        self._hilo = None
+        self.activo = False
+
+    def _margen(self, centro):
+        return max(self.tolerancia_cm, self.k_mad * ESCALA_MAD *
+                   self.filtro.desviacion_mediana(centro))
+
+    def _atipica(self, cm):
+        if (self.k_mad is None or
+                len(self.filtro) < self.filtro.ventana // 2 + 1):
+            return False
+        centro = self.filtro.mediana()
+        return abs(cm - centro) > self._margen(centro)
+
+    def agregar(self, cm):
+        """Procesa una lectura en cm; devuelve True si entró al filtro."""
+        with self._cond:
+            self.lecturas += 1
+            if cm is None or not (self.min_cm <= cm <= self.max_cm):
+                self.rechazadas += 1
+                return False
+            if self._atipica(cm):
+                self.rechazadas += 1
+                seguidos = self._rechazos_seguidos[-(self.max_rechazos - 1):]
+                seguidos.append(cm)
+                self._rechazos_seguidos = seguidos
+                if (len(seguidos) < self.max_rechazos or
+                        max(seguidos) - min(seguidos) >
+                        self._margen(self.filtro.mediana())):
+                    return False
+                # Cambio real de distancia: se sigue desde las nuevas lecturas
+                self.filtro.vaciar()
+                for valor in seguidos[:-1]:
+                    self.filtro.agregar(valor)
+            self._rechazos_seguidos = []
+            self.filtro.agregar(cm)
+            self.aceptadas += 1
+            self.ultima = cm
+            self.ultima_ns = time.monotonic_ns()
+            self._cond.notify_all()
+            return True
+
+    def distancia(self):
+        """Mediana filtrada actual en cm, o None si aún no hay lecturas."""
+        with self._cond:
+            return self.filtro.mediana()
+
+    def esperar_lecturas(self, n=1, timeout=None):
+        """Espera n lecturas válidas nuevas; devuelve la distancia."""
+        with self._cond:
+            objetivo = self.aceptadas + n
+            self._cond.wait_for(
+                lambda: self.aceptadas >= objetivo or not self.activo,
+                timeout)
+            return self.filtro.mediana()
+
+    def siguiente_lectura(self, timeout=None):
+        """Espera la próxima lectura aceptada y la devuelve (sin filtrar)."""
+        with self._cond:
+            objetivo = self.aceptadas + 1
+            if not self._cond.wait_for(
+                    lambda: self.aceptadas >= objetivo or not self.activo,
+                    timeout) or self.aceptadas < objetivo:
+                return None
+            return self.ultima
+
+    def _bucle(self):
+        proxima = time.monotonic()
+        while self.activo:
+            try:
+                cm = self.sensor.distance * 100
+            except Exception:
+                cm = None
+            self.agregar(cm)
+            # Ritmo fijo aunque la lectura tarde
+            proxima += self.periodo
+            espera = proxima - time.monotonic()
+            if espera > 0:
+                time.sleep(espera)
+            else:
+                proxima = time.monotonic()
+
+    def iniciar(self):
+        if self._hilo is None:
+            self.activo = True
+            self._hilo = threading.Thread(target=self._bucle,
+                                          name="muestreo-sensor", daemon=True)
+            self._hilo.start()
+        return self
+
+    def detener(self):
+        self.activo = False
+        with self._cond:
+            self._cond.notify_all()
+        if self._hilo is not None:
+            self._hilo.join()
+            self._hilo = None
+
+    def __enter__(self):
+        return self.iniciar()
+
+    def __exit__(self, *exc):
+        self.detener()
+
+
+# =========================================
+# MEDICIÓN ADAPTATIVA
+# =========================================
+def _k_intervalo(n, confianza):
+    """Mayor k tal que [x_(k), x_(n-k+1)] cubre la mediana con esa confianza.
+
+    Es el intervalo por estadísticos de orden: no supone ninguna
+    distribución del ruido. Devuelve 0 si con n muestras no alcanza.
+    """
+    acumulada = 0
+    k = 0
+    for i in range(n // 2 + 1):
+        # Con k = i + 1 quedan afuera las colas de i muestras o menos
+        acumulada += math.comb(n, i)
+        if 1 - 2 * acumulada / 2 ** n < confianza:
+            break
+        k = i + 1
+    return k
+
+
+def intervalo_mediana(ordenadas, confianza=0.9):
+    """(desde, hasta) para la mediana de ordenadas (None si faltan)."""
+    k = _k_intervalo(len(ordenadas), confianza)
+    if not k:
+        return None
+    return ordenadas[k - 1], ordenadas[-k]
+
+
+def medir_adaptativo(leer, tolerancia_cm=1.0, confianza=0.9, max_muestras=25,
+                     max_segundos=0.8, reloj=time):
+    """Lee hasta que la mediana se conoce con ±tolerancia_cm, o hasta el tope.
+
+    leer() devuelve una lectura en cm (o None si no hubo) y es quien marca
+    el ritmo, p. ej. MuestreadorSensor.siguiente_lectura. El intervalo
+    vale para muestras independientes: leer no debe ir más rápido que
+    periodo_muestreo, o repite muestras de gpiozero. Con la mano quieta
+    alcanzan 5 muestras (con confianza 0.9); con ruido se siguen tomando
+    hasta max_muestras o max_segundos (medidos con reloj). La
+    incertidumbre es la mitad del ancho del intervalo, o del rango si no
+    llegó a haberlo.
+    """
+    inicio = reloj.monotonic()
+    ordenadas = []
+    intervalo = None
+    while True:
+        cm = leer()
+        if cm is not None:
+            bisect.insort(ordenadas, cm)
+            intervalo = intervalo_mediana(ordenadas, confianza)
+            if (intervalo and
+                    (intervalo[1] - intervalo[0]) / 2 <= tolerancia_cm):
+                break
+        if (len(ordenadas) >= max_muestras or
+                reloj.monotonic() - inicio >= max_segundos):
+            break
+    segundos = reloj.monotonic() - inicio
+    if not ordenadas:
+        return Medicion(None, None, 0, segundos)
+    n = len(ordenadas)
+    medio = n // 2
+    mediana = (ordenadas[medio] if n % 2
+               else (ordenadas[medio - 1] + ordenadas[medio]) / 2)
+    desde, hasta = intervalo or (ordenadas[0], ordenadas[-1])
+    return Medicion(mediana, (hasta - desde) / 2, n, segundos)
@@ -0,0 +1,134 @@
+# =========================================
+# PUNTAJE DEL JUEGO DE TIPEO POR DISTANCIA DE EDICIÓN
+# =========================================
+# Comparar carácter a carácter en la misma posición cuenta como mal todo
+# lo que sigue a una letra salteada. Aquí los errores son la distancia de
+# Levenshtein (inserciones, borrados y cambios) entre la frase y lo
+# escrito, calculada con el algoritmo de vectores de bits de Myers en la
+# formulación de Hyyrö: cada columna de la tabla de programación dinámica
+# se guarda como dos enteros de bits (subidas y bajadas entre filas) y se
+# avanza con unas pocas operaciones sobre enteros de Python, O(m/64) por
+# carácter escrito en lugar de O(m).
+PUNTOS_POR_ERROR = 5
+PUNTAJE_MINIMO_VICTORIA = 60
+
+
+def _mascaras(patron):
+    """{carácter: bits de las posiciones donde aparece en patron}."""
+    mascaras = {}
+    for i, caracter in enumerate(patron):
+        mascaras[caracter] = mascaras.get(caracter, 0) | (1 << i)
+    return mascaras
+
+
+class PuntajeIncremental:
+    """Distancia de edición contra objetivo, actualizada tecla a tecla.
+
+    agregar(c) avanza una columna; borrar() vuelve a la anterior (se
+    guarda la pila de columnas). distancia() es la distancia contra la
+    frase completa; errores() es contra el mejor prefijo de la frase, lo
+    que tiene sentido mostrar mientras el jugador todavía escribe.
+    """
+
+    def __init__(self, objetivo):
+        self.objetivo = objetivo
+        self.m = len(objetivo)
+        self.todos = (1 << self.m) - 1
+        self.ultimo = 1 << (self.m - 1) if self.m else 0
+        self.mascaras = _mascaras(objetivo)
+        # (subidas, bajadas, distancia) de cada columna; la 0 es la vacía
+        self.columnas = [(self.todos, 0, self.m)]
+
+    def __len__(self):
+        return len(self.columnas) - 1
+
+    def agregar(self, caracter):
+        subidas, bajadas, distancia = self.columnas[-1]
+        if not self.m:
+            self.columnas.append((0, 0, distancia + 1))
+            return
+        iguales = self.mascaras.get(caracter, 0)
+        xv = iguales | bajadas
+        xh = (((iguales & subidas) + subidas) ^ subidas) | iguales
+        sube_h = bajadas | (~(xh | subidas) & self.todos)
+        baja_h = subidas & xh
+        if sube_h & self.ultimo:
+            distancia += 1
+        elif baja_h & self.ultimo:
+            distancia -= 1
+        # La fila 0 crece de a uno por carácter escrito: entra un 1
+        sube_h = ((sube_h << 1) | 1) & self.todos
+        baja_h = (baja_h << 1) & self.todos
+        self.columnas.append((baja_h | (~(xv | sube_h) & self.todos),
+                              sube_h & xv, distancia))
+
+    def borrar(self):
+        if len(self.columnas) > 1:
+            self.columnas.pop()
+
+    def distancia(self):
+        return self.columnas[-1][2]
+
+    def _fila(self, i):
+        """Distancia entre objetivo[:i] y lo escrito."""
+        subidas, bajadas, _ = self.columnas[-1]
+        prefijo = (1 << i) - 1
+        return (len(self) + (subidas & prefijo).bit_count() -
+                (bajadas & prefijo).bit_count())
+
+    def errores(self):
+        """Mínima distancia entre lo escrito y algún prefijo de objetivo.
+
+        Como D[i] >= |i - n|, el mínimo está a no más de D[n] filas de la
+        diagonal: se recorren solo esas, de a un bit.
+        """
+        n = len(self)
+        centro = min(n, self.m)
+        mejor = self._fila(centro)
+        subidas, bajadas, _ = self.columnas[-1]
+        desde = max(0, centro - mejor)
+        hasta = min(self.m, centro + mejor)
+        valor = self._fila(desde)
+        for i in range(desde, hasta + 1):
+            if i > desde:
+                bit = 1 << (i - 1)
+                valor += bool(subidas & bit) - bool(bajadas & bit)
+            mejor = min(mejor, valor)
+        return mejor
+
+
+def distancia_edicion(a, b):
+    """Distancia de Levenshtein entre a y b (vectores de bits)."""
+    # El patrón en bits es el más corto: menos bits por operación
+    if len(a) < len(b):
+        a, b = b, a
+    puntaje = PuntajeIncremental(b)
+    for caracter in a:
+        puntaje.agregar(caracter)
+    return puntaje.distancia()
+
+
+def distancia_edicion_dp(a, b):
+    """Versión directa O(len(a) * len(b)), como referencia."""
+    anterior = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        actual = [i]
+        for j, cb in enumerate(b, 1):
+            actual.append(min(anterior[j] + 1, actual[j - 1] + 1,
+                              anterior[j - 1] + (ca != cb)))
+        anterior = actual
+    return anterior[-1]
+
+
+def puntaje_desde_errores(errores, largo_objetivo):
+    """0..100: precisión menos PUNTOS_POR_ERROR por cada error."""
+    if not largo_objetivo:
+        return 0
+    buenas = max(0, largo_objetivo - errores)
+    precision = buenas / largo_objetivo * 100
+    return int(max(0, min(100, precision - errores * PUNTOS_POR_ERROR)))
+
+
+def puntaje_tipeo(objetivo, escrito):
+    return puntaje_desde_errores(distancia_edicion(objetivo, escrito),
+                                 len(objetivo))
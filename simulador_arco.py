@@ -0,0 +1,249 @@
+"""Simulador sin pantalla del juego de arco y flecha (juego2).
+
+Corre la misma física que el juego (fisica_arco.PartidaArco) paso a paso
+y sin reloj, con un tirador automático en lugar del jugador, para ajustar
+WINNING_SCORE, target_speed y el sabotaje Delay con miles de partidas.
+No importa pygame. Cada partida usa su propia semilla, así que un mismo
+lote da siempre los mismos resultados, con o sin procesos.
+
+Uso:
+  python simulador_arco.py --partidas 5000 --tirador predictivo
+         --error-pasos 4 --delay 0 5 10 --target-speed 4 6 --procesos 4
+"""
+import os
+import copy
+import time
+import random
+import argparse
+import statistics
+import multiprocessing
+from functools import partial
+from fisica_arco import (FISICA_DT, PUNTAJE_GANADOR, PartidaArco,
+                         duracion_con_delay)
+
+
+# =========================================
+# TIRADORES (reemplazan la barra espaciadora)
+# =========================================
+# Un tirador es un objeto llamable: recibe la partida antes de cada paso
+# de física y devuelve True si dispara en ese paso. rng es el azar propio
+# del tirador, separado del de la diana.
+class TiradorAleatorio:
+    """Dispara al azar, en promedio por_segundo veces por segundo."""
+
+    def __init__(self, rng, por_segundo=2.0, esperar_flecha=True):
+        self.rng = rng
+        self.prob = por_segundo * FISICA_DT
+        self.esperar_flecha = esperar_flecha
+
+    def __call__(self, partida):
+        if self.esperar_flecha and partida.arrow_flying:
+            return False
+        return self.rng.random() < self.prob
+
+
+class TiradorGuion:
+    """Dispara en los instantes dados (segundos), p. ej. de una partida real."""
+
+    def __init__(self, rng, instantes=()):
+        self.pasos = sorted(round(t / FISICA_DT) for t in instantes)
+        self.siguiente = 0
+
+    def __call__(self, partida):
+        if (self.siguiente < len(self.pasos) and
+                partida.pasos >= self.pasos[self.siguiente]):
+            self.siguiente += 1
+            return True
+        return False
+
+
+class TiradorPredictivo:
+    """Jugador que calcula cuándo disparar para acertar.
+
+    Con la flecha en el arco busca en cuántos pasos disparar para que la
+    trayectoria de la flecha se cruce con la diana; reaccion_pasos suma
+    una demora fija y error_pasos un error gaussiano (en pasos de 1/60 s)
+    para parecerse a una persona.
+    """
+
+    def __init__(self, rng, reaccion_pasos=0, error_pasos=0.0,
+                 max_espera=240):
+        self.rng = rng
+        self.reaccion = reaccion_pasos
+        self.error = error_pasos
+        self.max_espera = max_espera
+        self.disparo_en = None
+
+    def _planear(self, partida):
+        # Pasos del vuelo en que la flecha está a la altura horizontal de
+        # la diana, con el rango de alturas de diana que acertaría
+        ventanas = []
+        for k, (x, y) in enumerate(partida.trayectoria_disparo()):
+            alturas = partida.alturas_de_impacto(x, y)
+            if alturas is not None:
+                ventanas.append((k,) + alturas)
+        if not ventanas:
+            return partida.pasos
+        # Mientras la flecha no vuela la diana se mueve sin azar: su
+        # recorrido se calcula sobre una copia, a medida que hace falta
+        espera = copy.copy(partida)
+        recorrido = []
+        ultimo = ventanas[-1][0]
+        demora = 0
+        for d in range(self.max_espera):
+            while len(recorrido) <= d + ultimo:
+                recorrido.append(espera.target_y)
+                espera.paso()
+            if any(desde <= recorrido[d + k] < hasta
+                   for k, desde, hasta in ventanas):
+                demora = d
+                break
+        ruido = round(self.rng.gauss(0, self.error)) if self.error else 0
+        return partida.pasos + max(0, demora + self.reaccion + ruido)
+
+    def __call__(self, partida):
+        if partida.arrow_flying:
+            return False
+        if self.disparo_en is None:
+            self.disparo_en = self._planear(partida)
+        if partida.pasos >= self.disparo_en:
+            self.disparo_en = None
+            return True
+        return False
+
+
+TIRADORES = {
+    "aleatorio": TiradorAleatorio,
+    "guion": TiradorGuion,
+    "predictivo": TiradorPredictivo,
+}
+
+
+# =========================================
+# SIMULACIÓN
+# =========================================
+def simular_partida(semilla, tirador="predictivo", params_tirador=None,
+                    delay=0, puntaje_ganador=PUNTAJE_GANADOR,
+                    target_speed=4):
+    """Juega una partida completa sin pantalla y devuelve su resumen."""
+    partida = PartidaArco(rng=random.Random(semilla),
+                          duracion=duracion_con_delay(delay),
+                          puntaje_ganador=puntaje_ganador,
+                          target_speed=target_speed)
+    decidir = TIRADORES[tirador](random.Random(f"tirador-{semilla}"),
+                                 **(params_tirador or {}))
+    while partida.resultado() is None:
+        if decidir(partida):
+            partida.disparar()
+        partida.paso()
+    return {"semilla": semilla, "resultado": partida.resultado(),
+            "score": partida.score, "tiempo": partida.tiempo,
+            "disparos": partida.disparos}
+
+
+def simular_lote(partidas, semilla=0, procesos=None, **config):
+    """Simula partidas seguidas desde semilla, repartidas en procesos.
+
+    config se pasa a simular_partida. Con procesos=1 todo corre aquí
+    mismo; por defecto se usa un proceso por CPU.
+    """
+    semillas = range(semilla, semilla + partidas)
+    jugar = partial(simular_partida, **config)
+    procesos = procesos or os.cpu_count() or 1
+    if procesos == 1 or partidas < 2 * procesos:
+        return [jugar(s) for s in semillas]
+    # Lotes grandes: el costo de mandar cada partida al pool es mayor que
+    # el de jugarla
+    tam_lote = max(1, partidas // (procesos * 8))
+    with multiprocessing.Pool(procesos) as pool:
+        return sorted(pool.imap_unordered(jugar, semillas, tam_lote),
+                      key=lambda r: r["semilla"])
+
+
+def percentil(valores, p):
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * p / 100))]
+
+
+def resumir(resultados):
+    """Tasa de victoria y distribución de puntajes de un lote."""
+    scores = [r["score"] for r in resultados]
+    victorias = [r for r in resultados if r["resultado"] == "VICTORIA"]
+    disparos = sum(r["disparos"] for r in resultados)
+    return {
+        "partidas": len(resultados),
+        "tasa_victoria": len(victorias) / len(resultados),
+        "score_medio": statistics.mean(scores),
+        "score_p10": percentil(scores, 10),
+        "score_p50": percentil(scores, 50),
+        "score_p90": percentil(scores, 90),
+        "tiempo_victoria": (statistics.mean(r["tiempo"] for r in victorias)
+                            if victorias else None),
+        "precision": sum(scores) / disparos if disparos else 0.0,
+        "histograma": {s: scores.count(s) for s in sorted(set(scores))},
+    }
+
+
+def _histograma(histograma, total, ancho=40):
+    for score, cantidad in histograma.items():
+        barra = "#" * round(ancho * cantidad / total)
+        print(f"   {score:>3} | {barra} {cantidad}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--partidas", type=int, default=2000)
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--procesos", type=int, default=None)
+    parser.add_argument("--tirador", choices=sorted(TIRADORES),
+                        default="predictivo")
+    parser.add_argument("--por-segundo", type=float, default=2.0,
+                        help="disparos por segundo (aleatorio)")
+    parser.add_argument("--reaccion-pasos", type=int, default=6,
+                        help="demora fija en pasos de 1/60 s (predictivo)")
+    parser.add_argument("--error-pasos", type=float, default=4.0,
+                        help="desvío del momento de disparo (predictivo)")
+    parser.add_argument("--instantes", type=float, nargs="*", default=[],
+                        help="segundos en que dispara (guion)")
+    parser.add_argument("--delay", type=int, nargs="+", default=[0])
+    parser.add_argument("--target-speed", type=int, nargs="+", default=[4])
+    parser.add_argument("--puntaje-ganador", type=int, nargs="+",
+                        default=[PUNTAJE_GANADOR])
+    args = parser.parse_args()
+
+    params = {
+        "aleatorio": {"por_segundo": args.por_segundo},
+        "guion": {"instantes": args.instantes},
+        "predictivo": {"reaccion_pasos": args.reaccion_pasos,
+                       "error_pasos": args.error_pasos},
+    }[args.tirador]
+    configs = [(d, v, g) for d in args.delay for v in args.target_speed
+               for g in args.puntaje_ganador]
+
+    print(f"{args.partidas} partidas por configuración, tirador "
+          f"{args.tirador} {params}")
+    print(f"{'delay':>5} {'vel':>4} {'meta':>4} | {'victoria':>8} "
+          f"{'score':>6} {'p10':>4} {'p50':>4} {'p90':>4} | "
+          f"{'t vict s':>8} {'precisión':>9} | {'partidas/s':>10}")
+    for delay, velocidad, meta in configs:
+        inicio = time.perf_counter()
+        resultados = simular_lote(
+            args.partidas, args.semilla, args.procesos, tirador=args.tirador,
+            params_tirador=params, delay=delay, puntaje_ganador=meta,
+            target_speed=velocidad)
+        segundos = time.perf_counter() - inicio
+        r = resumir(resultados)
+        t_vict = (f"{r['tiempo_victoria']:8.2f}"
+                  if r["tiempo_victoria"] is not None else f"{'-':>8}")
+        print(f"{delay:>5} {velocidad:>4} {meta:>4} | "
+              f"{r['tasa_victoria']:>8.1%} {r['score_medio']:>6.2f} "
+              f"{r['score_p10']:>4} {r['score_p50']:>4} {r['score_p90']:>4} | "
+              f"{t_vict} {r['precision']:>9.1%} | "
+              f"{args.partidas / segundos:>10.0f}")
+        if len(configs) == 1:
+            print("\nDistribución de puntajes:")
+            _histograma(r["histograma"], r["partidas"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+import os
+import sys
+import time
+import struct
+import argparse
+from collections import namedtuple
+
+# =========================================
+# TELEMETRÍA DE REACCIÓN (juego3topos)
+# =========================================
+# Un archivo binario de solo-agregar por jugador, con un registro de 15
+# bytes por color mostrado:
+#   estimulo_ns  int64   time.time_ns() al encender el color
+#   reaccion_us  uint32  de ahí a la primera pulsación (SIN_PULSAR si no hubo)
+#   color        uint8   índice en NOMBRES_COLOR
+#   flags        uint8   PRIMERA_CORRECTA | ACERTO
+#   reservado    uint8
+# Escribir un registro es un struct.pack y un write con buffer; juego3 lo
+# hace al apagar el color, fuera de la ventana de DURACION_COLOR.
+DIRECTORIO = "telemetria"
+MAGIA = b"RTJ3\x01"
+FORMATO = "un archivo de telemetría de juego3"
+REGISTRO = struct.Struct("<qIBBx")
+SIN_PULSAR = 0xFFFFFFFF
+PRIMERA_CORRECTA = 1
+ACERTO = 2
+# Mismo orden que COLORES en juego3topos.py
+NOMBRES_COLOR = ("ROJO", "AMARILLO", "BLANCO", "AZUL")
+# Reacciones más rápidas que esto no son humanas: se anticipó o hizo trampa
+UMBRAL_ANTICIPACION_MS = 100
+
+Reaccion = namedtuple("Reaccion", "estimulo_ns reaccion_us color flags")
+
+
+def ruta_jugador(player_id, directorio=DIRECTORIO):
+    return os.path.join(directorio, f"reaccion_{player_id}.bin")
+
+
+# =========================================
+# ARCHIVOS DE SOLO-AGREGAR
+# =========================================
+# Un corte de luz a mitad de escritura deja al final un registro a medias.
+# Los lectores lo ignoran, y antes de agregar se recorta el archivo hasta
+# el último registro completo: si no, todo lo que se agregue detrás queda
+# corrido y se lee mal. fin_valido(datos) dice hasta qué byte llegan los
+# registros completos de un formato (datos empieza con la magia).
+def leer_archivo(ruta, magia, formato):
+    """Contenido de ruta, o None si no existe."""
+    try:
+        with open(ruta, "rb") as f:
+            datos = f.read()
+    except FileNotFoundError:
+        return None
+    if not datos.startswith(magia):
+        raise ValueError(f"{ruta} no es {formato}")
+    return datos
+
+
+def fin_de_registros(datos, magia, tamano):
+    """fin_valido de un formato con registros de tamano bytes."""
+    return len(magia) + (len(datos) - len(magia)) // tamano * tamano
+
+
+def abrir_para_agregar(ruta, magia, fin_valido, formato):
+    """(archivo, datos): ruta abierta para agregar, sin cola cortada.
+
+    datos son los bytes completos que ya había (con la magia).
+    """
+    directorio = os.path.dirname(ruta)
+    if directorio:
+        os.makedirs(directorio, exist_ok=True)
+    archivo = open(ruta, "a+b")
+    archivo.seek(0)
+    datos = archivo.read()
+    if datos.startswith(magia):
+        fin = fin_valido(datos)
+    elif magia.startswith(datos):
+        # Vacío, o cortado antes de terminar la magia
+        fin = 0
+    else:
+        archivo.close()
+        raise ValueError(f"{ruta} no es {formato}")
+    if fin < len(datos):
+        archivo.truncate(fin)
+        datos = datos[:fin]
+    if not fin:
+        archivo.write(magia)
+        datos = magia
+    return archivo, datos
+
+
+def jugadores_en(directorio, prefijo):
+    """PlayerID de los archivos <prefijo><PlayerID>.bin en directorio."""
+    try:
+        archivos = sorted(os.listdir(directorio))
+    except FileNotFoundError:
+        return []
+    return [a[len(prefijo):-len(".bin")] for a in archivos
+            if a.startswith(prefijo) and a.endswith(".bin")]
+
+
+def argumentos_cli(descripcion, prefijo, que):
+    """(jugadores, directorio, desde_ns) de la línea de comandos.
+
+    Sin jugadores se toman todos los del directorio con ese prefijo;
+    --ultimas-horas da desde_ns (0 es todo el historial).
+    """
+    parser = argparse.ArgumentParser(description=descripcion)
+    parser.add_argument(
+        "jugadores", nargs="*",
+        help="PlayerID (por defecto, todos los del directorio)")
+    parser.add_argument("--directorio", default=DIRECTORIO)
+    parser.add_argument("--ultimas-horas", type=float, default=None)
+    args = parser.parse_args()
+    jugadores = args.jugadores or jugadores_en(args.directorio, prefijo)
+    if not jugadores:
+        sys.exit(f"No hay {que} en {args.directorio}/")
+    desde_ns = 0
+    if args.ultimas_horas is not None:
+        desde_ns = time.time_ns() - int(args.ultimas_horas * 3600e9)
+    return jugadores, args.directorio, desde_ns
+
+
+class HistogramaReaccion:
+    """Histograma de tiempos de reacción en cubetas fijas de ancho_ms.
+
+    agregar es O(1) y los percentiles salen de las cubetas (con la
+    resolución de ancho_ms), sin guardar ni ordenar las muestras.
+    """
+
+    def __init__(self, ancho_ms=5, max_ms=2000):
+        self.ancho_ms = ancho_ms
+        self.cubetas = [0] * (max_ms // ancho_ms + 1)
+        self.total = 0
+
+    def agregar(self, reaccion_us):
+        i = min(int(reaccion_us / 1000 / self.ancho_ms), len(self.cubetas) - 1)
+        self.cubetas[i] += 1
+        self.total += 1
+
+    def percentil(self, p):
+        """Límite superior (ms) de la cubeta donde cae el percentil p."""
+        if not self.total:
+            return None
+        objetivo = self.total * p / 100
+        acumulado = 0
+        for i, cantidad in enumerate(self.cubetas):
+            acumulado += cantidad
+            if cantidad and acumulado >= objetivo:
+                return (i + 1) * self.ancho_ms
+        return len(self.cubetas) * self.ancho_ms
+
+
+class RegistroReacciones:
+    """Almacén de reacciones de un jugador (append-only).
+
+    Al abrirlo se recorre lo ya guardado para armar el histograma, y
+    cada agregar lo actualiza al vuelo.
+    """
+
+    def __init__(self, player_id, directorio=DIRECTORIO):
+        self.ruta = ruta_jugador(player_id, directorio)
+        self.histograma = HistogramaReaccion()
+        self.colores = 0
+        self.aciertos = 0
+        self.archivo, datos = abrir_para_agregar(
+            self.ruta, MAGIA, _fin_reacciones, FORMATO)
+        for r in _reacciones(datos):
+            self._contar(r)
+
+    def _contar(self, r):
+        self.colores += 1
+        if r.flags & ACERTO:
+            self.aciertos += 1
+        if r.reaccion_us != SIN_PULSAR:
+            self.histograma.agregar(r.reaccion_us)
+
+    def agregar(self, estimulo_ns, reaccion_ns, color, primera_correcta,
+                acerto):
+        """reaccion_ns es None si no se pulsó ningún botón."""
+        if reaccion_ns is None:
+            reaccion_us = SIN_PULSAR
+        else:
+            reaccion_us = min(reaccion_ns // 1000, SIN_PULSAR - 1)
+        flags = ((PRIMERA_CORRECTA if primera_correcta else 0) |
+                 (ACERTO if acerto else 0))
+        r = Reaccion(estimulo_ns, reaccion_us, color, flags)
+        self.archivo.write(REGISTRO.pack(*r))
+        self._contar(r)
+
+    def cerrar(self):
+        self.archivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+
+def _fin_reacciones(datos):
+    return fin_de_registros(datos, MAGIA, REGISTRO.size)
+
+
+def _reacciones(datos):
+    vista = memoryview(datos)[len(MAGIA):_fin_reacciones(datos)]
+    for campos in REGISTRO.iter_unpack(vista):
+        yield Reaccion(*campos)
+
+
+def leer_reacciones(ruta):
+    """Genera las Reaccion guardadas en ruta (nada si no existe)."""
+    datos = leer_archivo(ruta, MAGIA, FORMATO)
+    if datos is not None:
+        yield from _reacciones(datos)
+
+
+def resumen(ruta, desde_ns=0):
+    """Estadísticas de un jugador, opcionalmente desde un instante."""
+    reacciones = [r for r in leer_reacciones(ruta) if r.estimulo_ns >= desde_ns]
+    histograma = HistogramaReaccion()
+    por_color = {}
+    pulsadas = primera_mal = anticipadas = aciertos = 0
+    for r in reacciones:
+        color = (NOMBRES_COLOR[r.color] if r.color < len(NOMBRES_COLOR)
+                 else str(r.color))
+        aciertos += bool(r.flags & ACERTO)
+        if r.reaccion_us == SIN_PULSAR:
+            continue
+        pulsadas += 1
+        histograma.agregar(r.reaccion_us)
+        por_color.setdefault(color, HistogramaReaccion()).agregar(
+            r.reaccion_us)
+        if not r.flags & PRIMERA_CORRECTA:
+            primera_mal += 1
+        if r.reaccion_us < UMBRAL_ANTICIPACION_MS * 1000:
+            anticipadas += 1
+    return {
+        "colores": len(reacciones),
+        "aciertos": aciertos,
+        "pulsadas": pulsadas,
+        "primera_incorrecta": primera_mal,
+        "anticipadas": anticipadas,
+        "p50": histograma.percentil(50),
+        "p90": histograma.percentil(90),
+        "p99": histograma.percentil(99),
+        "histograma": histograma,
+        "por_color": {c: h.percentil(50) for c, h in por_color.items()},
+    }
+
+
+def _imprimir(player_id, r, ancho=40):
+    print(f"=== {player_id}: {r['colores']} colores, {r['aciertos']} aciertos, "
+          f"{r['pulsadas']} con pulsación")
+    if not r["pulsadas"]:
+        return
+    print(f"    p50={r['p50']} ms  p90={r['p90']} ms  p99={r['p99']} ms")
+    print(f"    primera pulsación incorrecta: {r['primera_incorrecta']}   "
+          f"< {UMBRAL_ANTICIPACION_MS} ms (sospechosas): {r['anticipadas']}")
+    print("    p50 por color: " + ", ".join(
+        f"{c} {p} ms" for c, p in sorted(r["por_color"].items())))
+    # Histograma en cubetas de 50 ms
+    h = r["histograma"]
+    juntar = 50 // h.ancho_ms
+    grupos = [sum(h.cubetas[i:i + juntar])
+              for i in range(0, len(h.cubetas), juntar)]
+    maximo = max(grupos)
+    for i, cantidad in enumerate(grupos):
+        if cantidad:
+            barra = "#" * max(1, round(ancho * cantidad / maximo))
+            print(f"    {i * 50:>5}-{(i + 1) * 50:<5} ms | {barra} {cantidad}")
+
+
+def main():
+    jugadores, directorio, desde_ns = argumentos_cli(
+        "Tiempos de reacción registrados por juego3topos.", "reaccion_",
+        "telemetría")
+    for player_id in jugadores:
+        _imprimir(player_id, resumen(ruta_jugador(player_id, directorio),
+                                     desde_ns))
+
+
+if __name__ == "__main__":
+    main()
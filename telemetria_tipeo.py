@@ -0,0 +1,257 @@
+import os
+import time
+import struct
+from array import array
+from collections import namedtuple
+
+from puntaje_tipeo import PuntajeIncremental
+from telemetria import (DIRECTORIO, HistogramaReaccion, abrir_para_agregar,
+                        argumentos_cli, leer_archivo)
+
+# =========================================
+# LÍNEA DE TIEMPO DE TECLAS (juego1letras)
+# =========================================
+# Cada tecla (incluidos los borrados y el Enter) se anota con su instante
+# time.monotonic_ns en columnas preasignadas (array), y al anotarla se
+# actualizan WPM instantáneo, precisión móvil e histograma de intervalos
+# sin crear listas ni diccionarios nuevos. Al final de la ronda todo va a
+# telemetria/tipeo_<PlayerID>.bin, un archivo de solo-agregar:
+#   MAGIA, y por ronda:
+#   cabecera    RONDA (ver abajo) + la frase objetivo en UTF-8
+#   t_us        uint32[n]  desde el inicio de la ronda
+#   tipo        uint8[n]   TECLA | BORRADO | ENTER
+#   codigo      uint32[n]  punto de código de la tecla (0 si no aplica)
+# Las columnas se escriben con tobytes() y se leen con frombytes(), así
+# que recorrer miles de rondas no decodifica registro por registro.
+MAGIA = b"TIP1\x01"
+FORMATO = "un archivo de telemetría de juego1"
+# inicio_ns (time.time_ns), n teclas, duración_us, bytes del objetivo,
+# errores, puntaje, resultado (índice en RESULTADOS)
+RONDA = struct.Struct("<qIIHHBB")
+# Solo n y bytes del objetivo, para saltar rondas sin decodificarlas
+_N_Y_LARGO = struct.Struct("<8xI4xH")
+TECLA, BORRADO, ENTER = range(3)
+RESULTADOS = ("Win", "Lose", "TimeOut")
+# WPM sobre las últimas VENTANA_WPM teclas; 5 caracteres = 1 palabra
+VENTANA_WPM = 10
+CARACTERES_POR_PALABRA = 5
+# Peso de la última tecla en la precisión móvil (~ las últimas 10)
+ALFA_PRECISION = 0.1
+ANCHO_INTERVALO_MS = 10
+MAX_INTERVALO_MS = 1000
+
+RondaTipeo = namedtuple(
+    "RondaTipeo",
+    "inicio_ns duracion_us errores puntaje resultado objetivo t_us tipos codigos")
+
+
+def ruta_jugador(player_id, directorio=DIRECTORIO):
+    return os.path.join(directorio, f"tipeo_{player_id}.bin")
+
+
+class LineaTiempoTipeo:
+    """Teclas de una ronda con sus métricas al día.
+
+    insertar/borrar/terminar encajan con los avisos de
+    entrada_teclado.EditorLinea. Las teclas que llegan en una misma
+    lectura (p. ej. texto pegado) comparten el instante.
+    """
+
+    def __init__(self, objetivo, capacidad=256):
+        self.objetivo = objetivo
+        self.puntaje = PuntajeIncremental(objetivo)
+        self.t_us = array("I", bytes(4 * capacidad))
+        self.tipos = array("B", bytes(capacidad))
+        self.codigos = array("I", bytes(4 * capacidad))
+        self.n = 0
+        self.inicio_ns = None
+        self.inicio_reloj_ns = None
+        self.fin_ns = None
+        # Métricas en vivo
+        self._recientes = array("q", bytes(8 * VENTANA_WPM))
+        self._siguiente = 0
+        self._en_ventana = 0
+        self._previa_ns = None
+        self._errores = 0
+        self.wpm = 0.0
+        self.precision = 1.0
+        self.tecleadas = 0
+        self.borrados = 0
+        self.intervalos = HistogramaReaccion(ANCHO_INTERVALO_MS,
+                                             MAX_INTERVALO_MS)
+
+    def empezar(self, t_ns=None):
+        self.inicio_ns = time.monotonic_ns() if t_ns is None else t_ns
+        self.inicio_reloj_ns = time.time_ns()
+
+    def _anotar(self, tipo, codigo, t_ns):
+        if t_ns is None:
+            t_ns = time.monotonic_ns()
+        if self.inicio_ns is None:
+            self.empezar(t_ns)
+        if self.n == len(self.tipos):
+            # Duplicar la capacidad: pocas veces por ronda, nunca por tecla
+            self.t_us.extend(self.t_us)
+            self.tipos.extend(self.tipos)
+            self.codigos.extend(self.codigos)
+        self.t_us[self.n] = max(0, t_ns - self.inicio_ns) // 1000
+        self.tipos[self.n] = tipo
+        self.codigos[self.n] = codigo
+        self.n += 1
+        if self._previa_ns is not None:
+            self.intervalos.agregar((t_ns - self._previa_ns) // 1000)
+        self._previa_ns = t_ns
+        return t_ns
+
+    def insertar(self, caracter, t_ns=None):
+        t_ns = self._anotar(TECLA, ord(caracter), t_ns)
+        self.tecleadas += 1
+        self.puntaje.agregar(caracter)
+        # Acierto si no subieron los errores contra el mejor prefijo
+        errores = self.puntaje.errores()
+        acierto = errores <= self._errores
+        self._errores = errores
+        self.precision += ALFA_PRECISION * (acierto - self.precision)
+        # WPM entre la más vieja de las últimas VENTANA_WPM teclas y esta
+        self._recientes[self._siguiente] = t_ns
+        self._siguiente = (self._siguiente + 1) % VENTANA_WPM
+        self._en_ventana = min(self._en_ventana + 1, VENTANA_WPM)
+        if self._en_ventana == VENTANA_WPM:
+            mas_vieja = self._recientes[self._siguiente]
+        else:
+            mas_vieja = self._recientes[0]
+        if t_ns > mas_vieja:
+            self.wpm = ((self._en_ventana - 1) / CARACTERES_POR_PALABRA /
+                        ((t_ns - mas_vieja) / 60e9))
+
+    def borrar(self, t_ns=None):
+        self._anotar(BORRADO, 0, t_ns)
+        self.borrados += 1
+        self.puntaje.borrar()
+        self._errores = self.puntaje.errores()
+
+    def terminar(self, t_ns=None):
+        self.fin_ns = self._anotar(ENTER, 0, t_ns)
+
+    def duracion_us(self):
+        if self.inicio_ns is None:
+            return 0
+        fin = self.fin_ns if self.fin_ns is not None else time.monotonic_ns()
+        return (fin - self.inicio_ns) // 1000
+
+    def wpm_final(self):
+        """Palabras por minuto de lo que quedó escrito en toda la ronda."""
+        minutos = self.duracion_us() / 60e6
+        if not minutos:
+            return 0.0
+        return len(self.puntaje) / CARACTERES_POR_PALABRA / minutos
+
+    def guardar(self, player_id, puntaje, resultado, directorio=DIRECTORIO):
+        """Agrega la ronda al archivo del jugador (una sola escritura)."""
+        objetivo = self.objetivo.encode("utf-8")
+        n = self.n
+        cabecera = RONDA.pack(
+            self.inicio_reloj_ns or time.time_ns(), n,
+            min(self.duracion_us(), 0xFFFFFFFF), len(objetivo),
+            min(self.puntaje.distancia(), 0xFFFF), int(puntaje),
+            RESULTADOS.index(resultado) if resultado in RESULTADOS else 0xFF)
+        datos = b"".join((cabecera, objetivo, self.t_us[:n].tobytes(),
+                          self.tipos[:n].tobytes(), self.codigos[:n].tobytes()))
+        ruta = ruta_jugador(player_id, directorio)
+        archivo, _ = abrir_para_agregar(ruta, MAGIA, _fin_rondas, FORMATO)
+        with archivo:
+            archivo.write(datos)
+        return ruta
+
+
+def _fin_rondas(datos):
+    """Fin de la última ronda completa: salta de cabecera en cabecera."""
+    pos = len(MAGIA)
+    while pos + RONDA.size <= len(datos):
+        n, largo = _N_Y_LARGO.unpack_from(datos, pos)
+        fin = pos + RONDA.size + largo + 9 * n
+        if fin > len(datos):
+            break
+        pos = fin
+    return pos
+
+
+def leer_rondas(ruta):
+    """Genera las RondaTipeo guardadas en ruta (nada si no existe)."""
+    datos = leer_archivo(ruta, MAGIA, FORMATO)
+    if datos is None:
+        return
+    vista = memoryview(datos)
+    pos = len(MAGIA)
+    fin = _fin_rondas(vista)
+    while pos < fin:
+        (inicio_ns, n, duracion_us, largo, errores, puntaje,
+         resultado) = RONDA.unpack_from(vista, pos)
+        pos += RONDA.size
+        objetivo = bytes(vista[pos:pos + largo]).decode("utf-8", "replace")
+        pos += largo
+        t_us = array("I")
+        t_us.frombytes(vista[pos:pos + 4 * n])
+        pos += 4 * n
+        tipos = array("B")
+        tipos.frombytes(vista[pos:pos + n])
+        pos += n
+        codigos = array("I")
+        codigos.frombytes(vista[pos:pos + 4 * n])
+        pos += 4 * n
+        yield RondaTipeo(inicio_ns, duracion_us, errores, puntaje,
+                         RESULTADOS[resultado] if resultado < len(RESULTADOS)
+                         else "?", objetivo, t_us, tipos, codigos)
+
+
+def resumen(ruta, desde_ns=0):
+    """Estadísticas de un jugador, opcionalmente desde un instante."""
+    intervalos = HistogramaReaccion(ANCHO_INTERVALO_MS, MAX_INTERVALO_MS)
+    rondas = teclas = borrados = 0
+    puntajes = wpm = 0.0
+    for r in leer_rondas(ruta):
+        if r.inicio_ns < desde_ns:
+            continue
+        rondas += 1
+        puntajes += r.puntaje
+        n_teclas = r.tipos.count(TECLA)
+        n_borrados = r.tipos.count(BORRADO)
+        teclas += n_teclas
+        borrados += n_borrados
+        if r.duracion_us:
+            wpm += ((n_teclas - n_borrados) / CARACTERES_POR_PALABRA /
+                    (r.duracion_us / 60e6))
+        previo = None
+        for t in r.t_us:
+            if previo is not None:
+                intervalos.agregar(t - previo)
+            previo = t
+    return {
+        "rondas": rondas,
+        "puntaje_medio": puntajes / rondas if rondas else None,
+        "wpm_medio": wpm / rondas if rondas else None,
+        "teclas": teclas,
+        "borrados_cada_100": 100 * borrados / teclas if teclas else None,
+        "intervalo_p50": intervalos.percentil(50),
+        "intervalo_p90": intervalos.percentil(90),
+    }
+
+
+def main():
+    jugadores, directorio, desde_ns = argumentos_cli(
+        "Teclas registradas por juego1letras.", "tipeo_",
+        "telemetría de tipeo")
+    for player_id in jugadores:
+        r = resumen(ruta_jugador(player_id, directorio), desde_ns)
+        print(f"=== {player_id}: {r['rondas']} rondas, {r['teclas']} teclas")
+        if not r["rondas"]:
+            continue
+        print(f"    puntaje medio {r['puntaje_medio']:.1f}  "
+              f"WPM medio {r['wpm_medio']:.1f}  "
+              f"borrados cada 100 teclas {r['borrados_cada_100'] or 0:.1f}")
+        print(f"    entre teclas: p50 {r['intervalo_p50']} ms  "
+              f"p90 {r['intervalo_p90']} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from bitacora import parsear_linea  # noqa: E402
+
+
+def test_linea_con_timestamp_de_jugador():
+    # Los jugadores escriben "%Y-%m-%d %H:%M:%S", con un espacio adentro
+    linea = ('2024-01-01 12:30:05 {"stage": "ScoreSteal", "PlayerID": 2, '
+             '"Score": 70}\n')
+    assert parsear_linea(linea) == {"stage": "ScoreSteal", "PlayerID": 2,
+                                    "Score": 70}
+
+
+def test_linea_con_timestamp_sin_espacios():
+    linea = '2024-01-01T12:30:05 {"stage": "Lobby", "Action": "Accepted"}'
+    assert parsear_linea(linea) == {"stage": "Lobby", "Action": "Accepted"}
+
+
+def test_lineas_que_no_aplican():
+    assert parsear_linea("") is None
+    assert parsear_linea("# comentario {}") is None
+    assert parsear_linea("2024-01-01 12:30:05 sin json") is None
+    assert parsear_linea("2024-01-01 12:30:05 {roto") is None
+    assert parsear_linea("2024-01-01 12:30:05 [1, 2]") is None
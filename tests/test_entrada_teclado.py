@@ -0,0 +1,79 @@
+import os
+import sys
+import fcntl
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+import entrada_teclado  # noqa: E402
+from entrada_teclado import _escribir_todo  # noqa: E402
+
+
+def llenar(fd):
+    """Escribe en fd (no bloqueante) hasta que no entra más."""
+    escritos = 0
+    while True:
+        try:
+            escritos += os.write(fd, b"x" * 4096)
+        except BlockingIOError:
+            return escritos
+
+
+def test_escribir_todo_con_el_pipe_lleno(monkeypatch):
+    lectura, escritura = os.pipe()
+    flags = fcntl.fcntl(escritura, fcntl.F_GETFL)
+    fcntl.fcntl(escritura, fcntl.F_SETFL, flags | os.O_NONBLOCK)
+    previos = llenar(escritura)
+    datos = bytes(range(256)) * 1000
+
+    bloqueos = []
+    bloqueado = threading.Event()
+    write = os.write
+
+    def write_contando(fd, b):
+        try:
+            return write(fd, b)
+        except BlockingIOError:
+            bloqueos.append(fd)
+            bloqueado.set()
+            raise
+    monkeypatch.setattr(entrada_teclado.os, "write", write_contando)
+
+    recibidos = []
+
+    def lector():
+        # Se vacía recién cuando la escritura ya encontró el pipe lleno
+        bloqueado.wait(5)
+        while True:
+            bloque = os.read(lectura, 65536)
+            if not bloque:
+                return
+            recibidos.append(bloque)
+    hilo = threading.Thread(target=lector)
+    hilo.start()
+    try:
+        _escribir_todo(escritura, datos)
+    finally:
+        os.close(escritura)
+        hilo.join()
+        os.close(lectura)
+
+    assert bloqueos
+    todo = b"".join(recibidos)
+    assert todo[:previos] == b"x" * previos
+    assert todo[previos:] == datos
+
+
+def test_editor_descarta_secuencias_de_escape():
+    editor = entrada_teclado.EditorLinea()
+    # Flecha izquierda (CSI), F1 (SS3) y una CSI con parámetros
+    eco = editor.alimentar("a\x1b[Db\x1bOPc\x1b[1;5Cd")
+    assert editor.texto == "abcd"
+    assert eco == "abcd"
+
+
+def test_editor_esc_suelto_no_se_come_la_tecla_siguiente():
+    editor = entrada_teclado.EditorLinea()
+    editor.alimentar("ho\x1b")
+    editor.alimentar("la\n")
+    assert editor.texto == "hola"
+    assert editor.terminado
@@ -0,0 +1,85 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from muestreo_sensor import (MuestreadorSensor, _k_intervalo,  # noqa: E402
+                             intervalo_mediana, medir_adaptativo,
+                             periodo_muestreo)
+
+
+class RelojFalso:
+    """monotonic avanza 60 ms por lectura, sin dormir."""
+
+    def __init__(self):
+        self.t = 0.0
+
+    def monotonic(self):
+        return self.t
+
+
+def lector(valores, reloj):
+    valores = iter(valores)
+
+    def leer():
+        reloj.t += 0.06
+        return next(valores, None)
+    return leer
+
+
+def test_intervalo_por_estadisticos_de_orden():
+    # Con 5 muestras [x(1), x(5)] cubre la mediana con 1 - 2/32 = 0.94
+    assert _k_intervalo(4, 0.9) == 0
+    assert _k_intervalo(5, 0.9) == 1
+    assert intervalo_mediana([1.0, 2.0, 3.0, 4.0], 0.9) is None
+    assert intervalo_mediana([1.0, 2.0, 3.0, 4.0, 5.0], 0.9) == (1.0, 5.0)
+
+
+def test_mano_quieta_corta_en_cinco_muestras():
+    reloj = RelojFalso()
+    medicion = medir_adaptativo(
+        lector([42.0, 42.3, 41.8, 42.1, 41.9, 42.2], reloj), reloj=reloj)
+    assert medicion.muestras == 5
+    assert medicion.distancia == 42.0
+    assert medicion.incertidumbre <= 1.0
+
+
+def test_lectura_constante_cuenta_cada_muestra():
+    # Sin nada delante gpiozero devuelve exactamente max_distance (200 cm)
+    reloj = RelojFalso()
+    medicion = medir_adaptativo(lector([200.0] * 30, reloj), reloj=reloj)
+    assert medicion == (200.0, 0.0, 5, medicion.segundos)
+    assert medicion.segundos < 0.8
+
+
+class SensorFijo:
+    max_distance = 2.0
+    distance = 2.0
+
+
+def test_muestreador_con_lectura_constante():
+    muestreador = MuestreadorSensor(SensorFijo())
+    for _ in range(7):
+        muestreador.agregar(42.0)
+    # La mano se fue: lecturas iguales al tope, que primero son atípicas
+    # y después de max_rechazos reinician la ventana
+    for _ in range(3):
+        muestreador.agregar(200.0)
+    assert muestreador.distancia() == 200.0
+    aceptadas = muestreador.aceptadas
+    for _ in range(5):
+        assert muestreador.agregar(200.0)
+    assert muestreador.aceptadas == aceptadas + 5
+
+
+def test_muestreador_no_descarta_repetidas_del_sensor():
+    with MuestreadorSensor(SensorFijo()) as muestreador:
+        lecturas = [muestreador.siguiente_lectura(timeout=1) for _ in range(3)]
+    assert lecturas == [200.0] * 3
+
+
+def test_periodo_cubre_el_ciclo_de_gpiozero():
+    # 60 ms de sample_wait más ida y vuelta del ping a 2 m (~11.7 ms)
+    assert abs(periodo_muestreo(2.0) - 0.0717) < 1e-3
+    assert abs(periodo_muestreo(2.0, sensores=3) - 0.095) < 1e-3
+    assert MuestreadorSensor(SensorFijo()).periodo == periodo_muestreo(2.0)
+    assert MuestreadorSensor(SensorFijo(), periodo=0.01).periodo == 0.06
@@ -0,0 +1,36 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from telemetria import (ACERTO, MAGIA, REGISTRO,  # noqa: E402
+                        PRIMERA_CORRECTA, Reaccion, RegistroReacciones,
+                        leer_reacciones, ruta_jugador)
+
+AMBAS = PRIMERA_CORRECTA | ACERTO
+
+
+def test_agregar_tras_un_registro_cortado(tmp_path):
+    with RegistroReacciones(1, tmp_path) as registro:
+        registro.agregar(1000, 250000000, 2, True, True)
+        registro.agregar(2000, 300000000, 1, True, True)
+    ruta = ruta_jugador(1, tmp_path)
+    # Corte de luz a mitad del segundo registro
+    with open(ruta, "r+b") as f:
+        f.truncate(len(MAGIA) + REGISTRO.size + 6)
+
+    with RegistroReacciones(1, tmp_path) as registro:
+        assert registro.colores == 1
+        registro.agregar(3000, 350000000, 0, True, False)
+    assert os.path.getsize(ruta) == len(MAGIA) + 2 * REGISTRO.size
+    assert list(leer_reacciones(ruta)) == [
+        Reaccion(1000, 250000, 2, AMBAS),
+        Reaccion(3000, 350000, 0, PRIMERA_CORRECTA)]
+
+
+def test_magia_cortada(tmp_path):
+    ruta = ruta_jugador(1, tmp_path)
+    with open(ruta, "wb") as f:
+        f.write(MAGIA[:2])
+    with RegistroReacciones(1, tmp_path) as registro:
+        registro.agregar(1000, 250000000, 2, True, True)
+    assert list(leer_reacciones(ruta)) == [Reaccion(1000, 250000, 2, AMBAS)]
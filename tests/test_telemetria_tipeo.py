@@ -0,0 +1,28 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from telemetria_tipeo import LineaTiempoTipeo, leer_rondas  # noqa: E402
+
+
+def ronda(objetivo, texto):
+    linea = LineaTiempoTipeo(objetivo)
+    linea.empezar(0)
+    for i, caracter in enumerate(texto):
+        linea.insertar(caracter, (i + 1) * 100_000_000)
+    linea.terminar((len(texto) + 1) * 100_000_000)
+    return linea
+
+
+def test_agregar_tras_una_ronda_cortada(tmp_path):
+    ruta = ronda("hola", "hola").guardar(1, 10, "Win", tmp_path)
+    ronda("mundo entero", "mundo").guardar(1, 3, "Lose", tmp_path)
+    # Corte de luz a mitad de la segunda ronda, dentro de sus columnas
+    with open(ruta, "r+b") as f:
+        f.truncate(os.path.getsize(ruta) - 7)
+
+    ronda("adiós", "adiós").guardar(1, 10, "Win", tmp_path)
+    rondas = list(leer_rondas(ruta))
+    assert [(r.objetivo, r.puntaje, r.resultado) for r in rondas] == [
+        ("hola", 10, "Win"), ("adiós", 10, "Win")]
+    assert rondas[1].codigos.tolist() == [ord(c) for c in "adiós"] + [0]
@@ -0,0 +1,41 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from bitacora import estado_host  # noqa: E402
+from transporte import ClienteHost, ServidorHost  # noqa: E402
+
+
+def test_espejo_atrasado_no_pisa_lo_empujado(tmp_path):
+    ruta = str(tmp_path / "game_status.log")
+    servidor = ServidorHost(f"unix:{tmp_path / 'host.sock'}", ruta,
+                            str(tmp_path / "player_events_host.log"))
+    servidor.servir_en_hilo()
+    cliente = ClienteHost(servidor.direccion, ruta)
+    try:
+        servidor.asignar("R1", 1)
+        # El Assign de R2 llega por el socket antes que al espejo
+        escribir = servidor.log_estado.escribir
+        atrasados = []
+        servidor.log_estado.escribir = (
+            lambda payload, **kw: atrasados.append((payload, kw)))
+        servidor.asignar("R2", 2)
+        visto = 0
+        while cliente.estado.asignacion != ("R2", 2):
+            visto = cliente.esperar_mensaje(visto, 5)
+        # El archivo termina en R1, pero releerlo no vuelve atrás
+        assert estado_host(ruta).asignacion == ("R2", 2)
+        for payload, kw in atrasados:
+            escribir(payload, **kw)
+        servidor.log_estado.escribir = escribir
+    finally:
+        cliente.cerrar()
+        cliente._hilo.join(5)
+    try:
+        # Sin socket se vuelve a seguir el archivo
+        assert estado_host(ruta).asignacion == ("R2", 2)
+        servidor.log_estado.escribir(
+            {"stage": "R3", "Action": "Assign", "GameID": 3}, confirmar=True)
+        assert estado_host(ruta).asignacion == ("R3", 3)
+    finally:
+        servidor.detener()
@@ -0,0 +1,25 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from trazas_gpio import (BOTON, MAGIA, REGISTRO,  # noqa: E402
+                         GrabadorTraza, leer_traza)
+
+
+def test_grabar_tras_un_registro_cortado(tmp_path):
+    ruta = str(tmp_path / "traza.bin")
+    grabador = GrabadorTraza(ruta)
+    grabador.iniciar(7)
+    grabador.agregar(BOTON, 17, 1.0)
+    grabador.cerrar()
+    # Corte de luz a mitad del registro del botón
+    with open(ruta, "r+b") as f:
+        f.truncate(len(MAGIA) + REGISTRO.size + 4)
+
+    grabador = GrabadorTraza(ruta)
+    grabador.iniciar(8)
+    grabador.agregar(BOTON, 27, 0.0)
+    grabador.cerrar()
+    rondas = leer_traza(ruta)
+    assert [(r.semilla, len(r.eventos)) for r in rondas] == [(7, 0), (8, 1)]
+    assert rondas[1].eventos[0][1:] == (BOTON, 27, 0.0)
@@ -0,0 +1,328 @@
+import os
+import sys
+import json
+import socket
+import threading
+import time
+from bitacora import VigilanteArchivo, EstadoHost, estado_host
+from escritor_eventos import EscritorEventos
+
+# =========================================
+# TRANSPORTE POR SOCKET HOST <-> JUGADORES
+# =========================================
+# Mismos payloads JSON que en los logs, uno por línea, sobre un socket
+# Unix ("unix:/tmp/minijuegos.sock") o TCP local ("tcp:127.0.0.1:5050").
+# Es opcional: sin dirección los juegos siguen usando solo los archivos,
+# y con ella los archivos se siguen escribiendo como espejo. La dirección
+# sale de la variable de entorno HOST_SOCKET.
+VARIABLE_DIRECCION = "HOST_SOCKET"
+
+
+def parsear_direccion(texto):
+    """'unix:/ruta' o 'tcp:host:puerto' -> (familia, dirección)."""
+    tipo, _, resto = texto.partition(":")
+    if tipo == "unix" and resto:
+        return socket.AF_UNIX, resto
+    if tipo == "tcp":
+        host, _, puerto = resto.rpartition(":")
+        if puerto.isdigit():
+            return socket.AF_INET, (host or "127.0.0.1", int(puerto))
+    raise ValueError(f"Dirección de host inválida: {texto!r}")
+
+
+def _abrir_socket(familia):
+    sock = socket.socket(familia, socket.SOCK_STREAM)
+    if familia == socket.AF_INET:
+        # Mensajes cortos: sin Nagle cada payload sale en cuanto se envía
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    return sock
+
+
+def _mensaje(payload):
+    return (json.dumps(payload) + "\n").encode()
+
+
+def _leer_mensajes(sock):
+    """Genera los payloads que llegan por sock hasta que se cierra."""
+    archivo = sock.makefile("rb")
+    for linea in archivo:
+        try:
+            payload = json.loads(linea)
+        except ValueError:
+            continue
+        if isinstance(payload, dict):
+            yield payload
+
+
+# =========================================
+# CLIENTE (lado del jugador)
+# =========================================
+class ClienteHost:
+    """Conexión del jugador al host.
+
+    Lo que el host empuja (Accepted, Assign, Sabotage) se aplica al
+    EstadoHost compartido de ruta_estado, así leer_ultimo_sabotaje y
+    compañía lo ven sin esperar a que aparezca en game_status.log.
+    Mientras dura la conexión ese EstadoHost no relee el archivo.
+    """
+
+    def __init__(self, direccion, ruta_estado, timeout_conexion=2.0):
+        familia, destino = parsear_direccion(direccion)
+        self.sock = _abrir_socket(familia)
+        self.sock.settimeout(timeout_conexion)
+        self.sock.connect(destino)
+        self.sock.settimeout(None)
+        self.estado = estado_host(ruta_estado)
+        self.estado.cliente = self
+        self.cond = threading.Condition()
+        self.recibidos = 0
+        self.conectado = True
+        self._lock_envio = threading.Lock()
+        self._hilo = threading.Thread(target=self._recibir,
+                                      name="cliente-host", daemon=True)
+        self._hilo.start()
+
+    def _recibir(self):
+        try:
+            for payload in _leer_mensajes(self.sock):
+                with self.estado.lock:
+                    self.estado.aplicar(payload)
+                with self.cond:
+                    self.recibidos += 1
+                    self.cond.notify_all()
+        except OSError:
+            pass
+        with self.estado.lock:
+            if self.estado.cliente is self:
+                self.estado.cliente = None
+        with self.cond:
+            self.conectado = False
+            self.cond.notify_all()
+
+    def enviar(self, payload):
+        if not self.conectado:
+            return False
+        try:
+            with self._lock_envio:
+                self.sock.sendall(_mensaje(payload))
+        except OSError:
+            self.conectado = False
+            return False
+        return True
+
+    def esperar_mensaje(self, desde, timeout):
+        """Espera a que recibidos supere desde; devuelve el valor actual."""
+        with self.cond:
+            self.cond.wait_for(
+                lambda: self.recibidos > desde or not self.conectado, timeout)
+            return self.recibidos
+
+    def cerrar(self):
+        self.conectado = False
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
+
+
+class EsperaCliente:
+    """Misma interfaz que VigilanteArchivo, pero despierta con el socket."""
+
+    def __init__(self, cliente):
+        self.cliente = cliente
+        self.visto = cliente.recibidos
+
+    def esperar(self, timeout):
+        if not self.cliente.conectado:
+            time.sleep(timeout)
+            return False
+        actual = self.cliente.esperar_mensaje(self.visto, timeout)
+        cambio = actual > self.visto
+        self.visto = actual
+        return cambio
+
+    def cerrar(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+
+_clientes = {}
+
+
+def conectar_host(ruta_estado, escritor=None, direccion=None):
+    """Conecta (una vez) con el host si hay dirección; si no, devuelve None.
+
+    direccion es por defecto la de HOST_SOCKET. Con escritor, todo lo que
+    el jugador registre se envía además por el socket. Si el host no
+    responde se sigue solo con los archivos.
+    """
+    if direccion is None:
+        direccion = os.environ.get(VARIABLE_DIRECCION)
+    if not direccion:
+        return None
+    clave = os.path.normpath(ruta_estado)
+    cliente = _clientes.get(clave)
+    if cliente is not None and cliente.conectado:
+        return cliente
+    try:
+        cliente = ClienteHost(direccion, ruta_estado)
+    except (OSError, ValueError) as e:
+        print(f"⚠️ No se pudo conectar al host en {direccion} ({e}); "
+              "se usan solo los logs.")
+        return None
+    _clientes[clave] = cliente
+    if escritor is not None:
+        escritor.transporte = cliente
+    print(f"🔌 Conectado al host en {direccion}")
+    return cliente
+
+
+def abrir_espera(ruta_estado):
+    """Objeto con esperar(timeout): el socket si hay conexión, si no inotify."""
+    cliente = _clientes.get(os.path.normpath(ruta_estado))
+    if cliente is not None and cliente.conectado:
+        return EsperaCliente(cliente)
+    return VigilanteArchivo(ruta_estado)
+
+
+# =========================================
+# SERVIDOR DE REFERENCIA (lado del host)
+# =========================================
+class ServidorHost:
+    """Host mínimo para pruebas locales.
+
+    Acepta los Join (si aceptar_automatico), reenvía Assign/Sabotage a
+    todos los jugadores conectados y deja espejo en archivos: lo que emite
+    va a ruta_estado (game_status.log) y lo que recibe a ruta_jugadores.
+    Un jugador que se conecta tarde recibe primero el estado compactado.
+    """
+
+    def __init__(self, direccion, ruta_estado="game_status.log",
+                 ruta_jugadores="player_events_host.log",
+                 aceptar_automatico=True):
+        self.direccion = direccion
+        familia, self.destino = parsear_direccion(direccion)
+        if familia == socket.AF_UNIX and os.path.exists(self.destino):
+            os.remove(self.destino)
+        self.sock = _abrir_socket(familia)
+        if familia == socket.AF_INET:
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.sock.bind(self.destino)
+        self.sock.listen()
+        self.familia = familia
+        self.aceptar_automatico = aceptar_automatico
+        self.estado = EstadoHost(ruta_estado).actualizar()
+        self.log_estado = EscritorEventos(ruta_estado, politica="inmediata")
+        self.log_jugadores = EscritorEventos(ruta_jugadores)
+        self.clientes = []
+        self.lock = threading.Lock()
+        self.activo = True
+
+    def servir(self):
+        while self.activo:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                break
+            if self.familia == socket.AF_INET:
+                conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            with self.lock:
+                # Estado actual primero, para quien se conecta tarde
+                for payload in self.estado.registros_compactados():
+                    conn.sendall(_mensaje(payload))
+                self.clientes.append(conn)
+            threading.Thread(target=self._atender, args=(conn,),
+                             daemon=True).start()
+
+    def servir_en_hilo(self):
+        hilo = threading.Thread(target=self.servir, name="servidor-host",
+                                daemon=True)
+        hilo.start()
+        return hilo
+
+    def _atender(self, conn):
+        try:
+            for payload in _leer_mensajes(conn):
+                self.log_jugadores.escribir(payload)
+                if (self.aceptar_automatico and
+                        payload.get("stage") == "Lobby" and
+                        payload.get("Action") == "Join"):
+                    self.emitir({"stage": "Lobby",
+                                 "PlayerID": payload.get("PlayerID"),
+                                 "Action": "Accepted"})
+        except OSError:
+            pass
+        with self.lock:
+            if conn in self.clientes:
+                self.clientes.remove(conn)
+        conn.close()
+
+    def emitir(self, payload):
+        """Envía payload a todos los jugadores y lo deja en game_status.log."""
+        mensaje = _mensaje(payload)
+        with self.lock:
+            self.estado.aplicar(payload)
+            for conn in list(self.clientes):
+                try:
+                    conn.sendall(mensaje)
+                except OSError:
+                    self.clientes.remove(conn)
+        self.log_estado.escribir(payload, confirmar=True)
+
+    def asignar(self, stage, game_id):
+        self.emitir({"stage": stage, "Action": "Assign", "GameID": game_id})
+
+    def sabotear(self, stage, effect, value=None):
+        self.emitir({"stage": stage, "Action": "Sabotage",
+                     "Effect": effect, "Value": value})
+
+    def detener(self):
+        self.activo = False
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
+        with self.lock:
+            for conn in self.clientes:
+                conn.close()
+            self.clientes = []
+        if self.familia == socket.AF_UNIX and os.path.exists(self.destino):
+            os.remove(self.destino)
+        self.log_estado.cerrar()
+        self.log_jugadores.cerrar()
+
+
+if __name__ == "__main__":
+    # python transporte.py unix:/tmp/minijuegos.sock
+    # Comandos: asignar <stage> <GameID> | sabotear <stage> <Effect> [Value] | salir
+    direccion = sys.argv[1] if len(sys.argv) > 1 else "unix:/tmp/minijuegos.sock"
+    servidor = ServidorHost(direccion)
+    servidor.servir_en_hilo()
+    print(f"🖥️ Host escuchando en {direccion} (Join se acepta automáticamente)")
+    try:
+        for comando in sys.stdin:
+            partes = comando.split()
+            if not partes:
+                continue
+            if partes[0] == "salir":
+                break
+            if partes[0] == "asignar" and len(partes) == 3:
+                servidor.asignar(partes[1], int(partes[2]))
+            elif partes[0] == "sabotear" and len(partes) in (3, 4):
+                valor = partes[3] if len(partes) == 4 else None
+                servidor.sabotear(partes[1], partes[2],
+                                  int(valor) if valor and valor.isdigit() else valor)
+            else:
+                print("Comandos: asignar <stage> <GameID> | "
+                      "sabotear <stage> <Effect> [Value] | salir")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.detener()
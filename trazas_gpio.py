@@ -0,0 +1,433 @@
+import os
+import sys
+import time
+import heapq
+import queue
+import random
+import struct
+import atexit
+import bisect
+import argparse
+import threading
+from collections import namedtuple
+
+from telemetria import abrir_para_agregar, fin_de_registros
+
+# =========================================
+# HARDWARE INTERCAMBIABLE: REAL, GRABACIÓN Y REPRODUCCIÓN
+# =========================================
+# juego3 y juego4 piden sus botones, LED y sensores a hardware() en lugar
+# de crear los objetos de gpiozero directamente. Según GPIO_BACKEND:
+#   real                  gpiozero tal cual (por defecto)
+#   grabar:<ruta>         gpiozero, y además guarda en <ruta> los flancos de
+#                         los botones y cada lectura de los sensores
+#   reproducir:<ruta>     pines simulados (MockFactory de gpiozero) que
+#                         repiten la traza en tiempo real
+#   reproducir-max:<ruta> igual pero con un reloj virtual: las esperas del
+#                         juego no duermen y la ronda corre a toda velocidad
+#
+# La traza es binaria, de solo-agregar, con un registro de 10 bytes:
+#   t_us    uint32   desde el inicio de la ronda
+#   tipo    uint8    INICIO | BOTON | SENSOR | SINCRONIA
+#   canal   uint8    pin del botón / pin echo del sensor
+#   valor   float32  1/0 pulsado/suelto, distancia en metros, semilla
+# Cada ronda empieza con un INICIO que guarda la semilla de `random`, así
+# al reproducirla el juego elige los mismos colores y objetivos.
+MAGIA = b"TGP1"
+FORMATO = "una traza de GPIO"
+REGISTRO = struct.Struct("<IBBf")
+INICIO, BOTON, SENSOR, SINCRONIA = range(4)
+
+Evento = namedtuple("Evento", "t_ns tipo canal valor")
+Ronda = namedtuple("Ronda", "semilla eventos")
+
+
+class GrabadorTraza:
+    """Escribe eventos en la traza; agregar se puede llamar desde cualquier hilo."""
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self.archivo, _ = abrir_para_agregar(ruta, MAGIA, _fin_traza, FORMATO)
+        self.t0_ns = None
+        self._lock = threading.Lock()
+
+    def iniciar(self, semilla):
+        with self._lock:
+            self.t0_ns = time.monotonic_ns()
+            self.archivo.write(REGISTRO.pack(0, INICIO, 0, semilla))
+
+    def agregar(self, tipo, canal, valor):
+        # Lo anterior al primer INICIO no pertenece a ninguna ronda
+        if self.t0_ns is None or valor is None:
+            return
+        with self._lock:
+            t_us = (time.monotonic_ns() - self.t0_ns) // 1000
+            self.archivo.write(REGISTRO.pack(t_us, tipo, canal, valor))
+
+    def cerrar(self):
+        with self._lock:
+            if not self.archivo.closed:
+                self.archivo.close()
+
+
+def _fin_traza(datos):
+    return fin_de_registros(datos, MAGIA, REGISTRO.size)
+
+
+def leer_traza(ruta):
+    """Lista de Ronda con sus eventos en orden de tiempo."""
+    with open(ruta, "rb") as f:
+        datos = f.read()
+    if not datos.startswith(MAGIA):
+        raise ValueError(f"{ruta} no es {FORMATO}")
+    cuerpo = memoryview(datos)[len(MAGIA):_fin_traza(datos)]
+    rondas = []
+    for t_us, tipo, canal, valor in REGISTRO.iter_unpack(cuerpo):
+        if tipo == INICIO:
+            rondas.append(Ronda(int(valor), []))
+        elif rondas:
+            rondas[-1].eventos.append(Evento(t_us * 1000, tipo, canal, valor))
+    for ronda in rondas:
+        ronda.eventos.sort(key=lambda e: e.t_ns)
+    return rondas
+
+
+# =========================================
+# RELOJ VIRTUAL
+# =========================================
+class RelojVirtual:
+    """Mismas funciones que `time` que usan los juegos, sin dormir.
+
+    sleep avanza el tiempo de inmediato ejecutando, en orden, las acciones
+    programadas que caen en el medio (p. ej. pulsar un botón simulado).
+    Pensado para un solo hilo de juego.
+    """
+
+    def __init__(self):
+        self.ahora_ns = 0
+        self.epoca_ns = time.time_ns()
+        self._programadas = []
+        self._orden = 0
+
+    def monotonic_ns(self):
+        return self.ahora_ns
+
+    def monotonic(self):
+        return self.ahora_ns / 1e9
+
+    perf_counter = monotonic
+
+    def time_ns(self):
+        return self.epoca_ns + self.ahora_ns
+
+    def time(self):
+        return self.time_ns() / 1e9
+
+    def programar(self, t_ns, accion):
+        heapq.heappush(self._programadas, (t_ns, self._orden, accion))
+        self._orden += 1
+
+    def proxima_ns(self):
+        return self._programadas[0][0] if self._programadas else None
+
+    def avanzar_hasta(self, t_ns):
+        while self._programadas and self._programadas[0][0] <= t_ns:
+            t_accion, _, accion = heapq.heappop(self._programadas)
+            self.ahora_ns = max(self.ahora_ns, t_accion)
+            accion()
+        self.ahora_ns = max(self.ahora_ns, t_ns)
+
+    def sleep(self, segundos):
+        self.avanzar_hasta(self.ahora_ns + int(max(0, segundos) * 1e9))
+
+
+class ColaVirtual(queue.Queue):
+    """Queue cuyo get con espera avanza el RelojVirtual en lugar de bloquear."""
+
+    def __init__(self, reloj):
+        super().__init__()
+        self.reloj = reloj
+
+    def get(self, block=True, timeout=None):
+        if block:
+            limite = (None if timeout is None
+                      else self.reloj.ahora_ns + int(timeout * 1e9))
+            while self.empty():
+                proxima = self.reloj.proxima_ns()
+                if proxima is None or (limite is not None and proxima > limite):
+                    if limite is not None:
+                        self.reloj.avanzar_hasta(limite)
+                    break
+                self.reloj.avanzar_hasta(proxima)
+        return super().get(block=False)
+
+
+# =========================================
+# BACKENDS
+# =========================================
+class HardwareReal:
+    """gpiozero sin intermediarios."""
+
+    tiempo_real = True
+    reloj = time
+
+    def cola(self):
+        return queue.Queue()
+
+    def boton(self, pin, al_pulsar, **kwargs):
+        from gpiozero import Button
+        boton = Button(pin, **kwargs)
+        boton.when_pressed = al_pulsar
+        return boton
+
+    def led_rgb(self, *pines, **kwargs):
+        from gpiozero import RGBLED
+        return RGBLED(*pines, **kwargs)
+
+    def sensor_distancia(self, echo, trigger, **kwargs):
+        from gpiozero import DistanceSensor
+        return DistanceSensor(echo=echo, trigger=trigger, **kwargs)
+
+    def iniciar(self):
+        """Empieza una ronda (grabación: nueva semilla en la traza)."""
+
+    def sincronizar(self):
+        """Marca el instante desde el que importan las lecturas (p. ej. ENTER)."""
+
+    def cerrar(self):
+        pass
+
+
+class SensorGrabado:
+    """Envuelve un DistanceSensor y guarda cada lectura de distance."""
+
+    def __init__(self, sensor, traza, canal):
+        self.sensor = sensor
+        self.traza = traza
+        self.canal = canal
+
+    @property
+    def distance(self):
+        d = self.sensor.distance
+        self.traza.agregar(SENSOR, self.canal, d)
+        return d
+
+    def __getattr__(self, nombre):
+        return getattr(self.sensor, nombre)
+
+
+class HardwareGrabacion(HardwareReal):
+    """gpiozero real que además deja una traza para reproducir después."""
+
+    def __init__(self, ruta):
+        self.traza = GrabadorTraza(ruta)
+        atexit.register(self.cerrar)
+
+    def boton(self, pin, al_pulsar, **kwargs):
+        def pulsado(boton):
+            self.traza.agregar(BOTON, pin, 1)
+            al_pulsar(boton)
+
+        boton = super().boton(pin, pulsado, **kwargs)
+        boton.when_released = lambda: self.traza.agregar(BOTON, pin, 0)
+        return boton
+
+    def sensor_distancia(self, echo, trigger, **kwargs):
+        return SensorGrabado(super().sensor_distancia(echo, trigger, **kwargs),
+                             self.traza, echo)
+
+    def iniciar(self):
+        semilla = random.randrange(1 << 24)  # exacta en float32
+        random.seed(semilla)
+        self.traza.iniciar(semilla)
+
+    def sincronizar(self):
+        self.traza.agregar(SINCRONIA, 0, 0)
+
+    def cerrar(self):
+        self.traza.cerrar()
+
+
+class SensorReproducido:
+    """distance es la última lectura grabada hasta el instante actual."""
+
+    def __init__(self, hardware, canal, max_distance=1):
+        self.hardware = hardware
+        self.canal = canal
+        self.max_distance = max_distance
+        self.closed = False
+
+    @property
+    def distance(self):
+        d = self.hardware.lectura(self.canal)
+        # Sin lecturas grabadas, como gpiozero sin nada delante
+        return self.max_distance if d is None else d
+
+    def close(self):
+        self.closed = True
+
+
+class HardwareReproduccion(HardwareReal):
+    """Repite una traza sobre los pines simulados de gpiozero.
+
+    Los botones y el LED son objetos reales de gpiozero sobre MockFactory
+    y las pulsaciones se producen manejando el pin, así que pasan por los
+    mismos callbacks que en la Raspberry. Los sensores devuelven las
+    lecturas grabadas (el eco del HC-SR04 no se simula).
+    """
+
+    def __init__(self, ruta, maxima=False):
+        from gpiozero import Device
+        from gpiozero.pins.mock import MockFactory, MockPWMPin
+        self.rondas = leer_traza(ruta)
+        if not self.rondas:
+            raise ValueError(f"{ruta} no tiene rondas grabadas")
+        Device.pin_factory = MockFactory(pin_class=MockPWMPin)
+        self.tiempo_real = not maxima
+        self.reloj = RelojVirtual() if maxima else time
+        self.indice = -1
+        self.t0_ns = self.reloj.monotonic_ns()
+        self.botones = {}
+        self.sensores = {}
+        self.sincronias = []
+        self._parar = threading.Event()
+        self._hilo = None
+        # Antes del primer iniciar los sensores leen la primera ronda
+        self._cargar(self.rondas[0])
+
+    def cola(self):
+        return queue.Queue() if self.tiempo_real else ColaVirtual(self.reloj)
+
+    def boton(self, pin, al_pulsar, **kwargs):
+        boton = super().boton(pin, al_pulsar, **kwargs)
+        self.botones[pin] = (boton, kwargs.get("pull_up", True))
+        return boton
+
+    def sensor_distancia(self, echo, trigger, **kwargs):
+        return SensorReproducido(self, echo, kwargs.get("max_distance", 1))
+
+    def _cargar(self, ronda):
+        self.sensores = {}
+        self.sincronias = []
+        for e in ronda.eventos:
+            if e.tipo == SENSOR:
+                tiempos, valores = self.sensores.setdefault(e.canal, ([], []))
+                tiempos.append(e.t_ns)
+                valores.append(e.valor)
+            elif e.tipo == SINCRONIA:
+                self.sincronias.append(e.t_ns)
+
+    def _mover(self, pin, pulsado):
+        boton, pull_up = self.botones.get(pin, (None, True))
+        if boton is None or boton.closed:
+            return
+        if pulsado == pull_up:
+            boton.pin.drive_low()
+        else:
+            boton.pin.drive_high()
+
+    def _reproducir_botones(self, eventos, t0_ns):
+        for e in eventos:
+            espera = (t0_ns + e.t_ns - time.monotonic_ns()) / 1e9
+            if espera > 0 and self._parar.wait(espera):
+                return
+            self._mover(e.canal, bool(e.valor))
+
+    def iniciar(self):
+        self._detener_hilo()
+        if self.indice + 1 >= len(self.rondas):
+            raise ValueError(f"la traza tiene solo {len(self.rondas)} rondas")
+        self.indice += 1
+        ronda = self.rondas[self.indice]
+        self._cargar(ronda)
+        random.seed(ronda.semilla)
+        self.t0_ns = self.reloj.monotonic_ns()
+        botones = [e for e in ronda.eventos if e.tipo == BOTON]
+        if not self.tiempo_real:
+            for e in botones:
+                self.reloj.programar(self.t0_ns + e.t_ns,
+                                     lambda e=e: self._mover(e.canal,
+                                                             bool(e.valor)))
+        elif botones:
+            self._hilo = threading.Thread(
+                target=self._reproducir_botones, args=(botones, self.t0_ns),
+                name="reproduccion-gpio", daemon=True)
+            self._hilo.start()
+
+    def sincronizar(self):
+        # Las lecturas siguen desde donde estaban al marcar en la grabación
+        if self.sincronias:
+            self.t0_ns = self.reloj.monotonic_ns() - self.sincronias.pop(0)
+
+    def lectura(self, canal):
+        tiempos, valores = self.sensores.get(canal, ((), ()))
+        if not valores:
+            return None
+        i = bisect.bisect_right(tiempos, self.reloj.monotonic_ns() - self.t0_ns)
+        return valores[max(0, i - 1)]
+
+    def _detener_hilo(self):
+        if self._hilo is not None:
+            self._parar.set()
+            self._hilo.join()
+            self._hilo = None
+            self._parar.clear()
+
+    def cerrar(self):
+        self._detener_hilo()
+
+
+def desde_texto(texto):
+    """Backend según el formato de GPIO_BACKEND."""
+    modo, _, ruta = texto.partition(":")
+    if modo == "real":
+        return HardwareReal()
+    if not ruta:
+        raise ValueError(f"GPIO_BACKEND={texto!r}: falta la ruta de la traza")
+    if modo == "grabar":
+        return HardwareGrabacion(ruta)
+    if modo == "reproducir":
+        return HardwareReproduccion(ruta)
+    if modo == "reproducir-max":
+        return HardwareReproduccion(ruta, maxima=True)
+    raise ValueError(f"GPIO_BACKEND={texto!r}: se esperaba real, grabar:, "
+                     "reproducir: o reproducir-max:")
+
+
+_HARDWARE = None
+
+
+def hardware():
+    """Backend compartido por todos los juegos del proceso."""
+    global _HARDWARE
+    if _HARDWARE is None:
+        _HARDWARE = desde_texto(os.environ.get("GPIO_BACKEND", "real"))
+    return _HARDWARE
+
+
+def usar(backend):
+    """Fija el backend antes de importar los juegos (benchmarks, pruebas)."""
+    global _HARDWARE
+    _HARDWARE = backend
+    return backend
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resumen de una traza de GPIO.")
+    parser.add_argument("traza")
+    args = parser.parse_args()
+    try:
+        rondas = leer_traza(args.traza)
+    except (OSError, ValueError) as e:
+        sys.exit(str(e))
+    for i, ronda in enumerate(rondas):
+        pulsaciones = sum(1 for e in ronda.eventos
+                          if e.tipo == BOTON and e.valor)
+        lecturas = sum(1 for e in ronda.eventos if e.tipo == SENSOR)
+        duracion = ronda.eventos[-1].t_ns / 1e9 if ronda.eventos else 0.0
+        print(f"ronda {i}: semilla {ronda.semilla}, {duracion:.1f} s, "
+              f"{pulsaciones} pulsaciones, {lecturas} lecturas de sensor")
+
+
+if __name__ == "__main__":
+    main()